@@ -1,13 +1,34 @@
 from fastapi import APIRouter, HTTPException, Depends, Body
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Any, Optional
+import asyncio
+import json
 import os
-from openai_service import OpenAIService
+from openai_service import AsyncOpenAIService
 
 router = APIRouter()
 
-# Initialize the OpenAI service
-openai_service = OpenAIService()
+# The OpenAI service - async so LLM calls don't block the event loop. It is
+# created on first use in each process, since its connection pool must not be
+# shared across a fork (e.g. a gunicorn app preloaded before the workers start)
+_openai_service: Optional[AsyncOpenAIService] = None
+_openai_service_pid: Optional[int] = None
+
+
+def get_openai_service() -> AsyncOpenAIService:
+    """Get the OpenAI service for the current process, creating it on first use"""
+    global _openai_service, _openai_service_pid
+    
+    pid = os.getpid()
+    if _openai_service is None or _openai_service_pid != pid:
+        _openai_service = AsyncOpenAIService()
+        _openai_service_pid = pid
+    return _openai_service
+
+# Limits for the batch endpoints
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "1000"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "10"))
 
 class TextRequest(BaseModel):
     text: str
@@ -23,13 +44,74 @@ class SentimentResponse(BaseModel):
     rating: int
     confidence: float
 
+class BatchRequest(BaseModel):
+    texts: List[str]
+    max_concurrency: Optional[int] = None
+
+
+async def stream_batch(texts: List[str], process: Callable[[str], Awaitable[Any]],
+                       max_concurrency: int) -> AsyncIterator[str]:
+    """
+    Process a batch of texts concurrently and yield NDJSON lines as each one finishes
+    
+    Identical texts are processed once and the result is sent for every index
+    they appear at. Lines are in completion order, tagged with the input index.
+    """
+    indices_by_text: Dict[str, List[int]] = {}
+    for index, text in enumerate(texts):
+        indices_by_text.setdefault(text, []).append(index)
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run(text: str):
+        async with semaphore:
+            try:
+                return text, {"result": await process(text)}
+            except Exception as e:
+                return text, {"error": str(e)}
+    
+    tasks = [asyncio.create_task(run(text)) for text in indices_by_text]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            text, outcome = await next_done
+            for index in indices_by_text[text]:
+                yield json.dumps({"index": index, **outcome}) + "\n"
+    finally:
+        # Stop outstanding work if the client disconnects
+        for task in tasks:
+            task.cancel()
+
+
+def batch_response(request: BatchRequest, get_process: Callable[[], Callable[[str], Awaitable[Any]]],
+                   action: str) -> StreamingResponse:
+    """
+    Validate a batch request and stream its results as NDJSON
+    
+    The service method is only looked up once the batch is valid, so a missing
+    OpenAI configuration cannot hide a 400, and is reported as a 500 like the
+    single-text endpoints do.
+    """
+    if len(request.texts) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch too large: at most {MAX_BATCH_SIZE} texts are allowed")
+    
+    try:
+        process = get_process()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to {action}: {str(e)}")
+    
+    max_concurrency = max(1, min(request.max_concurrency or BATCH_CONCURRENCY, BATCH_CONCURRENCY))
+    return StreamingResponse(
+        stream_batch(request.texts, process, max_concurrency),
+        media_type="application/x-ndjson"
+    )
+
 @router.post("/analyze/text", response_model=TextResponse, tags=["Analysis"])
 async def analyze_text(request: TextRequest):
     """
     Analyze text using OpenAI's API and return a summary or analysis
     """
     try:
-        result = openai_service.summarize_text(request.text)
+        result = await get_openai_service().summarize_text(request.text)
         return {"result": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to analyze text: {str(e)}")
@@ -40,18 +122,32 @@ async def analyze_sentiment(request: SentimentRequest):
     Analyze the sentiment of the provided text and return a rating (1-5) and confidence score
     """
     try:
-        result = openai_service.analyze_sentiment(request.text)
+        result = await get_openai_service().analyze_sentiment(request.text)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to analyze sentiment: {str(e)}")
 
+@router.post("/analyze/text/batch", tags=["Analysis"])
+async def analyze_text_batch(request: BatchRequest):
+    """
+    Summarize a batch of texts, streaming one NDJSON line per input as results are ready
+    """
+    return batch_response(request, lambda: get_openai_service().summarize_text, "analyze text")
+
+@router.post("/analyze/sentiment/batch", tags=["Analysis"])
+async def analyze_sentiment_batch(request: BatchRequest):
+    """
+    Analyze the sentiment of a batch of texts, streaming one NDJSON line per input as results are ready
+    """
+    return batch_response(request, lambda: get_openai_service().analyze_sentiment, "analyze sentiment")
+
 @router.post("/generate/response", response_model=TextResponse, tags=["Generation"])
 async def generate_response(request: TextRequest):
     """
     Generate a response to the given text using OpenAI's API
     """
     try:
-        result = openai_service.generate_response(request.text, request.max_tokens)
+        result = await get_openai_service().generate_response(request.text, request.max_tokens)
         return {"result": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate response: {str(e)}")
@@ -0,0 +1,146 @@
+"""
+This module keeps a persistent SQLite index of articles the scraper has
+already seen: URL, content hash, headline, extracted text and when the
+article was first seen and last fetched. The scraper uses it to skip
+downloading recently checked articles and to skip extraction when a page
+has not changed.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Index settings
+ARTICLE_INDEX_ENABLED = os.environ.get("ARTICLE_INDEX_ENABLED", "true").lower() == "true"
+ARTICLE_INDEX_PATH = os.environ.get("ARTICLE_INDEX_PATH", os.path.join(".cache", "articles.sqlite3"))
+# How long an indexed article is trusted before it is fetched again to check for changes
+ARTICLE_RECHECK_INTERVAL = float(os.environ.get("ARTICLE_RECHECK_INTERVAL", str(6 * 3600)))
+
+# SQLite connections are per thread and must not be reused after a fork
+_local = threading.local()
+
+
+def _get_connection() -> sqlite3.Connection:
+    """Return the SQLite connection for the current thread, creating the table if needed"""
+    pid = os.getpid()
+    if getattr(_local, "pid", None) != pid:
+        directory = os.path.dirname(ARTICLE_INDEX_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        connection = sqlite3.connect(ARTICLE_INDEX_PATH, timeout=5, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "url TEXT PRIMARY KEY, content_hash TEXT NOT NULL, headline TEXT, text TEXT, "
+            "first_seen REAL NOT NULL, last_fetched REAL NOT NULL)"
+        )
+        _local.connection = connection
+        _local.pid = pid
+    
+    return _local.connection
+
+
+def hash_content(content: str) -> str:
+    """
+    Hash downloaded page content
+    
+    Args:
+        content: The page HTML
+    
+    Returns:
+        A hex digest of the content
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def get_article(url: str) -> Optional[Dict[str, Any]]:
+    """
+    Get an indexed article
+    
+    Args:
+        url: The URL of the article
+    
+    Returns:
+        A dictionary with url, content_hash, headline, text, first_seen and
+        last_fetched, or None if the article has not been seen
+    """
+    if not ARTICLE_INDEX_ENABLED:
+        return None
+    
+    try:
+        row = _get_connection().execute(
+            "SELECT url, content_hash, headline, text, first_seen, last_fetched FROM articles WHERE url = ?",
+            (url,)
+        ).fetchone()
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Article index lookup failed for {url}: {str(e)}")
+        return None
+    
+    if row is None:
+        return None
+    
+    return dict(zip(("url", "content_hash", "headline", "text", "first_seen", "last_fetched"), row))
+
+
+def is_fresh(article: Dict[str, Any]) -> bool:
+    """
+    Check whether an indexed article was fetched recently enough to reuse without checking
+    
+    Args:
+        article: An article from get_article
+    
+    Returns:
+        True if it was last fetched within ARTICLE_RECHECK_INTERVAL
+    """
+    return time.time() - article["last_fetched"] < ARTICLE_RECHECK_INTERVAL
+
+
+def store_article(url: str, content_hash: str, headline: Optional[str], text: Optional[str]) -> None:
+    """
+    Add or update an article in the index
+    
+    Args:
+        url: The URL of the article
+        content_hash: The hash of the downloaded page
+        headline: The extracted headline
+        text: The extracted article text
+    """
+    if not ARTICLE_INDEX_ENABLED:
+        return
+    
+    now = time.time()
+    try:
+        _get_connection().execute(
+            "INSERT INTO articles (url, content_hash, headline, text, first_seen, last_fetched) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET content_hash = excluded.content_hash, "
+            "headline = excluded.headline, text = excluded.text, last_fetched = excluded.last_fetched",
+            (url, content_hash, headline, text, now, now)
+        )
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Article index store failed for {url}: {str(e)}")
+
+
+def touch_article(url: str) -> None:
+    """
+    Record that an unchanged article was just fetched
+    
+    Args:
+        url: The URL of the article
+    """
+    if not ARTICLE_INDEX_ENABLED:
+        return
+    
+    try:
+        _get_connection().execute("UPDATE articles SET last_fetched = ? WHERE url = ?", (time.time(), url))
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Article index update failed for {url}: {str(e)}")
@@ -0,0 +1,232 @@
+"""
+ASGI entry point serving the news API, the plugin manifest, the OpenAPI
+specification and the api.py routes from one event loop.
+
+Run with: uvicorn asgi:app
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import anyio
+from dotenv import load_dotenv
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+
+from api import router as api_router
+from circuit_breaker import get_breaker_states
+from metrics import generate_metrics
+from news import (get_all_news_payload, get_all_news_payload_from, get_latest_news_payload,
+                  get_latest_news_payload_from, get_pending_all_news, get_pending_latest_news,
+                  iter_latest_news_events, iter_latest_news_events_from)
+from profiling import PROFILE_HEADER, PROFILING_ENABLED, RequestProfile, should_profile
+from response_cache import get_response_cache_stats
+from local_sentiment import get_sentiment_stats
+from result_cache import get_cache_stats
+from scheduler import start_scheduler
+from utils import build_openapi_spec, build_plugin_manifest, get_host_url
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Maximum number of blocking scrape/summarize pipelines running at once in this worker.
+# Requests beyond this wait on the event loop without holding a thread.
+PIPELINE_THREADS = int(os.environ.get("PIPELINE_THREADS", "40"))
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start precomputing college digests in the background if enabled
+    """
+    start_scheduler()
+    yield
+
+
+# Our own OpenAPI document is served at /openapi.json, so FastAPI's moves to /docs/openapi.json
+app = FastAPI(title="Clemson GPT News API", openapi_url="/docs/openapi.json", lifespan=lifespan)
+app.include_router(api_router)
+app.mount("/static", StaticFiles(directory=os.path.join(BASE_DIR, "static")), name="static")
+
+templates = Jinja2Templates(directory=os.path.join(BASE_DIR, "templates"))
+
+_pipeline_limiter = anyio.CapacityLimiter(PIPELINE_THREADS)
+
+
+async def profile_request(request: Request, call_next):
+    """
+    Profile a request, including the streaming of its body, if it asked for it or was sampled
+    """
+    if not should_profile(request.headers.get(PROFILE_HEADER)):
+        return await call_next(request)
+    
+    profile = RequestProfile(f"{request.method} {request.url.path}").start()
+    try:
+        response = await call_next(request)
+    except Exception:
+        profile.stop()
+        raise
+    
+    body_iterator = response.body_iterator
+    
+    async def profiled_body():
+        try:
+            async for chunk in body_iterator:
+                yield chunk
+        finally:
+            profile.stop()
+    
+    response.body_iterator = profiled_body()
+    return response
+
+
+# Only add the middleware when profiling is enabled, so it costs nothing otherwise
+if PROFILING_ENABLED:
+    app.middleware("http")(profile_request)
+
+
+@app.get("/", response_class=HTMLResponse, include_in_schema=False)
+async def root(request: Request):
+    """
+    Root endpoint that displays documentation about the API
+    """
+    return templates.TemplateResponse(request, "index.html", {"host_url": get_host_url()})
+
+
+@app.get("/latest-news", tags=["News"])
+async def get_latest_news(college: Optional[str] = None, stream: bool = False):
+    """
+    Retrieve and summarize the latest news articles for a specific college
+    """
+    # Stream the digest one article at a time as server-sent events if requested
+    if stream:
+        return StreamingResponse(
+            stream_latest_news_events(college),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
+    # A request for a digest another request is already building waits for it on the
+    # event loop, so a burst of identical requests holds one pipeline thread, not one each
+    pending = get_pending_latest_news(college)
+    if pending is not None:
+        try:
+            # Shielded so a disconnecting client can't cancel the build other requests share
+            await asyncio.shield(asyncio.wrap_future(pending))
+        except Exception:
+            pass
+        payload, status_code = get_latest_news_payload_from(college, pending)
+        return JSONResponse(payload, status_code=status_code)
+    
+    # The scraper and summarizer are blocking, so run them off the event loop
+    payload, status_code = await anyio.to_thread.run_sync(
+        get_latest_news_payload, college, limiter=_pipeline_limiter
+    )
+    return JSONResponse(payload, status_code=status_code)
+
+
+async def stream_latest_news_events(college: Optional[str]) -> AsyncIterator[str]:
+    """
+    Stream the latest news as server-sent events without holding a thread per client
+    
+    A stream for a digest another request is already building waits for it on
+    the event loop and replays the result. Otherwise the blocking generator
+    is advanced one event at a time in a pipeline thread, so a thread is only
+    held while the next event is being produced.
+    """
+    pending = get_pending_latest_news(college)
+    if pending is not None:
+        try:
+            # Shielded so a disconnecting client can't cancel the build other requests share
+            await asyncio.shield(asyncio.wrap_future(pending))
+        except Exception:
+            pass
+        for event in iter_latest_news_events_from(college, pending):
+            yield event
+        return
+    
+    events = iter_latest_news_events(college)
+    try:
+        while True:
+            event = await anyio.to_thread.run_sync(next, events, None, limiter=_pipeline_limiter)
+            if event is None:
+                break
+            yield event
+    finally:
+        # Closing an unfinished build waits for its in-flight articles, so do it off the loop,
+        # even when the client has disconnected
+        with anyio.CancelScope(shield=True):
+            await anyio.to_thread.run_sync(events.close)
+
+
+@app.get("/latest-news/all", tags=["News"])
+async def get_all_latest_news():
+    """
+    Retrieve and summarize the latest news articles for every college in one digest
+    """
+    # As for a single college, wait on a build already in progress without holding a pipeline thread
+    pending = get_pending_all_news()
+    if pending is not None:
+        try:
+            await asyncio.shield(asyncio.wrap_future(pending))
+        except Exception:
+            pass
+        payload, status_code = get_all_news_payload_from(pending)
+        return JSONResponse(payload, status_code=status_code)
+    
+    payload, status_code = await anyio.to_thread.run_sync(get_all_news_payload, limiter=_pipeline_limiter)
+    return JSONResponse(payload, status_code=status_code)
+
+
+@app.get("/cache-stats", tags=["System"])
+async def get_cache_statistics():
+    """
+    Return the hit and miss counters of the response and LLM result caches,
+    the local sentiment escalation and agreement rates, and the state of the
+    news site's circuit breaker
+    """
+    return {
+        "responses": get_response_cache_stats(),
+        "llm_results": get_cache_stats(),
+        "sentiment": get_sentiment_stats(),
+        "circuit_breakers": get_breaker_states()
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Return pipeline stage timings and counters in Prometheus text format
+    """
+    metrics = generate_metrics()
+    if metrics is None:
+        return PlainTextResponse("prometheus_client is not installed\n", status_code=503)
+    body, content_type = metrics
+    return Response(body, media_type=content_type)
+
+
+@app.get("/.well-known/ai-plugin.json", include_in_schema=False)
+async def get_plugin_manifest():
+    """
+    Return the plugin manifest for OpenAI
+    """
+    return build_plugin_manifest(get_host_url())
+
+
+@app.get("/openapi.json", include_in_schema=False)
+async def get_openapi_spec():
+    """
+    Return the OpenAPI specification
+    """
+    return build_openapi_spec(get_host_url())
@@ -0,0 +1,173 @@
+"""
+A local OpenAI-compatible chat completions stub used by the benchmark harness.
+
+It answers POST /v1/chat/completions in the shape each caller expects:
+json_schema requests get the article analysis fields their schema asks for,
+json_object requests get a sentiment rating, and everything else gets a
+"Summary: ... Rewritten Headline: ..." reply. Latency, server errors and 429s are configurable, so
+retry and rate limiting behaviour can be measured without a live API key.
+
+Run it on its own:
+    python -m benchmarks.fake_openai --port 8767 --latency 0.5 --rate-limit-rate 0.05
+"""
+
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _reply_content(request: Dict[str, Any]) -> str:
+    """Build the assistant message content for a chat completion request"""
+    response_format = (request.get("response_format") or {}).get("type")
+    if response_format == "json_schema":
+        analysis = {
+            "summary": "Clemson researchers reported new results this week, highlighting the program's impact.",
+            "rewritten_headline": "Clemson Team Reports New Results",
+            "rating": 4,
+            "confidence": 0.85,
+            "explanation": "The article describes a positive outcome for the university."
+        }
+        # Strict schemas allow no other keys, so answer with just the requested fields
+        properties = request["response_format"]["json_schema"]["schema"]["properties"]
+        return json.dumps({key: value for key, value in analysis.items() if key in properties})
+    if response_format == "json_object":
+        return json.dumps({
+            "rating": 4,
+            "confidence": 0.85,
+            "explanation": "The article describes a positive outcome for the university."
+        })
+    return (
+        "Summary: Clemson researchers reported new results this week, highlighting the program's impact.\n"
+        "Rewritten Headline: Clemson Team Reports New Results"
+    )
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Answer chat completions with canned content after a simulated delay"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+
+        roll = random.random()
+        if roll < server.rate_limit_rate:
+            server.count("429")
+            self._send(429, {"error": {"message": "Rate limit reached", "type": "rate_limit_error"}},
+                       {"Retry-After": str(server.retry_after)})
+            return
+
+        # Jitter the delay by +/-25% so requests don't complete in lockstep
+        time.sleep(server.latency * random.uniform(0.75, 1.25))
+
+        if roll < server.rate_limit_rate + server.error_rate:
+            server.count("500")
+            self._send(500, {"error": {"message": "The server had an error", "type": "server_error"}})
+            return
+
+        request = json.loads(body or b"{}")
+        content = _reply_content(request)
+        prompt_tokens = max(1, len(body) // 4)
+        completion_tokens = max(1, len(content) // 4)
+        server.count("200")
+        self._send(200, {
+            "id": "chatcmpl-benchmark",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o"),
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content}
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    def _send(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """Threaded server that keeps a tally of the status codes it returned"""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency: float, error_rate: float, rate_limit_rate: float, retry_after: float):
+        super().__init__(address, FakeOpenAIHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.status_counts = Counter()
+        self._lock = threading.Lock()
+
+    def count(self, status: str):
+        with self._lock:
+            self.status_counts[status] += 1
+
+    def get_status_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.status_counts)
+
+    def reset_status_counts(self):
+        with self._lock:
+            self.status_counts.clear()
+
+
+def start_fake_openai(port: int = 0, latency: float = 0.5, error_rate: float = 0.0,
+                      rate_limit_rate: float = 0.0, retry_after: float = 1.0) -> FakeOpenAIServer:
+    """
+    Start the OpenAI stub in a background thread
+
+    Args:
+        port: Port to listen on (0 picks a free one)
+        latency: Mean seconds before a completion is returned
+        error_rate: Fraction of requests answered with a 500
+        rate_limit_rate: Fraction of requests answered with a 429
+        retry_after: Retry-After value sent with each 429, in seconds
+
+    Returns:
+        The running server; point OPENAI_BASE_URL at http://127.0.0.1:<port>/v1
+    """
+    server = FakeOpenAIServer(("127.0.0.1", port), latency, error_rate, rate_limit_rate, retry_after)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local OpenAI-compatible stub")
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    args = parser.parse_args()
+
+    server = start_fake_openai(args.port, args.latency, args.error_rate, args.rate_limit_rate, args.retry_after)
+    logger.info(f"Serving fake OpenAI API on http://127.0.0.1:{server.server_port}/v1")
+    threading.Event().wait()
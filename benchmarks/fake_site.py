@@ -0,0 +1,267 @@
+"""
+A local stand-in for news.clemson.edu used by the benchmark harness.
+
+Pages recorded from the live site are served from benchmarks/fixtures, which
+mirrors the site's URL paths (e.g. fixtures/section/college-of-science/index.html).
+Any path without a recording is generated deterministically, so the harness
+also runs on a fresh checkout. Every response is delayed by a configurable
+latency to mimic the real newsroom.
+
+Record the live pages (section pages, their feeds and linked articles):
+    python -m benchmarks.fake_site --record
+
+Serve the site on its own:
+    python -m benchmarks.fake_site --port 8765 --latency 0.2
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+LIVE_SITE_URL = "https://news.clemson.edu"
+
+# Number of synthetic articles listed on each generated section page
+ARTICLES_PER_SECTION = 12
+
+_WORDS = (
+    "Clemson researchers students faculty university program community award grant "
+    "study project campus partnership innovation science engineering agriculture "
+    "education health business design research team national growth success "
+    "challenge funding laboratory semester professor department outreach impact"
+).split()
+
+
+def _rng(path: str) -> random.Random:
+    """Return a random generator seeded by the request path"""
+    return random.Random(hashlib.sha256(path.encode("utf-8")).hexdigest())
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(10, 22))]
+    return " ".join(words).capitalize() + "."
+
+
+def _title(rng: random.Random) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(5, 9))).title()
+
+
+def _paragraphs(rng: random.Random, count: int) -> str:
+    return "".join(
+        "<p>" + " ".join(_sentence(rng) for _ in range(rng.randint(3, 6))) + "</p>"
+        for _ in range(count)
+    )
+
+
+def render_section_page(slug: str) -> str:
+    """Generate a section page listing this section's synthetic articles"""
+    items = []
+    for n in range(1, ARTICLES_PER_SECTION + 1):
+        path = f"/{slug}-story-{n}/"
+        title = _title(_rng(path))
+        items.append(
+            f'<article class="post"><h2><a href="{path}">{title}</a></h2>'
+            f'<p class="excerpt">{_sentence(_rng(path + "excerpt"))}</p></article>'
+        )
+    nav = "".join(f'<li><a href="/section/{s}/">{s}</a></li>' for s in ("news", "research", "events"))
+    return (
+        f"<html><head><title>{slug} | Clemson News</title></head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header>"
+        f'<main><h1>{slug}</h1>{"".join(items)}</main>'
+        f"<footer><p>Clemson University</p></footer></body></html>"
+    )
+
+
+def render_article_page(path: str) -> str:
+    """Generate an article page with a headline and several paragraphs"""
+    rng = _rng(path)
+    title = _title(rng)
+    return (
+        f"<html><head><title>{title} | Clemson News</title></head><body>"
+        f"<header><nav><a href=\"/\">Clemson News</a></nav></header>"
+        f"<main><article><h1>{title}</h1>{_paragraphs(rng, rng.randint(6, 12))}</article></main>"
+        f"<footer><p>Clemson University</p></footer></body></html>"
+    )
+
+
+def render_feed(slug: str, host: str) -> str:
+    """Generate the RSS feed for a section, with full article content"""
+    items = []
+    for n in range(1, ARTICLES_PER_SECTION + 1):
+        path = f"/{slug}-story-{n}/"
+        rng = _rng(path)
+        title = _title(rng)
+        items.append(
+            f"<item><title>{title}</title><link>{host}{path}</link>"
+            f"<pubDate>{formatdate(1700000000 - n * 86400, usegmt=True)}</pubDate>"
+            f"<description>{_sentence(rng)}</description>"
+            f"<content:encoded><![CDATA[{_paragraphs(rng, rng.randint(6, 12))}]]></content:encoded></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">'
+        f"<channel><title>{slug}</title><link>{host}/section/{slug}/</link>{''.join(items)}</channel></rss>"
+    )
+
+
+def _fixture_path(path: str) -> str:
+    """Map a URL path to its file in the fixtures directory"""
+    clean = path.split("?", 1)[0].strip("/")
+    return os.path.join(FIXTURES_DIR, clean, "index.html") if clean else os.path.join(FIXTURES_DIR, "index.html")
+
+
+class FakeSiteHandler(BaseHTTPRequestHandler):
+    """Serve recorded or generated newsroom pages"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeClemsonNews/1.0"
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        page = self._render(self.path)
+        if page is None:
+            self._send(404, b"Not Found", "text/plain")
+            return
+
+        body, content_type = page
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send(200, body, content_type, etag)
+
+    def _render(self, path: str) -> Optional[Tuple[bytes, str]]:
+        fixture = _fixture_path(path)
+        is_feed = path.rstrip("/").endswith("/feed")
+        content_type = "application/rss+xml" if is_feed else "text/html; charset=utf-8"
+        if os.path.exists(fixture):
+            with open(fixture, "rb") as f:
+                return f.read(), content_type
+
+        host = f"http://{self.headers.get('Host')}"
+        section = re.fullmatch(r"/section/([\w-]+)/?", path)
+        feed = re.fullmatch(r"/section/([\w-]+)/feed/?", path)
+        if feed:
+            if not self.server.feeds:
+                return None
+            return render_feed(feed.group(1), host).encode("utf-8"), content_type
+        if section:
+            return render_section_page(section.group(1)).encode("utf-8"), content_type
+        if re.fullmatch(r"/[\w-]+-story-\d+/?", path):
+            return render_article_page(path).encode("utf-8"), content_type
+        return None
+
+    def _send(self, status: int, body: bytes, content_type: str, etag: Optional[str] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeSiteServer(ThreadingHTTPServer):
+    """Threaded server that ignores clients hanging up early"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # The feed reader closes the connection once it has read enough items
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def start_fake_site(port: int = 0, latency: float = 0.2, feeds: bool = True) -> ThreadingHTTPServer:
+    """
+    Start the fake newsroom in a background thread
+
+    Args:
+        port: Port to listen on (0 picks a free one)
+        latency: Seconds to wait before answering each request
+        feeds: Whether section feeds are served (False forces HTML scraping)
+
+    Returns:
+        The running server; its base URL is http://127.0.0.1:<server.server_port>
+    """
+    server = FakeSiteServer(("127.0.0.1", port), FakeSiteHandler)
+    server.latency = latency
+    server.feeds = feeds
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def record_live_site(max_articles: int = 10):
+    """
+    Save the live section pages, their feeds and linked articles as fixtures
+
+    Absolute links to the live site are rewritten to relative ones so the
+    recorded pages point back at the fake site when served.
+
+    Args:
+        max_articles: Maximum number of articles to record per section
+    """
+    from html_parser import parse_section_page
+    from scraper import fetch_page
+    from urls import resolve_url
+    from utils import COLLEGE_URLS
+
+    def save(url: str, body: str):
+        path = _fixture_path(url[len(LIVE_SITE_URL):])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(body.replace(LIVE_SITE_URL, ""))
+        logger.info(f"Recorded {url}")
+
+    for section_url in COLLEGE_URLS.values():
+        html = fetch_page(section_url)
+        if not html:
+            logger.warning(f"Could not record {section_url}")
+            continue
+        save(section_url, html)
+
+        feed = fetch_page(section_url.rstrip("/") + "/feed/")
+        if feed:
+            save(section_url.rstrip("/") + "/feed/", feed)
+
+        links = [resolve_url(link["href"], section_url) for link in parse_section_page(html)["links"]]
+        articles = [link for link in dict.fromkeys(links) if link.startswith(LIVE_SITE_URL) and "/section/" not in link]
+        for url in articles[:max_articles]:
+            body = fetch_page(url)
+            if body:
+                save(url, body)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local copy of the Clemson newsroom")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds added to every response")
+    parser.add_argument("--no-feeds", action="store_true", help="answer section feeds with 404")
+    parser.add_argument("--record", action="store_true", help="record the live site into benchmarks/fixtures")
+    args = parser.parse_args()
+
+    if args.record:
+        record_live_site()
+    else:
+        server = start_fake_site(args.port, args.latency, not args.no_feeds)
+        logger.info(f"Serving fake newsroom on http://127.0.0.1:{server.server_port}")
+        threading.Event().wait()
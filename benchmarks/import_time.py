@@ -0,0 +1,138 @@
+"""
+Import-time benchmark for the app entry points.
+
+Each run imports a module in a fresh interpreter with `python -X importtime`,
+so the numbers match what a gunicorn worker pays at boot when the app is not
+preloaded. The report gives the wall time of each import, the slowest
+modules it pulled in, and which of the heavy libraries (the OpenAI SDK,
+trafilatura, BeautifulSoup) were imported even though no request has run.
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --modules main,asgi,api --runs 10 --top 15
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.run import RESULTS_DIR, git_revision
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that should only be imported once a request needs them
+HEAVY_MODULES = ["openai", "httpx", "trafilatura", "bs4", "selectolax", "lxml", "tiktoken"]
+
+# Prints the heavy libraries left in sys.modules after the import
+_PROBE = "import json, sys; import {module}; print(json.dumps([m for m in {heavy!r} if m in sys.modules]))"
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    Parse `-X importtime` output
+
+    Args:
+        stderr: The interpreter's stderr
+
+    Returns:
+        A list of (module, self microseconds, cumulative microseconds)
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|", 2)
+        entries.append((name.strip(), int(own), int(cumulative)))
+    return entries
+
+
+def time_import(module: str) -> Dict[str, Any]:
+    """
+    Import a module in a fresh interpreter
+
+    Args:
+        module: The module to import
+
+    Returns:
+        A dictionary with the import time, every module's timings and the heavy
+        libraries that were imported
+    """
+    env = dict(os.environ, BACKGROUND_REFRESH_ENABLED="false")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=REPO_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    entries = parse_importtime(completed.stderr)
+    total = next((cumulative for name, _, cumulative in entries if name == module), 0)
+    return {
+        "seconds": total / 1e6,
+        "entries": entries,
+        "heavy_modules": json.loads(completed.stdout.strip().splitlines()[-1])
+    }
+
+
+def benchmark_module(module: str, runs: int, top: int) -> Dict[str, Any]:
+    """Import a module several times and summarize the runs"""
+    samples = [time_import(module) for _ in range(runs)]
+    seconds = [sample["seconds"] for sample in samples]
+
+    slowest = sorted(samples[-1]["entries"], key=lambda entry: entry[2], reverse=True)
+    return {
+        "module": module,
+        "runs": runs,
+        "median_ms": round(statistics.median(seconds) * 1000, 1),
+        "min_ms": round(min(seconds) * 1000, 1),
+        "max_ms": round(max(seconds) * 1000, 1),
+        "heavy_modules_imported": samples[-1]["heavy_modules"],
+        "slowest": [
+            {"module": name, "cumulative_ms": round(cumulative / 1000, 1), "self_ms": round(own / 1000, 1)}
+            for name, own, cumulative in slowest[:top]
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how long the app takes to import")
+    parser.add_argument("--modules", default="main,asgi", help="comma-separated modules to import")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to report per module")
+    parser.add_argument("--output", help="result file (defaults to benchmarks/results/import-<timestamp>.json)")
+    args = parser.parse_args()
+
+    results = []
+    for module in [m.strip() for m in args.modules.split(",") if m.strip()]:
+        result = benchmark_module(module, args.runs, args.top)
+        logger.info(f"import {module}: median {result['median_ms']}ms (min {result['min_ms']}ms), "
+                    f"heavy modules imported: {', '.join(result['heavy_modules_imported']) or 'none'}")
+        results.append(result)
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "settings": vars(args),
+        "results": results,
+    }
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, "import-" + datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + ".json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Wrote import-time results to {output}")
+
+
+if __name__ == "__main__":
+    main()
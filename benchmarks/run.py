@@ -0,0 +1,372 @@
+"""
+Offline end-to-end benchmark for the news pipeline and the analysis API.
+
+The harness starts the fake newsroom (benchmarks/fake_site.py) and the fake
+OpenAI API (benchmarks/fake_openai.py), points the app at them, and drives
+the ASGI app in-process at each requested concurrency level. Each scenario
+reports p50/p95/p99 latency, throughput, status codes, per-stage timings and
+the scraper's stage counters. Results are written as JSON so runs can be
+compared over time.
+
+Scenarios:
+    scrape       scrape every college with feed and with HTML ingestion, cold and warm
+                 (wall time, bytes, fetches and extractions per pass)
+    latest-news  GET /latest-news for each college in turn
+    latest-news-all
+                 GET /latest-news/all (only run when named)
+    api          POST /analyze/text and /analyze/sentiment
+
+Usage:
+    python -m benchmarks.run --concurrency 1,4,16 --requests 36
+    python -m benchmarks.run --scenarios api --llm-latency 0.2 --rate-limit-rate 0.1
+    python -m benchmarks.run --cold --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import closing
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Any, Callable, Dict, List
+
+from benchmarks.fake_openai import start_fake_openai
+from benchmarks.fake_site import start_fake_site
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Functions timed as pipeline stages: (module, attribute, stage name)
+TIMED_STAGES = [
+    ("scraper", "scrape_feed_articles", "feed"),
+    ("scraper", "fetch_page", "fetch_page"),
+    ("scraper", "parse_section_page", "parse_section"),
+    ("scraper", "extract_article_text", "extract_text"),
+    ("summarizer", "_create_completion", "llm_completion"),
+    ("pipeline", "process_article", "process_article"),
+    ("pipeline", "format_output", "format_output"),
+]
+
+SAMPLE_TEXT = (
+    "Clemson University researchers received a national award this week for their work on "
+    "sustainable agriculture. The team, led by faculty in the College of Agriculture, Forestry "
+    "and Life Sciences, partnered with farmers across the state to test new irrigation methods."
+)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, float]:
+    """Summarize latencies in milliseconds"""
+    return {
+        "count": len(latencies),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2) if latencies else 0.0,
+    }
+
+
+class StageTimer:
+    """Record how long instrumented functions take, per stage"""
+
+    def __init__(self):
+        self.timings = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self.lock:
+                    self.timings[stage].append(elapsed)
+        return timed
+
+    def install(self):
+        """Wrap every function listed in TIMED_STAGES"""
+        for module_name, attribute, stage in TIMED_STAGES:
+            module = sys.modules.get(module_name) or __import__(module_name)
+            if hasattr(module, attribute):
+                setattr(module, attribute, self.wrap(stage, getattr(module, attribute)))
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self.lock:
+            timings = {stage: list(values) for stage, values in self.timings.items()}
+        return {stage: {**summarize_latencies(values), "total_s": round(sum(values), 3)}
+                for stage, values in sorted(timings.items())}
+
+    def reset(self):
+        with self.lock:
+            self.timings.clear()
+
+
+def configure_environment(site_url: str, openai_url: str, workdir: str, args: argparse.Namespace):
+    """
+    Point the app at the fake servers before any app module is imported
+
+    Caches live in a temporary directory so every run starts empty. A cold run
+    disables them entirely, so each request exercises the whole pipeline.
+    """
+    os.environ.update({
+        "NEWS_SITE_URL": site_url,
+        "OPENAI_BASE_URL": openai_url,
+        "OPENAI_API_KEY": "benchmark",
+        "SCRAPING_ENABLED": "true",
+        "BACKGROUND_REFRESH_ENABLED": "false",
+        "HTTP_CACHE_DIR": os.path.join(workdir, "http"),
+        "RESULT_CACHE_PATH": os.path.join(workdir, "results.sqlite3"),
+        "ARTICLE_INDEX_PATH": os.path.join(workdir, "articles.sqlite3"),
+    })
+    # The client-side rate limiter keeps the app's limits unless overridden;
+    # its waits are counted in the llm_completion stage
+    if args.rpm_limit:
+        os.environ["OPENAI_RPM_LIMIT"] = str(args.rpm_limit)
+    if args.tpm_limit:
+        os.environ["OPENAI_TPM_LIMIT"] = str(args.tpm_limit)
+    if args.cold:
+        os.environ.update({
+            "HTTP_CACHE_ENABLED": "false",
+            "RESULT_CACHE_ENABLED": "false",
+            "ARTICLE_INDEX_ENABLED": "false",
+            "RESPONSE_FRESH_TTL": "0",
+            "RESPONSE_STALE_TTL": "0",
+            "SHARED_ARTICLES_MAX": "0",
+        })
+
+
+async def drive(client, make_request: Callable, total: int, concurrency: int) -> Dict[str, Any]:
+    """
+    Send requests with at most `concurrency` in flight and time each one
+
+    Args:
+        client: An httpx.AsyncClient bound to the app
+        make_request: Called with (client, index) and returns a response awaitable
+        total: Number of requests to send
+        concurrency: Maximum number of requests in flight
+
+    Returns:
+        Latency summary, throughput and status code counts
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    statuses = Counter()
+
+    async def one(index: int):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await make_request(client, index)
+                statuses[str(response.status_code)] += 1
+            except Exception as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    wall = time.perf_counter() - start
+    return {
+        "latency": summarize_latencies(latencies),
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(total / wall, 2) if wall else 0.0,
+        "status_codes": dict(statuses),
+    }
+
+
+def run_scrape_scenario(timer: StageTimer) -> List[Dict[str, Any]]:
+    """
+    Scrape every college with each ingestion mode, cold and with warm caches
+
+    The cold pass runs with the HTTP cache and article index disabled, to
+    measure raw ingestion. The caches are then enabled and the colleges are
+    scraped twice; only the second pass is reported, so it shows what a
+    steady-state refresh costs once everything has been fetched before.
+    """
+    import article_index
+    import http_cache
+    import scraper
+    from utils import COLLEGE_URLS
+
+    saved = (scraper.INGESTION_MODE, http_cache.HTTP_CACHE_ENABLED, article_index.ARTICLE_INDEX_ENABLED)
+
+    def scrape_all(mode: str, caches: str) -> Dict[str, Any]:
+        scraper.reset_stage_counters()
+        timer.reset()
+        start = time.perf_counter()
+        article_counts = [len(scraper.scrape_latest_articles(url)) for url in COLLEGE_URLS.values()]
+        wall = time.perf_counter() - start
+        counters = scraper.get_stage_counters()
+        logger.info(f"scrape[{mode}, {caches}]: {sum(article_counts)} articles in {wall:.2f}s")
+        return {
+            "scenario": "scrape",
+            "ingestion_mode": mode,
+            "caches": caches,
+            "colleges": len(article_counts),
+            "articles": sum(article_counts),
+            "wall_s": round(wall, 3),
+            "bytes": counters["stages"].get("bytes", 0),
+            "stage_counters": counters["stages"],
+            "stage_timings": timer.snapshot(),
+        }
+
+    results = []
+    try:
+        for mode in ("feed", "html"):
+            scraper.INGESTION_MODE = mode
+            http_cache.HTTP_CACHE_ENABLED = False
+            article_index.ARTICLE_INDEX_ENABLED = False
+            results.append(scrape_all(mode, "cold"))
+
+            http_cache.HTTP_CACHE_ENABLED = True
+            article_index.ARTICLE_INDEX_ENABLED = True
+            scrape_all(mode, "priming")
+            results.append(scrape_all(mode, "warm"))
+    finally:
+        scraper.INGESTION_MODE, http_cache.HTTP_CACHE_ENABLED, article_index.ARTICLE_INDEX_ENABLED = saved
+        # Leave empty caches for the scenarios that follow
+        shutil.rmtree(http_cache.HTTP_CACHE_DIR, ignore_errors=True)
+        if os.path.exists(article_index.ARTICLE_INDEX_PATH):
+            with closing(sqlite3.connect(article_index.ARTICLE_INDEX_PATH)) as connection:
+                connection.execute("DELETE FROM articles")
+                connection.commit()
+    return results
+
+
+async def run_http_scenarios(app, scenarios: List[str], levels: List[int], total: int,
+                             timer: StageTimer, openai_server) -> List[Dict[str, Any]]:
+    """Drive /latest-news and the analysis API at each concurrency level"""
+    import httpx
+
+    import scraper
+    from utils import COLLEGE_URLS
+
+    colleges = list(COLLEGE_URLS)
+    requests = {
+        "latest-news": lambda client, i: client.get("/latest-news", params={"college": colleges[i % len(colleges)]}),
+        "latest-news-all": lambda client, i: client.get("/latest-news/all"),
+        "api-text": lambda client, i: client.post("/analyze/text", json={"text": f"{SAMPLE_TEXT} ({i})"}),
+        "api-sentiment": lambda client, i: client.post("/analyze/sentiment", json={"text": f"{SAMPLE_TEXT} ({i})"}),
+    }
+    selected = [name for name in requests if name in scenarios or name.split("-")[0] in scenarios]
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=300) as client:
+        for name in selected:
+            for concurrency in levels:
+                scraper.reset_stage_counters()
+                timer.reset()
+                openai_server.reset_status_counts()
+                result = await drive(client, requests[name], total, concurrency)
+                result.update({
+                    "scenario": name,
+                    "concurrency": concurrency,
+                    "requests": total,
+                    "stage_timings": timer.snapshot(),
+                    "stage_counters": scraper.get_stage_counters()["stages"],
+                    "upstream_llm_status_codes": openai_server.get_status_counts(),
+                })
+                results.append(result)
+                latency = result["latency"]
+                logger.info(
+                    f"{name} c={concurrency}: p50={latency['p50_ms']}ms p95={latency['p95_ms']}ms "
+                    f"p99={latency['p99_ms']}ms {result['throughput_rps']} req/s"
+                )
+    return results
+
+
+def git_revision() -> str:
+    """Return the current commit, or "unknown" outside a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline end-to-end benchmark")
+    parser.add_argument("--scenarios", default="scrape,latest-news,api",
+                        help="comma-separated scenarios: scrape, latest-news, latest-news-all, api, api-text, api-sentiment")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=36, help="requests per scenario and level")
+    parser.add_argument("--site-latency", type=float, default=0.2, help="seconds per fake newsroom response")
+    parser.add_argument("--no-feeds", action="store_true", help="serve no section feeds, forcing HTML scraping")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="mean seconds per fake completion")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of completions failing with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of completions failing with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--rpm-limit", type=float, help="override OPENAI_RPM_LIMIT for the run")
+    parser.add_argument("--tpm-limit", type=float, help="override OPENAI_TPM_LIMIT for the run")
+    parser.add_argument("--cold", action="store_true", help="disable every cache")
+    parser.add_argument("--output", help="result file (defaults to benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+
+    site = start_fake_site(latency=args.site_latency, feeds=not args.no_feeds)
+    openai_server = start_fake_openai(latency=args.llm_latency, error_rate=args.error_rate,
+                                      rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after)
+    workdir = tempfile.mkdtemp(prefix="cuheadlines-bench-")
+    configure_environment(f"http://127.0.0.1:{site.server_port}",
+                          f"http://127.0.0.1:{openai_server.server_port}/v1", workdir, args)
+
+    # Import the app only once the environment points at the fake servers
+    from asgi import app
+
+    timer = StageTimer()
+    timer.install()
+
+    results = []
+    if "scrape" in scenarios:
+        results.extend(run_scrape_scenario(timer))
+    results.extend(asyncio.run(run_http_scenarios(app, scenarios, levels, args.requests, timer, openai_server)))
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "settings": vars(args),
+        "results": results,
+    }
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + ".json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Wrote benchmark results to {output}")
+
+    site.shutdown()
+    openai_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
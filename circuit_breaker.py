@@ -0,0 +1,228 @@
+"""
+This module provides a circuit breaker for each host the scraper talks to.
+After BREAKER_FAILURE_THRESHOLD consecutive failures (connection errors,
+timeouts, or blocking/error status codes) the breaker opens: requests to
+that host fail immediately with CircuitOpenError, and /latest-news serves
+a cached digest or the fallback message without waiting on the site. While
+the breaker is open, a single background thread probes the root of the site
+at a slowly backing-off interval and closes the breaker as soon as the host
+gives any answer that is not a failure. The root is probed rather than the
+URL that failed, so one permanently broken page cannot keep the breaker open.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from metrics import record_circuit_state
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Circuit breaker settings
+BREAKER_ENABLED = os.environ.get("BREAKER_ENABLED", "true").lower() == "true"
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("BREAKER_FAILURE_THRESHOLD", "5"))
+# Seconds before the first probe, doubled after each failed probe up to the maximum
+BREAKER_PROBE_INTERVAL = float(os.environ.get("BREAKER_PROBE_INTERVAL", "30"))
+BREAKER_PROBE_MAX_INTERVAL = float(os.environ.get("BREAKER_PROBE_MAX_INTERVAL", "600"))
+BREAKER_PROBE_TIMEOUT = float(os.environ.get("BREAKER_PROBE_TIMEOUT", "5"))
+
+# Responses that mean the host is blocking us or failing, rather than a missing page
+BREAKER_FAILURE_STATUS_CODES = {403, 408, 429, 500, 502, 503, 504}
+
+CLOSED = "closed"
+OPEN = "open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose breaker is open"""
+
+    def __init__(self, host: str):
+        super().__init__(f"Circuit breaker for {host} is open")
+        self.host = host
+
+
+class CircuitBreaker:
+    def __init__(self, host: str, probe_url: str):
+        """
+        Initialize a closed breaker for a host
+
+        Args:
+            host: The host name the breaker protects
+            probe_url: The URL requested to check whether the host has recovered
+        """
+        self.host = host
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probe_url = probe_url
+        self.last_failed_url: Optional[str] = None
+        self.probe_headers: Optional[Dict[str, str]] = None
+        self.probe_thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request to the host may be sent
+
+        Returns:
+            True if the breaker is closed
+        """
+        if self.state == CLOSED:
+            return True
+
+        # Probe threads don't survive a fork, so restart the probe if this process has none
+        if self.probe_thread is None or not self.probe_thread.is_alive():
+            with self.lock:
+                if self.state == OPEN and (self.probe_thread is None or not self.probe_thread.is_alive()):
+                    self._start_probe()
+        return False
+
+    def record_success(self) -> None:
+        """Reset the failure count after a request the host answered normally"""
+        if self.failures:
+            with self.lock:
+                self.failures = 0
+
+    def record_failure(self, url: str, headers: Optional[Dict[str, str]] = None) -> None:
+        """
+        Count a failed request, opening the breaker once the threshold is reached
+
+        Args:
+            url: The URL that failed
+            headers: The headers the request was sent with, reused by the probes
+        """
+        with self.lock:
+            self.failures += 1
+            self.last_failed_url = url
+            self.probe_headers = headers
+            if self.state == OPEN or self.failures < BREAKER_FAILURE_THRESHOLD:
+                return
+            self.state = OPEN
+            self.opened_at = time.time()
+            self._start_probe()
+
+        logger.warning(f"Circuit breaker for {self.host} opened after {self.failures} consecutive failures "
+                       f"(last: {url})")
+        record_circuit_state(self.host, OPEN)
+
+    def _start_probe(self) -> None:
+        """Start the background probe thread (called with the lock held)"""
+        self.probe_thread = threading.Thread(
+            target=self._probe_until_closed,
+            name=f"breaker-probe-{self.host}",
+            daemon=True
+        )
+        self.probe_thread.start()
+
+    def _probe_until_closed(self) -> None:
+        """Probe the host at a backing-off, jittered interval until it answers normally"""
+        interval = BREAKER_PROBE_INTERVAL
+        while self.state == OPEN:
+            time.sleep(interval * random.uniform(0.8, 1.2))
+            if self._probe():
+                self._close()
+                return
+            interval = min(interval * 2, BREAKER_PROBE_MAX_INTERVAL)
+
+    def _probe(self) -> bool:
+        """Send one request to the probe URL, without retries"""
+        # Imported here because http_client imports this module
+        import http_client
+
+        try:
+            response = http_client.get_session().get(
+                self.probe_url,
+                headers=self.probe_headers,
+                timeout=BREAKER_PROBE_TIMEOUT
+            )
+            response.close()
+        except Exception as e:
+            logger.info(f"Probe of {self.probe_url} failed: {str(e)}")
+            return False
+
+        if response.status_code in BREAKER_FAILURE_STATUS_CODES:
+            logger.info(f"Probe of {self.probe_url} returned status {response.status_code}")
+            return False
+        return True
+
+    def _close(self) -> None:
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+            outage = time.time() - self.opened_at if self.opened_at else 0
+        logger.info(f"Circuit breaker for {self.host} closed after {outage:.0f}s, {self.probe_url} is reachable")
+        record_circuit_state(self.host, CLOSED)
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get the breaker state
+
+        Returns:
+            A dictionary with the state, consecutive failures, when it opened and
+            the last URL that failed
+        """
+        with self.lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "opened_at": self.opened_at,
+                "last_failed_url": self.last_failed_url
+            }
+
+
+# One breaker per host, shared by every thread in this process
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(url: str) -> CircuitBreaker:
+    """
+    Get the circuit breaker for the host of a URL
+
+    Args:
+        url: Any URL on the host
+
+    Returns:
+        The host's circuit breaker
+    """
+    parts = urlsplit(url)
+    # Keyed by host and port, so each server gets its own breaker and probe URL
+    host = parts.netloc
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(host)
+            if breaker is None:
+                breaker = _breakers[host] = CircuitBreaker(host, f"{parts.scheme}://{parts.netloc}/")
+    return breaker
+
+
+def is_available(url: str) -> bool:
+    """
+    Check whether requests to the host of a URL are currently allowed
+
+    Args:
+        url: Any URL on the host
+
+    Returns:
+        False if the host's breaker is open
+    """
+    return not BREAKER_ENABLED or get_breaker(url).allow_request()
+
+
+def get_breaker_states() -> Dict[str, Dict[str, Any]]:
+    """
+    Get the state of every circuit breaker
+
+    Returns:
+        A dictionary mapping each host to its breaker status
+    """
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.host: breaker.get_status() for breaker in breakers}
@@ -0,0 +1,220 @@
+"""
+This module compresses article text to fit a token budget before it is sent
+to the LLM. It drops boilerplate lines, always keeps the lead paragraph and
+fills the rest of the budget with the highest-ranked sentences, kept in
+their original order.
+
+Run it directly to report the token reduction on a set of text files:
+    python compression.py article1.txt article2.txt ...
+"""
+
+import logging
+import math
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Token budgets for the article text sent with each type of LLM call
+SUMMARY_TOKEN_BUDGET = int(os.environ.get("SUMMARY_TOKEN_BUDGET", "1500"))
+SENTIMENT_TOKEN_BUDGET = int(os.environ.get("SENTIMENT_TOKEN_BUDGET", "600"))
+ANALYSIS_TOKEN_BUDGET = int(os.environ.get("ANALYSIS_TOKEN_BUDGET", "1500"))
+
+# The model's tokenizer, loaded on first use when the optional tiktoken package
+# is installed (importing it, and fetching its BPE file, is too slow for startup)
+_encoding: Optional[Any] = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+# Lines matching these patterns are page furniture rather than article content
+BOILERPLATE_PATTERNS = re.compile(
+    r"(share (this|on)|follow us|subscribe|sign up|newsletter|click here|read more|"
+    r"related (stories|articles|news)|all rights reserved|©|copyright|cookie|"
+    r"privacy policy|skip to (main )?content|back to top|print this|email this)",
+    re.IGNORECASE
+)
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[\"'“A-Z0-9])")
+WORD = re.compile(r"[a-z0-9']+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "been", "but", "by", "for", "from",
+    "has", "have", "he", "her", "his", "in", "is", "it", "its", "of", "on", "or",
+    "our", "she", "that", "the", "their", "they", "this", "to", "was", "we", "were",
+    "which", "who", "will", "with", "you", "also", "said", "says"
+}
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens in a text
+    
+    Args:
+        text: The text to measure
+    
+    Returns:
+        The token count from tiktoken, or an estimate of four characters per token
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return math.ceil(len(text) / 4)
+
+
+def _get_encoding() -> Optional[Any]:
+    """Load the tiktoken encoding once, or return None if tiktoken is unavailable"""
+    global _encoding, _encoding_loaded
+    if _encoding_loaded:
+        return _encoding
+    
+    with _encoding_lock:
+        if not _encoding_loaded:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding("o200k_base")
+            except Exception as e:
+                logger.info(f"tiktoken is unavailable, estimating token counts: {str(e)}")
+                _encoding = None
+            _encoding_loaded = True
+    return _encoding
+
+
+def _is_boilerplate(line: str) -> bool:
+    """Return True for short navigation-style lines and known boilerplate"""
+    if BOILERPLATE_PATTERNS.search(line) and len(line.split()) < 25:
+        return True
+    # Menu items and captions are short and have no sentence punctuation
+    return len(line.split()) < 4 and not line.rstrip().endswith((".", "!", "?", "\""))
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences
+    
+    Args:
+        text: The text to split
+    
+    Returns:
+        A list of non-empty sentences
+    """
+    return [sentence.strip() for sentence in SENTENCE_SPLIT.split(text) if sentence.strip()]
+
+
+def compress_text(text: str, token_budget: int) -> str:
+    """
+    Fit article text into a token budget
+    
+    Args:
+        text: The full article text
+        token_budget: The maximum number of tokens to keep
+    
+    Returns:
+        The compressed text, or the original text if it already fits
+    """
+    if not text or count_tokens(text) <= token_budget:
+        return text
+    
+    paragraphs = [line.strip() for line in text.split("\n") if line.strip()]
+    paragraphs = [line for line in paragraphs if not _is_boilerplate(line)]
+    if not paragraphs:
+        return ""
+    
+    # The lead paragraph carries the who/what/when, so it is always kept (and cut if needed)
+    lead = paragraphs[0]
+    lead_tokens = count_tokens(lead)
+    if lead_tokens >= token_budget:
+        return _cut_to_budget(lead, token_budget)
+    
+    sentences = []
+    for paragraph in paragraphs[1:]:
+        sentences.extend(split_sentences(paragraph))
+    
+    # Score sentences by the document frequency of their content words, with a bonus for early ones
+    frequencies = Counter(
+        word for sentence in sentences for word in WORD.findall(sentence.lower())
+        if word not in STOPWORDS
+    )
+    scores = []
+    for position, sentence in enumerate(sentences):
+        words = [word for word in WORD.findall(sentence.lower()) if word not in STOPWORDS]
+        if not words:
+            scores.append(0.0)
+            continue
+        score = sum(frequencies[word] for word in words) / len(words)
+        score *= 1 + 1 / (1 + position)
+        scores.append(score)
+    
+    remaining = token_budget - lead_tokens
+    kept = set()
+    for index in sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True):
+        tokens = count_tokens(sentences[index]) + 1
+        if tokens <= remaining:
+            kept.add(index)
+            remaining -= tokens
+    
+    body = " ".join(sentences[i] for i in sorted(kept))
+    return f"{lead}\n\n{body}" if body else lead
+
+
+def _cut_to_budget(text: str, token_budget: int) -> str:
+    """Cut text to a token budget, for a lead paragraph that is too long on its own"""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text)[:token_budget]) + "..."
+    return text[:token_budget * 4] + "..."
+
+
+def measure_compression(text: str, token_budget: int) -> Dict[str, float]:
+    """
+    Measure how much compress_text shrinks a text
+    
+    Args:
+        text: The full article text
+        token_budget: The token budget
+    
+    Returns:
+        A dictionary with original and compressed token counts, the
+        reduction ratio and the fraction of sentences kept
+    """
+    compressed = compress_text(text, token_budget)
+    original_tokens = count_tokens(text)
+    compressed_tokens = count_tokens(compressed)
+    original_sentences = len(split_sentences(text.replace("\n", " ")))
+    kept_sentences = len(split_sentences(compressed.replace("\n", " ")))
+    
+    return {
+        "original_tokens": original_tokens,
+        "compressed_tokens": compressed_tokens,
+        "reduction": 1 - compressed_tokens / original_tokens if original_tokens else 0.0,
+        "keep_rate": kept_sentences / original_sentences if original_sentences else 1.0
+    }
+
+
+if __name__ == "__main__":
+    # Report token reduction and keep-rate for each call type's budget on a fixture corpus
+    paths = sys.argv[1:]
+    if not paths:
+        print("Usage: python compression.py FILE [FILE ...]")
+        sys.exit(1)
+    
+    texts = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            texts.append(f.read())
+    
+    print(f"Tokenizer: {'tiktoken o200k_base' if _get_encoding() is not None else 'estimate (4 chars/token)'}")
+    for name, budget in [("summary", SUMMARY_TOKEN_BUDGET), ("sentiment", SENTIMENT_TOKEN_BUDGET), ("analysis", ANALYSIS_TOKEN_BUDGET)]:
+        results = [measure_compression(text, budget) for text in texts]
+        original = sum(r["original_tokens"] for r in results)
+        compressed = sum(r["compressed_tokens"] for r in results)
+        keep_rate = sum(r["keep_rate"] for r in results) / len(results)
+        print(
+            f"{name:10s} budget={budget:5d}  tokens {original:7d} -> {compressed:7d}  "
+            f"reduction={1 - compressed / original if original else 0:.1%}  keep-rate={keep_rate:.1%}"
+        )
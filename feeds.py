@@ -0,0 +1,120 @@
+"""
+This module reads WordPress RSS feeds for college news sections. A section
+feed gives headlines, links, dates and usually the full article content in
+one small response, so most articles never need their own page fetch.
+
+Feeds are parsed incrementally as they download, so reading can stop as
+soon as enough items have been seen. Item content is kept as HTML and only
+converted to text by extract_item_text, so callers can skip the conversion
+for items they have already indexed.
+"""
+
+import logging
+import re
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, Iterable, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CONTENT_NAMESPACE = "{http://purl.org/rss/1.0/modules/content/}"
+
+# Feed content shorter than this is treated as an excerpt, not the full article
+MIN_CONTENT_LENGTH = 200
+
+
+def get_feed_url(section_url: str) -> str:
+    """
+    Get the RSS feed URL of a WordPress section page
+    
+    Args:
+        section_url: The URL of the section page
+    
+    Returns:
+        The URL of the section's feed
+    """
+    return section_url.rstrip("/") + "/feed/"
+
+
+def html_to_text(html: str) -> str:
+    """
+    Convert feed item HTML to plain text
+    
+    Args:
+        html: The HTML content of a feed item
+    
+    Returns:
+        The text, one block per line
+    """
+    # Imported on first use to keep startup fast
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(html, "html.parser")
+    for element in soup(["script", "style", "figure", "iframe"]):
+        element.decompose()
+    text = soup.get_text(separator="\n", strip=True)
+    return re.sub(r"\n{3,}", "\n\n", text)
+
+
+def parse_feed(chunks: Iterable[bytes], max_items: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    Parse an RSS feed incrementally, stopping after max_items items
+    
+    Args:
+        chunks: The feed body as an iterable of byte chunks
+        max_items: The maximum number of items to read
+    
+    Returns:
+        A list of items with headline, url, published and content (the item's
+        HTML, empty when it has none), or None if the body is not an RSS feed
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    items = []
+    saw_channel = False
+    
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if event == "start":
+                    if element.tag == "channel":
+                        saw_channel = True
+                    continue
+                if element.tag != "item":
+                    continue
+                
+                items.append(_parse_item(element))
+                element.clear()
+                if len(items) >= max_items:
+                    return items
+        parser.close()
+    except ET.ParseError as e:
+        logger.warning(f"Could not parse feed: {str(e)}")
+        return items if items else None
+    
+    return items if saw_channel else None
+
+
+def extract_item_text(content: str) -> Optional[str]:
+    """
+    Get the article text from a feed item's content
+    
+    Args:
+        content: The HTML content of a feed item
+    
+    Returns:
+        The text, or None when the content is empty or only an excerpt
+    """
+    text = html_to_text(content) if content else ""
+    return text if len(text) >= MIN_CONTENT_LENGTH else None
+
+
+def _parse_item(element: ET.Element) -> Dict[str, Any]:
+    """Extract the fields we use from an RSS item"""
+    return {
+        "headline": (element.findtext("title") or "").strip(),
+        "url": (element.findtext("link") or "").strip(),
+        "published": (element.findtext("pubDate") or "").strip(),
+        "content": element.findtext(f"{CONTENT_NAMESPACE}encoded") or ""
+    }
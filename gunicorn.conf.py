@@ -0,0 +1,68 @@
+"""
+Gunicorn settings, loaded automatically when gunicorn starts from the
+repository root (e.g. `gunicorn --bind 0.0.0.0:5000 main:app`).
+
+Each worker is a separate process with its own metrics, so prometheus_client
+runs in multiprocess mode: workers write their samples to
+PROMETHEUS_MULTIPROC_DIR and /metrics aggregates them, whichever worker
+answers the scrape.
+
+The app is preloaded in the master process (GUNICORN_PRELOAD=false turns
+this off), so workers fork with the app and its heavy libraries already
+imported and share that memory copy-on-write. Anything that must not cross
+a fork (HTTP sessions, OpenAI clients, sqlite connections, threads) is
+created per process on first use, and the background refresh is started in
+each worker after the fork.
+"""
+
+import gc
+import importlib
+import os
+import shutil
+import tempfile
+
+# Must be set before the workers import prometheus_client
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "cuheadlines-metrics"))
+
+# The workers start the background refresh in post_fork, so a preloaded app must not start it in the master
+os.environ["SCHEDULER_STARTED_BY_SERVER"] = "true"
+
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# Libraries the app imports on first use; a preloaded master imports them once for every worker
+PRELOAD_MODULES = ["httpx", "openai", "trafilatura", "bs4", "selectolax.lexbor", "lxml.html"]
+
+
+def on_starting(server):
+    """Start from empty metric files rather than the previous run's totals"""
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def when_ready(server):
+    """Import the heavy libraries in a preloaded master before the workers are forked"""
+    if not server.cfg.preload_app:
+        return
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    # Keep the garbage collector from writing to (and so copying) the objects the workers inherit
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Start the background refresh in the worker, since threads don't survive a fork"""
+    from scheduler import start_scheduler
+    start_scheduler()
+
+
+def child_exit(server, worker):
+    """Drop the live gauge samples of a worker that has exited"""
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,224 @@
+"""
+This module provides pluggable HTML parser backends for section pages.
+Section pages are only needed for their article containers and links, so
+each backend returns just that data instead of a full document tree:
+
+- "html.parser": BeautifulSoup with Python's built-in parser
+- "lxml": BeautifulSoup with the lxml parser
+- "selectolax": the selectolax (lexbor) parser, if installed
+
+BeautifulSoup backends skip the parts of the page that can never contain
+containers or links (the head, scripts, styles and comments).
+
+Run it directly to time each backend on saved pages and check that they
+all extract the same articles:
+    python html_parser.py tests/fixtures/sections/*.html
+"""
+
+import logging
+import os
+import re
+import sys
+import time
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+# The parsers are imported on first use, so importing this module stays cheap
+SELECTOLAX_AVAILABLE = find_spec("selectolax") is not None
+LXML_AVAILABLE = find_spec("lxml") is not None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# "auto" picks the fastest installed backend
+HTML_PARSER_BACKEND = os.environ.get("HTML_PARSER_BACKEND", "auto").lower()
+
+# Elements that hold one article on a section page
+ARTICLE_CONTAINER_SELECTOR = '.news-item, .article, .post, .news-article, article, .story'
+HEADING_SELECTOR = 'h1, h2, h3, h4'
+
+# Regions that never contain article containers or links
+IRRELEVANT_REGIONS = re.compile(
+    r"<head[\s>].*?</head\s*>|<script\b.*?</script\s*>|<style\b.*?</style\s*>|<!--.*?-->",
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def get_backend(backend: Optional[str] = None) -> str:
+    """
+    Resolve the parser backend to use
+    
+    Args:
+        backend: A backend name, or None to use HTML_PARSER_BACKEND
+    
+    Returns:
+        An available backend name
+    """
+    backend = (backend or HTML_PARSER_BACKEND).lower()
+    if backend == "selectolax" and not SELECTOLAX_AVAILABLE:
+        logger.warning("selectolax is not installed, falling back to another parser")
+        backend = "auto"
+    if backend == "lxml" and not LXML_AVAILABLE:
+        logger.warning("lxml is not installed, falling back to html.parser")
+        backend = "html.parser"
+    if backend == "auto":
+        if SELECTOLAX_AVAILABLE:
+            return "selectolax"
+        return "lxml" if LXML_AVAILABLE else "html.parser"
+    return backend
+
+
+def strip_irrelevant_regions(html: str) -> str:
+    """
+    Remove the head, scripts, styles and comments from a page
+    
+    Args:
+        html: The page HTML
+    
+    Returns:
+        The HTML with those regions removed
+    """
+    return IRRELEVANT_REGIONS.sub("", html)
+
+
+def parse_section_page(html: str, backend: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Extract article containers, or all links if there are none, from a section page
+    
+    Args:
+        html: The section page HTML
+        backend: The parser backend (defaults to HTML_PARSER_BACKEND)
+    
+    Returns:
+        A dictionary with "containers", a list of {href, link_text, heading_text}
+        in document order (href is None for containers without a link), and
+        "links", a list of {href, text} that is only filled when no containers
+        were found
+    """
+    backend = get_backend(backend)
+    if backend == "selectolax":
+        return _parse_with_selectolax(html)
+    return _parse_with_soup(strip_irrelevant_regions(html), backend)
+
+
+def _parse_with_soup(html: str, features: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Extract section page data with BeautifulSoup"""
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(html, features)
+    
+    containers = []
+    for container in soup.select(ARTICLE_CONTAINER_SELECTOR):
+        link_tag = container.find('a', href=True)
+        if not link_tag:
+            containers.append({'href': None, 'link_text': '', 'heading_text': ''})
+            continue
+        heading_tag = container.find(['h1', 'h2', 'h3', 'h4'])
+        containers.append({
+            'href': link_tag.get('href', ''),
+            'link_text': link_tag.get_text(),
+            'heading_text': heading_tag.get_text() if heading_tag else ''
+        })
+    
+    links = []
+    if not containers:
+        links = [{'href': link['href'], 'text': link.get_text()} for link in soup.find_all('a', href=True)]
+    
+    return {'containers': containers, 'links': links}
+
+
+def _parse_with_selectolax(html: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Extract section page data with selectolax"""
+    from selectolax.lexbor import LexborHTMLParser
+    
+    tree = LexborHTMLParser(html)
+    
+    containers = []
+    seen = set()
+    for container in tree.css(ARTICLE_CONTAINER_SELECTOR):
+        # lexbor returns an element once per selector it matches, unlike soupsieve
+        if container.mem_id in seen:
+            continue
+        seen.add(container.mem_id)
+        
+        link_tag = container.css_first('a[href]')
+        if link_tag is None:
+            containers.append({'href': None, 'link_text': '', 'heading_text': ''})
+            continue
+        heading_tag = container.css_first(HEADING_SELECTOR)
+        containers.append({
+            'href': link_tag.attributes.get('href') or '',
+            'link_text': link_tag.text(deep=True),
+            'heading_text': heading_tag.text(deep=True) if heading_tag is not None else ''
+        })
+    
+    links = []
+    if not containers:
+        links = [
+            {'href': link.attributes.get('href') or '', 'text': link.text(deep=True)}
+            for link in tree.css('a[href]')
+        ]
+    
+    return {'containers': containers, 'links': links}
+
+
+def parse_headline_elements(html: str) -> "BeautifulSoup":
+    """
+    Parse only the title and top-level headings of an article page
+    
+    Args:
+        html: The article page HTML
+    
+    Returns:
+        A BeautifulSoup tree containing just the title, h1 and h2 elements
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+    
+    return BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer(['title', 'h1', 'h2']))
+
+
+def _available_backends() -> List[str]:
+    """Return every backend that can run here"""
+    backends = ["html.parser"]
+    if LXML_AVAILABLE:
+        backends.append("lxml")
+    if SELECTOLAX_AVAILABLE:
+        backends.append("selectolax")
+    return backends
+
+
+if __name__ == "__main__":
+    # Micro-benchmark: parse time per page for each backend, plus an equivalence check
+    paths = sys.argv[1:]
+    if not paths:
+        print("Usage: python html_parser.py PAGE [PAGE ...]")
+        sys.exit(1)
+    
+    repeat = int(os.environ.get("BENCH_REPEAT", "20"))
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            page = f.read()
+        
+        print(f"{path} ({len(page) / 1024:.0f} KiB)")
+        
+        # Reference result: a full, unstripped html.parser parse, as the scraper originally did
+        reference = _parse_with_soup(page, "html.parser")
+        start = time.perf_counter()
+        for _ in range(repeat):
+            _parse_with_soup(page, "html.parser")
+        baseline = (time.perf_counter() - start) / repeat
+        print(f"  {'full html.parser':18s} {baseline * 1000:8.2f} ms")
+        
+        for backend in _available_backends():
+            result = parse_section_page(page, backend)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                parse_section_page(page, backend)
+            elapsed = (time.perf_counter() - start) / repeat
+            
+            same = "identical" if result == reference else "DIFFERENT"
+            print(f"  {backend:18s} {elapsed * 1000:8.2f} ms  {baseline / elapsed:5.1f}x  {same}")
@@ -0,0 +1,162 @@
+"""
+This module implements a persistent on-disk cache of downloaded pages for
+HTTP conditional requests. Each page is stored with its ETag and
+Last-Modified validators so it can be revalidated with If-None-Match and
+If-Modified-Since, and a 304 response can be served from disk.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Cache settings
+HTTP_CACHE_ENABLED = os.environ.get("HTTP_CACHE_ENABLED", "true").lower() == "true"
+HTTP_CACHE_DIR = os.environ.get("HTTP_CACHE_DIR", os.path.join(".cache", "http"))
+HTTP_CACHE_MAX_BYTES = int(os.environ.get("HTTP_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+# Serializes eviction within a process; writes themselves are atomic renames
+_eviction_lock = threading.Lock()
+
+
+def _get_entry_path(url: str) -> str:
+    """Return the path of the cache file for a URL"""
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(HTTP_CACHE_DIR, f"{key}.json")
+
+
+def get_cached_page(url: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the cached copy of a page
+    
+    Args:
+        url: The URL of the page
+    
+    Returns:
+        A dictionary with url, body, etag and last_modified, or None if not cached
+    """
+    if not HTTP_CACHE_ENABLED:
+        return None
+    
+    try:
+        with open(_get_entry_path(url), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable cache entry for {url}: {str(e)}")
+        return None
+    
+    # Guard against hash collisions
+    if entry.get("url") != url:
+        return None
+    
+    return entry
+
+
+def get_conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Get the headers needed to revalidate a cached page
+    
+    Args:
+        entry: The cached page, or None
+    
+    Returns:
+        A dictionary of If-None-Match and If-Modified-Since headers
+    """
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def touch_page(url: str) -> None:
+    """
+    Mark a cached page as recently used
+    
+    Args:
+        url: The URL of the page
+    """
+    if not HTTP_CACHE_ENABLED:
+        return
+    
+    try:
+        os.utime(_get_entry_path(url))
+    except OSError:
+        pass
+
+
+def store_page(url: str, body: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+    """
+    Store a downloaded page in the cache
+    
+    Pages without an ETag or Last-Modified header cannot be revalidated
+    and are not stored.
+    
+    Args:
+        url: The URL of the page
+        body: The page content
+        etag: The ETag response header
+        last_modified: The Last-Modified response header
+    """
+    if not HTTP_CACHE_ENABLED or not (etag or last_modified):
+        return
+    
+    entry = {
+        "url": url,
+        "body": body,
+        "etag": etag,
+        "last_modified": last_modified
+    }
+    
+    try:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        # Write to a temporary file and rename so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=HTTP_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, _get_entry_path(url))
+    except OSError as e:
+        logger.warning(f"Failed to cache page {url}: {str(e)}")
+        return
+    
+    _evict_if_needed()
+
+
+def _evict_if_needed() -> None:
+    """Delete the least recently used entries until the cache fits its size limit"""
+    with _eviction_lock:
+        entries = []
+        total_size = 0
+        try:
+            with os.scandir(HTTP_CACHE_DIR) as it:
+                for dir_entry in it:
+                    if not dir_entry.name.endswith(".json"):
+                        continue
+                    stat = dir_entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, dir_entry.path))
+                    total_size += stat.st_size
+        except OSError:
+            return
+        
+        if total_size <= HTTP_CACHE_MAX_BYTES:
+            return
+        
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+            if total_size <= HTTP_CACHE_MAX_BYTES:
+                break
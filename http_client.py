@@ -0,0 +1,152 @@
+"""
+This module provides the shared HTTP session used by the scraper. The session
+keeps connections to the news site alive between requests and retries
+rate-limited or failing requests with jittered exponential backoff.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from circuit_breaker import BREAKER_ENABLED, BREAKER_FAILURE_STATUS_CODES, CircuitOpenError, get_breaker
+from metrics import record_upstream_status
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Connection pool and retry settings
+POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", "10"))
+MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.environ.get("HTTP_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.environ.get("HTTP_BACKOFF_MAX", "30"))
+
+# Status codes that are worth retrying
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# One session per process - sessions must not be shared across a fork
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Get the pooled HTTP session for the current process
+    
+    Returns:
+        A requests session with keep-alive connection pools
+    """
+    global _session, _session_pid
+    
+    pid = os.getpid()
+    with _session_lock:
+        if _session is None or _session_pid != pid:
+            session = requests.Session()
+            # Retries are handled in get() so that Retry-After and jitter can be honored
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+            _session_pid = pid
+        return _session
+
+
+def get_retry_delay(attempt: int, response: Optional[requests.Response] = None) -> float:
+    """
+    Get how long to wait before retrying a request
+    
+    Args:
+        attempt: The number of the retry, starting at 0
+        response: The response that triggered the retry, if any
+        
+    Returns:
+        The delay in seconds, taken from Retry-After when present
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return max(0.0, min(delay, BACKOFF_MAX))
+    
+    # Exponential backoff with full jitter
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def get(url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 10,
+        stream: bool = False) -> requests.Response:
+    """
+    Send a GET request through the shared session, retrying on 429 and 5xx responses
+    
+    Requests to a host whose circuit breaker is open fail immediately. Once
+    its retries are done, each call counts once towards opening or resetting
+    the host's breaker.
+    
+    Args:
+        url: The URL to request
+        headers: The request headers
+        timeout: The request timeout in seconds
+        stream: Whether to leave the body unread so it can be consumed incrementally
+        
+    Returns:
+        The final response, which may still be an error response once retries run out
+    
+    Raises:
+        CircuitOpenError: If the host's circuit breaker is open
+    """
+    session = get_session()
+    host = urlsplit(url).hostname
+    breaker = get_breaker(url) if BREAKER_ENABLED else None
+    
+    for attempt in range(MAX_RETRIES + 1):
+        if breaker is not None and not breaker.allow_request():
+            raise CircuitOpenError(breaker.host)
+        
+        try:
+            response = session.get(url, headers=headers, timeout=timeout, stream=stream)
+        except requests.ConnectionError:
+            record_upstream_status(host, "connection_error")
+            if attempt >= MAX_RETRIES:
+                if breaker is not None:
+                    breaker.record_failure(url, headers)
+                raise
+            delay = get_retry_delay(attempt)
+            logger.warning(f"Connection error for {url}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+        except requests.Timeout:
+            # Read timeouts are not retried, the site is too slow to wait on again
+            record_upstream_status(host, "timeout")
+            if breaker is not None:
+                breaker.record_failure(url, headers)
+            raise
+        
+        record_upstream_status(host, response.status_code)
+        if response.status_code not in RETRY_STATUS_CODES or attempt >= MAX_RETRIES:
+            if breaker is not None:
+                if response.status_code in BREAKER_FAILURE_STATUS_CODES:
+                    breaker.record_failure(url, headers)
+                else:
+                    breaker.record_success()
+            return response
+        
+        delay = get_retry_delay(attempt, response)
+        logger.warning(f"Got status {response.status_code} for {url}, retrying in {delay:.1f}s")
+        response.close()
+        time.sleep(delay)
+    
+    return response
@@ -0,0 +1,192 @@
+"""
+This module provides a fast in-process sentiment scorer for news articles.
+It uses a small lexicon tuned for college news and returns the same
+{rating, confidence, explanation} shape as summarizer.analyze_sentiment.
+Confident results skip the LLM sentiment call, or in combined analysis
+mode, the sentiment part of the combined call.
+"""
+
+import os
+import random
+import re
+import threading
+from typing import Any, Dict
+
+# Articles scored below this confidence are escalated to the LLM
+LOCAL_SENTIMENT_THRESHOLD = float(os.environ.get("LOCAL_SENTIMENT_THRESHOLD", "0.7"))
+LOCAL_SENTIMENT_ENABLED = os.environ.get("LOCAL_SENTIMENT_ENABLED", "true").lower() == "true"
+# Fraction of confident local scores that are also rated by the LLM, to measure how often they agree
+LOCAL_SENTIMENT_SHADOW_RATE = float(os.environ.get("LOCAL_SENTIMENT_SHADOW_RATE", "0.05"))
+
+POSITIVE_WORDS = {
+    "award": 2, "awarded": 2, "awards": 2, "honor": 2, "honored": 2, "honors": 1,
+    "win": 2, "wins": 2, "won": 2, "winner": 2, "winning": 2, "celebrate": 2,
+    "celebrates": 2, "celebrated": 2, "celebration": 2, "congratulations": 2,
+    "grant": 1, "grants": 1, "funding": 1, "funded": 1, "donation": 1, "gift": 1,
+    "success": 2, "successful": 2, "achievement": 2, "achieve": 1, "achieved": 1,
+    "excellence": 2, "excellent": 2, "outstanding": 2, "innovative": 1,
+    "innovation": 1, "breakthrough": 2, "prestigious": 2, "recognized": 1,
+    "recognition": 1, "record": 1, "top": 1, "best": 2, "leading": 1,
+    "proud": 2, "pride": 1, "thrilled": 2, "excited": 2, "exciting": 2,
+    "opportunity": 1, "opportunities": 1, "growth": 1, "improve": 1,
+    "improved": 1, "improves": 1, "benefit": 1, "benefits": 1, "support": 1,
+    "new": 1, "launch": 1, "launches": 1, "opens": 1, "expands": 1,
+    "partnership": 1, "collaboration": 1, "scholarship": 2, "scholarships": 2,
+    "fellowship": 2, "graduate": 1, "graduates": 1, "promoted": 1, "milestone": 2,
+    "help": 1, "helps": 1, "healthy": 1, "inspiring": 2, "impact": 1
+}
+
+NEGATIVE_WORDS = {
+    "death": 3, "died": 3, "dies": 3, "killed": 3, "tragedy": 3, "tragic": 3,
+    "mourn": 3, "mourns": 3, "loss": 2, "lost": 1, "injury": 2, "injured": 2,
+    "crash": 2, "accident": 2, "fire": 1, "emergency": 2, "crisis": 2,
+    "disease": 1, "outbreak": 2, "threat": 2, "threats": 2, "risk": 1,
+    "risks": 1, "decline": 2, "declines": 2, "declined": 2, "drop": 1,
+    "cut": 1, "cuts": 2, "layoffs": 3, "closure": 2, "closes": 1, "closed": 1,
+    "cancel": 2, "canceled": 2, "cancelled": 2, "postponed": 1, "delay": 1,
+    "delayed": 1, "fail": 2, "failed": 2, "failure": 2, "problem": 1,
+    "problems": 1, "concern": 1, "concerns": 1, "warning": 2, "warns": 2,
+    "investigation": 2, "lawsuit": 2, "violation": 2, "arrest": 3,
+    "arrested": 3, "shooting": 3, "violence": 3, "damage": 2, "damaged": 2,
+    "shortage": 2, "struggle": 1, "struggles": 1, "suspended": 2, "scandal": 3,
+    "controversy": 2, "protest": 1, "drought": 1, "pest": 1, "pests": 1
+}
+
+NEGATIONS = {"not", "no", "never", "without", "neither", "nor", "hardly"}
+
+WORD = re.compile(r"[a-z']+")
+
+# Number of sentiment words at which a score is considered fully supported
+EVIDENCE_SATURATION = 8
+
+# Polarity values where the rating changes, and how far inside a rating band
+# a polarity must be before the rating is considered clear
+RATING_BOUNDARIES = (-0.6, -0.2, 0.2, 0.6)
+CLEAR_MARGIN = 0.2
+
+# Counters for escalation rate and agreement with the LLM
+_stats = {"scored": 0, "local": 0, "escalated": 0, "shadowed": 0, "compared": 0, "agreed": 0}
+_stats_lock = threading.Lock()
+
+
+def score_sentiment(text: str) -> Dict[str, Any]:
+    """
+    Score the sentiment of a text with the local lexicon
+    
+    Args:
+        text: The text to analyze
+    
+    Returns:
+        A dictionary with sentiment rating (1-5), confidence score and explanation
+    """
+    words = WORD.findall(text.lower())
+    positive = 0
+    negative = 0
+    for i, word in enumerate(words):
+        weight = POSITIVE_WORDS.get(word, 0) - NEGATIVE_WORDS.get(word, 0)
+        if not weight:
+            continue
+        # Flip words preceded by a negation ("not successful")
+        if (i > 0 and words[i - 1] in NEGATIONS) or (i > 1 and words[i - 2] in NEGATIONS):
+            weight = -weight
+        if weight > 0:
+            positive += weight
+        else:
+            negative -= weight
+    
+    total = positive + negative
+    with _stats_lock:
+        _stats["scored"] += 1
+    
+    if total == 0:
+        return {"rating": 3, "confidence": 0.0, "explanation": "No sentiment cues found"}
+    
+    polarity = (positive - negative) / total
+    if polarity > 0.6:
+        rating = 5
+    elif polarity > 0.2:
+        rating = 4
+    elif polarity >= -0.2:
+        rating = 3
+    elif polarity > -0.6:
+        rating = 2
+    else:
+        rating = 1
+    
+    # Confidence grows with the amount of evidence and with how far the
+    # polarity sits from the nearest rating boundary, so a well-supported 2,
+    # 3 or 4 can be as confident as a 1 or 5. Thin evidence, or a polarity
+    # close to where the rating would change, goes to the LLM.
+    evidence = min(1.0, total / EVIDENCE_SATURATION)
+    margin = min(abs(polarity - boundary) for boundary in RATING_BOUNDARIES)
+    clarity = min(1.0, margin / CLEAR_MARGIN)
+    confidence = round(evidence * (0.5 + 0.5 * clarity), 2)
+    
+    tone = {5: "Very positive", 4: "Positive", 3: "Neutral", 2: "Negative", 1: "Very negative"}[rating]
+    return {
+        "rating": rating,
+        "confidence": confidence,
+        "explanation": f"{tone} news (local score: {positive} positive, {negative} negative cues)"
+    }
+
+
+def is_confident(sentiment: Dict[str, Any]) -> bool:
+    """
+    Check whether a local score is confident enough to skip the LLM
+    
+    Args:
+        sentiment: A result from score_sentiment
+    
+    Returns:
+        True if the score meets LOCAL_SENTIMENT_THRESHOLD
+    """
+    confident = LOCAL_SENTIMENT_ENABLED and sentiment["confidence"] >= LOCAL_SENTIMENT_THRESHOLD
+    with _stats_lock:
+        _stats["local" if confident else "escalated"] += 1
+    return confident
+
+
+def should_shadow() -> bool:
+    """
+    Decide whether a confident local score is also sent to the LLM as a shadow sample
+    
+    Returns:
+        True for a LOCAL_SENTIMENT_SHADOW_RATE fraction of calls
+    """
+    shadow = random.random() < LOCAL_SENTIMENT_SHADOW_RATE
+    if shadow:
+        with _stats_lock:
+            _stats["shadowed"] += 1
+    return shadow
+
+
+def record_agreement(local: Dict[str, Any], llm: Dict[str, Any]) -> None:
+    """
+    Compare a confident local score with the LLM rating of its shadow sample
+    
+    Args:
+        local: A result from score_sentiment
+        llm: The LLM sentiment result
+    """
+    with _stats_lock:
+        _stats["compared"] += 1
+        if abs(local["rating"] - llm.get("rating", 3)) <= 1:
+            _stats["agreed"] += 1
+
+
+def get_sentiment_stats() -> Dict[str, Any]:
+    """
+    Get the local sentiment counters for this process
+    
+    Returns:
+        A dictionary with counts, the escalation rate and the agreement
+        rate (how often a confident local rating was within one star of the
+        LLM rating, over the shadow samples)
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    
+    decided = stats["local"] + stats["escalated"]
+    stats["escalation_rate"] = stats["escalated"] / decided if decided else 0.0
+    stats["agreement_rate"] = stats["agreed"] / stats["compared"] if stats["compared"] else 0.0
+    return stats
@@ -1,16 +1,18 @@
-import json
 import logging
 import os
-import time
-from typing import Dict, List, Optional, Any
 
-from flask import Flask, jsonify, render_template, send_from_directory, request
+from flask import Flask, Response, g, jsonify, render_template, send_from_directory, request, stream_with_context
 from dotenv import load_dotenv
 
-from scraper import scrape_latest_articles
-from summarizer import summarize_article, analyze_sentiment
-from utils import get_college_url, format_output, get_host_url
-from utils_archive import get_fallback_message
+from circuit_breaker import get_breaker_states
+from metrics import generate_metrics
+from news import get_all_news_payload, get_latest_news_payload, iter_latest_news_events
+from profiling import PROFILE_HEADER, PROFILING_ENABLED, RequestProfile, should_profile
+from response_cache import get_response_cache_stats
+from local_sentiment import get_sentiment_stats
+from result_cache import get_cache_stats
+from scheduler import start_scheduler
+from utils import build_openapi_spec, build_plugin_manifest, get_host_url
 
 # Load environment variables from .env file
 load_dotenv()
@@ -22,6 +24,33 @@ logger = logging.getLogger(__name__)
 # Initialize the Flask application
 app = Flask(__name__)
 
+# Start precomputing college digests in the background if enabled. Under gunicorn
+# each worker starts it after forking instead (see gunicorn.conf.py)
+if os.environ.get("SCHEDULER_STARTED_BY_SERVER", "false").lower() != "true":
+    start_scheduler()
+
+# Profile requests on demand; the hooks are only installed when profiling is enabled
+if PROFILING_ENABLED:
+    @app.before_request
+    def start_request_profile():
+        if should_profile(request.headers.get(PROFILE_HEADER)):
+            g.request_profile = RequestProfile(f"{request.method} {request.path}").start()
+
+    @app.after_request
+    def stop_request_profile(response):
+        # Stop once the response has been sent, which for a stream is after its last event
+        profile = g.pop("request_profile", None)
+        if profile is not None:
+            response.call_on_close(profile.stop)
+        return response
+
+    @app.teardown_request
+    def stop_failed_request_profile(exception=None):
+        # after_request is skipped when the view raises
+        profile = g.pop("request_profile", None)
+        if profile is not None:
+            profile.stop()
+
 
 @app.route('/')
 def root():
@@ -38,121 +67,52 @@ def get_latest_news():
     """
     Retrieve and summarize the latest news articles for a specific college
     """
-    # Get the college name from the query parameters
-    college_name = request.args.get('college')
-    if not college_name:
-        return jsonify({
-            "error": "Missing required parameter: college",
-            "message": "Please provide a Clemson University college name"
-        }), 400
-    
-    try:
-        # Currently, many Clemson college news websites are blocking automated access
-        # Use fallback messages for all colleges until we find a better solution
-        logger.warning(f"Using fallback message for {college_name} due to anti-scraping measures")
-        return jsonify({
-            "college": college_name,
-            "result": get_fallback_message(college_name)
-        })
-        
-        # The code below is temporarily disabled due to anti-scraping measures
-        """
-        # Validate and get the college URL
-        college_url = get_college_url(college_name)
-        
-        # Scrape the latest articles (max 10 for latest news)
-        start_time = time.time()
-        logger.info(f"Scraping articles from {college_url} for {college_name}")
-        articles = scrape_latest_articles(college_url, max_articles=10)
-        logger.info(f"Found {len(articles)} articles in {time.time() - start_time:.2f} seconds")
-        
-        if not articles:
-            # If no articles were found, return a meaningful response
-            return jsonify({
-                "college": college_name,
-                "result": f"No recent news articles found for {college_name}."
-            })
-        """
-        
-        # Process each article - summarize and analyze sentiment
-        processed_articles = []
-        for article in articles:
-            # Extract the article headline, content, and URL
-            headline = article.get('headline', 'Untitled Article')
-            content = article.get('text', '')
-            url = article.get('url', '#')
-            
-            # Summarize the article text
-            if content:
-                logger.info(f"Summarizing article: {headline[:50]}...")
-                try:
-                    summary, rewritten_headline = summarize_article(headline, content)
-                    
-                    # Check if summary contains an error message (from OpenAI API failure)
-                    if "Error generating summary" in summary:
-                        # Provide a short excerpt of the article as a fallback
-                        logger.warning("Using raw content excerpt due to summarization error")
-                        fallback_summary = content[:300] + "..." if len(content) > 300 else content
-                        sentiment = {"rating": 3, "confidence": 0, "explanation": "Sentiment analysis unavailable"}
-                        
-                        processed_articles.append({
-                            'headline': headline,
-                            'rewritten_headline': headline,  # Use original headline
-                            'summary': fallback_summary,
-                            'url': url,
-                            'sentiment': sentiment,
-                            'is_raw_content': True
-                        })
-                    else:
-                        # Analyze sentiment
-                        sentiment = analyze_sentiment(content)
-                        
-                        processed_articles.append({
-                            'headline': headline,
-                            'rewritten_headline': rewritten_headline,
-                            'summary': summary,
-                            'url': url,
-                            'sentiment': sentiment,
-                            'is_raw_content': False
-                        })
-                except Exception as e:
-                    logger.error(f"Error processing article: {str(e)}")
-                    # Provide a short excerpt of the article as a fallback
-                    fallback_summary = content[:300] + "..." if len(content) > 300 else content
-                    sentiment = {"rating": 3, "confidence": 0, "explanation": "Sentiment analysis unavailable"}
-                    
-                    processed_articles.append({
-                        'headline': headline,
-                        'rewritten_headline': headline,  # Use original headline
-                        'summary': fallback_summary,
-                        'url': url,
-                        'sentiment': sentiment,
-                        'is_raw_content': True
-                    })
-        
-        # Format the output as markdown text
-        result = format_output(college_name, processed_articles)
-        
-        # Return the result
-        return jsonify({
-            "college": college_name,
-            "result": result
-        })
-    
-    except ValueError as e:
-        # Handle invalid college names
-        return jsonify({
-            "error": "Invalid college name",
-            "message": str(e)
-        }), 400
+    # Stream the digest one article at a time as server-sent events if requested
+    if request.args.get('stream', '').lower() in ('1', 'true'):
+        return Response(
+            stream_with_context(iter_latest_news_events(request.args.get('college'))),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
     
-    except Exception as e:
-        # Log and handle any other errors
-        logger.error(f"Error retrieving news: {str(e)}")
-        return jsonify({
-            "error": "Failed to retrieve news",
-            "message": f"An error occurred: {str(e)}"
-        }), 500
+    payload, status_code = get_latest_news_payload(request.args.get('college'))
+    return jsonify(payload), status_code
+
+
+@app.route('/latest-news/all')
+def get_all_latest_news():
+    """
+    Retrieve and summarize the latest news articles for every college in one digest
+    """
+    payload, status_code = get_all_news_payload()
+    return jsonify(payload), status_code
+
+
+@app.route('/cache-stats')
+def get_cache_statistics():
+    """
+    Return the hit and miss counters of the response and LLM result caches,
+    the local sentiment escalation and agreement rates, and the state of the
+    news site's circuit breaker
+    """
+    return jsonify({
+        "responses": get_response_cache_stats(),
+        "llm_results": get_cache_stats(),
+        "sentiment": get_sentiment_stats(),
+        "circuit_breakers": get_breaker_states()
+    })
+
+
+@app.route('/metrics')
+def get_metrics():
+    """
+    Return pipeline stage timings and counters in Prometheus text format
+    """
+    metrics = generate_metrics()
+    if metrics is None:
+        return Response("prometheus_client is not installed\n", status=503, mimetype="text/plain")
+    body, content_type = metrics
+    return Response(body, content_type=content_type)
 
 
 @app.route('/.well-known/ai-plugin.json')
@@ -160,25 +120,7 @@ def get_plugin_manifest():
     """
     Return the plugin manifest for OpenAI
     """
-    host = get_host_url()
-    
-    return jsonify({
-        "schema_version": "v1",
-        "name_for_human": "Clemson GPT News",
-        "name_for_model": "clemson_gpt_news",
-        "description_for_human": "Get the latest news and summaries from Clemson University colleges.",
-        "description_for_model": "Get the latest news and summaries from Clemson University colleges.",
-        "auth": {
-            "type": "none"
-        },
-        "api": {
-            "type": "openapi",
-            "url": f"{host}/openapi.json"
-        },
-        "logo_url": f"{host}/static/logo.svg",
-        "contact_email": "support@example.com",
-        "legal_info_url": "https://example.com/legal"
-    })
+    return jsonify(build_plugin_manifest(get_host_url()))
 
 
 @app.route('/openapi.json')
@@ -186,109 +128,7 @@ def get_openapi_spec():
     """
     Return the OpenAPI specification
     """
-    host = get_host_url()
-    
-    spec = {
-        "openapi": "3.1.0",
-        "info": {
-            "title": "Clemson GPT News API",
-            "description": "API for retrieving and summarizing news from Clemson University colleges",
-            "version": "v1"
-        },
-        "servers": [
-            {
-                "url": host
-            }
-        ],
-        "paths": {
-            "/latest-news": {
-                "get": {
-                    "operationId": "get_latest_news",
-                    "summary": "Get the latest news and summaries from a Clemson University college",
-                    "parameters": [
-                        {
-                            "name": "college",
-                            "in": "query",
-                            "description": "The name of the Clemson University college",
-                            "required": True,
-                            "schema": {
-                                "type": "string",
-                                "enum": list(["College of Agriculture, Forestry and Life Sciences",
-                                             "College of Architecture, Art and Construction",
-                                             "College of Arts and Humanities",
-                                             "College of Behavioral, Social and Health Sciences",
-                                             "College of Education",
-                                             "College of Engineering, Computing and Applied Sciences",
-                                             "College of Science",
-                                             "Harvey S. Peeler Jr. College of Veterinary Medicine",
-                                             "Wilbur O. and Ann Powers College of Business"])
-                            }
-                        }
-                    ],
-                    "responses": {
-                        "200": {
-                            "description": "OK",
-                            "content": {
-                                "application/json": {
-                                    "schema": {
-                                        "type": "object",
-                                        "properties": {
-                                            "college": {
-                                                "type": "string",
-                                                "description": "The name of the college"
-                                            },
-                                            "result": {
-                                                "type": "string",
-                                                "description": "The news summaries in markdown format"
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        },
-                        "400": {
-                            "description": "Bad Request",
-                            "content": {
-                                "application/json": {
-                                    "schema": {
-                                        "type": "object",
-                                        "properties": {
-                                            "error": {
-                                                "type": "string"
-                                            },
-                                            "message": {
-                                                "type": "string"
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        },
-                        "500": {
-                            "description": "Server Error",
-                            "content": {
-                                "application/json": {
-                                    "schema": {
-                                        "type": "object",
-                                        "properties": {
-                                            "error": {
-                                                "type": "string"
-                                            },
-                                            "message": {
-                                                "type": "string"
-                                            }
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
-    }
-    
-    return jsonify(spec)
+    return jsonify(build_openapi_spec(get_host_url()))
 
 
 @app.route('/static/<path:path>')
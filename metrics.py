@@ -0,0 +1,152 @@
+"""
+This module collects pipeline metrics and renders them for the /metrics
+endpoint in Prometheus text format.
+
+It records timing histograms for each pipeline stage, and counters for LLM
+tokens, cache lookups, fallbacks, upstream HTTP status codes and circuit
+breaker transitions. When
+PROMETHEUS_MULTIPROC_DIR is set (gunicorn.conf.py sets it), every worker
+writes its samples to that directory and /metrics aggregates them, so the
+numbers are correct whichever worker answers the scrape.
+
+Without prometheus_client installed, recording is a no-op and /metrics
+reports that metrics are unavailable.
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram,
+                                   generate_latest, multiprocess)
+except ImportError:
+    Counter = Histogram = None
+
+# Stage durations range from sub-millisecond parsing to LLM calls that take tens of seconds
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+if Histogram is not None:
+    STAGE_SECONDS = Histogram(
+        "cuheadlines_stage_duration_seconds",
+        "Time spent in each pipeline stage",
+        ["stage"],
+        buckets=STAGE_BUCKETS
+    )
+    LLM_TOKENS = Counter(
+        "cuheadlines_llm_tokens_total",
+        "OpenAI tokens used, as reported by response.usage",
+        ["stage", "kind"]
+    )
+    CACHE_LOOKUPS = Counter(
+        "cuheadlines_cache_lookups_total",
+        "Cache lookups by cache and result",
+        ["cache", "result"]
+    )
+    FALLBACKS = Counter(
+        "cuheadlines_fallbacks_total",
+        "Times a degraded result was served instead of the normal one",
+        ["reason"]
+    )
+    UPSTREAM_RESPONSES = Counter(
+        "cuheadlines_upstream_responses_total",
+        "HTTP responses received from upstream services, including retried attempts",
+        ["upstream", "status"]
+    )
+    CIRCUIT_TRANSITIONS = Counter(
+        "cuheadlines_circuit_breaker_transitions_total",
+        "Times a host's circuit breaker opened or closed",
+        ["host", "state"]
+    )
+
+
+def observe_stage(stage: str, seconds: float):
+    """Record the duration of one run of a pipeline stage"""
+    if Histogram is not None:
+        STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+@contextmanager
+def time_stage(stage: str) -> Iterator[None]:
+    """Time the enclosed block as a run of a pipeline stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+def record_token_usage(stage: str, usage: Any):
+    """
+    Count the prompt and completion tokens of an OpenAI response
+
+    Args:
+        stage: The pipeline stage or route that made the call
+        usage: The response's usage object (may be None)
+    """
+    if Histogram is None or usage is None:
+        return
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if tokens:
+            LLM_TOKENS.labels(stage, kind).inc(tokens)
+
+
+def record_cache_lookup(cache: str, result: str):
+    """Count a cache lookup, e.g. record_cache_lookup("llm_results", "hit")"""
+    if Counter is not None:
+        CACHE_LOOKUPS.labels(cache, result).inc()
+
+
+def record_fallback(reason: str):
+    """Count a fallback, e.g. record_fallback("scraping_disabled")"""
+    if Counter is not None:
+        FALLBACKS.labels(reason).inc()
+
+
+def record_upstream_status(upstream: str, status: Any):
+    """Count an upstream response by host and status code (or error name)"""
+    if Counter is not None:
+        UPSTREAM_RESPONSES.labels(upstream or "unknown", str(status)).inc()
+
+
+def record_circuit_state(host: str, state: str):
+    """Count a circuit breaker opening or closing for a host"""
+    if Counter is not None:
+        CIRCUIT_TRANSITIONS.labels(host or "unknown", state).inc()
+
+
+def record_openai_response(response: Any):
+    """httpx response hook that counts OpenAI status codes, retries included"""
+    record_upstream_status("openai", response.status_code)
+
+
+async def record_openai_response_async(response: Any):
+    """Async variant of record_openai_response for httpx.AsyncClient"""
+    record_openai_response(response)
+
+
+def generate_metrics() -> Optional[Tuple[bytes, str]]:
+    """
+    Render every metric in Prometheus text format
+
+    Returns:
+        A tuple containing (body, content type), or None if prometheus_client
+        is not installed
+    """
+    if Histogram is None:
+        return None
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        # Aggregate the samples written by every worker process
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,388 @@
+"""
+This module builds the /latest-news response. It is shared by the Flask app
+in main.py and the ASGI app in asgi.py so both serve identical payloads.
+"""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from circuit_breaker import CircuitOpenError, is_available
+from metrics import record_fallback
+from pipeline import replay_digest_events
+from response_cache import (get_cached_all_digest, get_cached_digest, get_pending_all_digest, get_pending_digest,
+                            iter_cached_digest_events, peek_cached_all_digest, peek_cached_digest)
+from scheduler import get_snapshot
+from utils import COLLEGE_URLS, get_college_url
+from utils_archive import get_fallback_message
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Switch to serve the fallback message for every college without scraping at all.
+# Outages and blocking are otherwise handled by the news site's circuit breaker.
+SCRAPING_ENABLED = os.environ.get("SCRAPING_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+def _fallback_reason(college_url: str) -> Optional[str]:
+    """
+    Check whether the news site should be skipped for now
+    
+    Args:
+        college_url: The news section URL of a college
+    
+    Returns:
+        "scraping_disabled" or "circuit_open" if the fallback message should be
+        served instead, otherwise None
+    """
+    if not SCRAPING_ENABLED:
+        return "scraping_disabled"
+    if not is_available(college_url):
+        return "circuit_open"
+    return None
+
+
+def _use_fallback(college_name: str, reason: str) -> str:
+    """Log and count a fallback, and return the college's fallback message"""
+    logger.warning(f"Using fallback message for {college_name} ({reason})")
+    record_fallback(reason)
+    return get_fallback_message(college_name)
+
+
+def _outage_payload(college_name: str, reason: str) -> Dict[str, Any]:
+    """
+    Build the payload served while the news site is skipped
+    
+    Args:
+        college_name: The name of the college
+        reason: Why the site is skipped ("scraping_disabled" or "circuit_open")
+    
+    Returns:
+        The last cached digest for the college, however old, or its fallback
+        message if nothing is cached
+    """
+    entry = peek_cached_digest(college_name)
+    if entry is None:
+        return {"college": college_name, "result": _use_fallback(college_name, reason)}
+    
+    logger.warning(f"Serving cached digest for {college_name} ({reason})")
+    record_fallback(f"{reason}_cached")
+    return {
+        "college": college_name,
+        "result": entry["value"]["result"],
+        "age_seconds": round(time.time() - entry["updated_at"], 1)
+    }
+
+
+def get_latest_news_payload(college_name: Optional[str]) -> Tuple[Dict[str, Any], int]:
+    """
+    Retrieve and summarize the latest news articles for a specific college
+    
+    Args:
+        college_name: The name of the college from the query parameters
+    
+    Returns:
+        A tuple containing (JSON payload, HTTP status code)
+    """
+    if not college_name:
+        return {
+            "error": "Missing required parameter: college",
+            "message": "Please provide a Clemson University college name"
+        }, 400
+    
+    try:
+        # Serve the digest precomputed by the background scheduler when there is one
+        snapshot = get_snapshot(college_name)
+        if snapshot:
+            return {
+                "college": college_name,
+                "result": snapshot["result"],
+                "age_seconds": round(time.time() - snapshot["updated_at"], 1)
+            }, 200
+        
+        # Fail fast to a cached digest or the fallback message while the news site is failing or blocking us
+        reason = _fallback_reason(get_college_url(college_name))
+        if reason:
+            return _outage_payload(college_name, reason), 200
+        
+        # Scrape, summarize and format the latest articles for the college,
+        # sharing one computation between concurrent requests
+        digest = get_cached_digest(college_name)
+        
+        # Return the result
+        return {
+            "college": college_name,
+            "result": digest["result"]
+        }, 200
+    
+    except Exception as e:
+        return _latest_news_error_payload(college_name, e)
+
+
+def get_pending_latest_news(college_name: Optional[str]) -> Optional[Future]:
+    """
+    Get the digest build a /latest-news request for a college would wait on
+    
+    Lets an async caller await the build on its event loop instead of
+    blocking a thread in get_latest_news_payload or iter_latest_news_events.
+    
+    Args:
+        college_name: The name of the college from the query parameters
+    
+    Returns:
+        The in-flight build's future, or None if the request would not wait on one
+    """
+    if not college_name or get_snapshot(college_name):
+        return None
+    return get_pending_digest(college_name)
+
+
+def get_latest_news_payload_from(college_name: str, future: Future) -> Tuple[Dict[str, Any], int]:
+    """
+    Build the /latest-news payload from a finished digest build
+    
+    Args:
+        college_name: The name of the college
+        future: A future from get_pending_latest_news that is done
+    
+    Returns:
+        A tuple containing (JSON payload, HTTP status code)
+    """
+    try:
+        digest = future.result()
+    except Exception as e:
+        return _latest_news_error_payload(college_name, e)
+    return {
+        "college": college_name,
+        "result": digest["result"]
+    }, 200
+
+
+def _latest_news_error_payload(college_name: str, error: Exception) -> Tuple[Dict[str, Any], int]:
+    """Turn an error raised while getting a college's digest into a /latest-news response"""
+    if isinstance(error, CircuitOpenError):
+        # The breaker opened while this digest was being scraped
+        return _outage_payload(college_name, "circuit_open"), 200
+    
+    if isinstance(error, ValueError):
+        # Handle invalid college names
+        return {
+            "error": "Invalid college name",
+            "message": str(error)
+        }, 400
+    
+    # Log and handle any other errors
+    logger.error(f"Error retrieving news: {str(error)}")
+    return {
+        "error": "Failed to retrieve news",
+        "message": f"An error occurred: {str(error)}"
+    }, 500
+
+
+def get_all_news_payload() -> Tuple[Dict[str, Any], int]:
+    """
+    Retrieve and summarize the latest news articles for every college in one digest
+    
+    Returns:
+        A tuple containing (JSON payload, HTTP status code)
+    """
+    colleges = list(COLLEGE_URLS)
+    try:
+        # Every college is on the same news site, so one breaker decides for all of them
+        reason = _fallback_reason(COLLEGE_URLS[colleges[0]])
+        if reason:
+            return _all_outage_payload(colleges, reason), 200
+        
+        # Scrape every college at once under one concurrency budget,
+        # sharing one computation between concurrent requests
+        digest = get_cached_all_digest()
+        
+        return _all_news_result(colleges, digest), 200
+    
+    except Exception as e:
+        return _all_news_error_payload(colleges, e)
+
+
+def get_pending_all_news() -> Optional[Future]:
+    """
+    Get the all-colleges digest build a /latest-news/all request would wait on
+    
+    Lets an async caller await the build on its event loop instead of
+    blocking a thread in get_all_news_payload.
+    
+    Returns:
+        The in-flight build's future, or None if the request would not wait on one
+    """
+    return get_pending_all_digest()
+
+
+def get_all_news_payload_from(future: Future) -> Tuple[Dict[str, Any], int]:
+    """
+    Build the /latest-news/all payload from a finished digest build
+    
+    Args:
+        future: A future from get_pending_all_news that is done
+    
+    Returns:
+        A tuple containing (JSON payload, HTTP status code)
+    """
+    colleges = list(COLLEGE_URLS)
+    try:
+        digest = future.result()
+    except Exception as e:
+        return _all_news_error_payload(colleges, e)
+    return _all_news_result(colleges, digest), 200
+
+
+def _all_news_result(colleges: List[str], digest: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the /latest-news/all payload from an all-colleges digest"""
+    return {
+        "colleges": colleges,
+        "result": digest["result"],
+        "article_counts": digest["college_article_counts"]
+    }
+
+
+def _all_news_error_payload(colleges: List[str], error: Exception) -> Tuple[Dict[str, Any], int]:
+    """Turn an error raised while getting the all-colleges digest into a /latest-news/all response"""
+    if isinstance(error, CircuitOpenError):
+        return _all_outage_payload(colleges, "circuit_open"), 200
+    
+    logger.error(f"Error retrieving news for all colleges: {str(error)}")
+    return {
+        "error": "Failed to retrieve news",
+        "message": f"An error occurred: {str(error)}"
+    }, 500
+
+
+def _all_outage_payload(colleges: List[str], reason: str) -> Dict[str, Any]:
+    """Build the all-colleges payload from the last cached digest, or every college's fallback message"""
+    entry = peek_cached_all_digest()
+    if entry is not None:
+        logger.warning(f"Serving cached digest for all colleges ({reason})")
+        record_fallback(f"{reason}_cached")
+        return {
+            "colleges": colleges,
+            "result": entry["value"]["result"],
+            "article_counts": entry["value"]["college_article_counts"],
+            "age_seconds": round(time.time() - entry["updated_at"], 1)
+        }
+    
+    logger.warning(f"Using fallback messages for all colleges ({reason})")
+    record_fallback(reason)
+    return {
+        "colleges": colleges,
+        "result": "\n\n---\n\n".join(get_fallback_message(college_name).strip() for college_name in colleges)
+    }
+
+
+def format_sse_event(event: str, data: Dict[str, Any]) -> str:
+    """
+    Format a server-sent event
+    
+    Args:
+        event: The event name
+        data: The JSON-serializable event data
+    
+    Returns:
+        The event in text/event-stream format
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _outage_events(college_name: str, reason: str) -> Iterator[str]:
+    """Send the payload served while the news site is skipped as "result" and "done" events"""
+    payload = _outage_payload(college_name, reason)
+    yield format_sse_event("result", {"college": college_name, "markdown": payload["result"]})
+    yield format_sse_event("done", {"age_seconds": payload["age_seconds"]} if "age_seconds" in payload else {})
+
+
+def iter_latest_news_events(college_name: Optional[str]) -> Iterator[str]:
+    """
+    Stream the latest news for a college as server-sent events
+    
+    A precomputed digest, or the cached digest or fallback message served
+    while the news site is skipped, is sent as a single "result" event.
+    Otherwise the header is sent right away and each article section follows
+    as soon as it is ready, or at once if the digest is already cached. A
+    final "done" event closes the stream.
+    
+    Args:
+        college_name: The name of the college from the query parameters
+    
+    Yields:
+        Server-sent events
+    """
+    if not college_name:
+        yield format_sse_event("error", {
+            "error": "Missing required parameter: college",
+            "message": "Please provide a Clemson University college name"
+        })
+        return
+    
+    try:
+        # Serve the digest precomputed by the background scheduler when there is one
+        snapshot = get_snapshot(college_name)
+        if snapshot:
+            yield format_sse_event("result", {"college": college_name, "markdown": snapshot["result"]})
+            yield format_sse_event("done", {"age_seconds": round(time.time() - snapshot["updated_at"], 1)})
+            return
+        
+        # Fail fast to a cached digest or the fallback message while the news site is failing or blocking us
+        reason = _fallback_reason(get_college_url(college_name))
+        if reason:
+            yield from _outage_events(college_name, reason)
+            return
+        
+        for event, data in iter_cached_digest_events(college_name):
+            yield format_sse_event(event, data)
+    
+    except Exception as e:
+        yield from _latest_news_error_events(college_name, e)
+
+
+def iter_latest_news_events_from(college_name: str, future: Future) -> Iterator[str]:
+    """
+    Stream the latest news for a college from a finished digest build
+    
+    Args:
+        college_name: The name of the college
+        future: A future from get_pending_latest_news that is done
+    
+    Yields:
+        Server-sent events
+    """
+    try:
+        digest = future.result()
+    except Exception as e:
+        yield from _latest_news_error_events(college_name, e)
+        return
+    for event, data in replay_digest_events(college_name, digest):
+        yield format_sse_event(event, data)
+
+
+def _latest_news_error_events(college_name: str, error: Exception) -> Iterator[str]:
+    """Turn an error raised while streaming a college's digest into server-sent events"""
+    if isinstance(error, CircuitOpenError):
+        # The breaker opened while the articles were being scraped
+        yield from _outage_events(college_name, "circuit_open")
+        return
+    
+    if isinstance(error, ValueError):
+        # Handle invalid college names
+        yield format_sse_event("error", {
+            "error": "Invalid college name",
+            "message": str(error)
+        })
+        return
+    
+    # Log and handle any other errors
+    logger.error(f"Error streaming news: {str(error)}")
+    yield format_sse_event("error", {
+        "error": "Failed to retrieve news",
+        "message": f"An error occurred: {str(error)}"
+    })
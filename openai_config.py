@@ -1,10 +1,40 @@
 import os
-from openai import OpenAI
+import threading
+from typing import Any, Optional
+
+from metrics import record_openai_response
+
+# One client per process - the client's connection pool must not be shared across a fork
+_client: Optional[Any] = None
+_client_pid: Optional[int] = None
+_client_lock = threading.Lock()
+
+
 # Create a completely clean configuration with no proxy settings
 def get_openai_client():
+    # The OpenAI SDK takes a long time to import, so it is only imported when a client is needed
+    import httpx
+    from openai import OpenAI
+
     return OpenAI(
         api_key=os.environ.get("OPENAI_API_KEY"),
-        http_client=None  # Force creating a new client with no proxies
+        # A new client with no proxies, counting every upstream status code (retries included)
+        http_client=httpx.Client(event_hooks={"response": [record_openai_response]})
     )
-# Create a global client instance
-client = get_openai_client()
\ No newline at end of file
+
+
+def get_client():
+    """
+    Get the OpenAI client for the current process, creating it on first use
+    
+    Returns:
+        An OpenAI client
+    """
+    global _client, _client_pid
+    
+    pid = os.getpid()
+    with _client_lock:
+        if _client is None or _client_pid != pid:
+            _client = get_openai_client()
+            _client_pid = pid
+        return _client
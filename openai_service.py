@@ -1,7 +1,55 @@
 import json
 import os
-from openai import OpenAI
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+from metrics import record_openai_response, record_openai_response_async, record_token_usage, time_stage
+
+# Connection pool and timeout settings for the async client
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+
+
+def _summarize_messages(text: str) -> List[Dict[str, str]]:
+    """Build the chat messages for a summary request"""
+    return [
+        {"role": "system", "content": "You are a helpful assistant that summarizes text."},
+        {"role": "user", "content": f"Please summarize the following text concisely while maintaining key points:\n\n{text}"}
+    ]
+
+
+def _sentiment_messages(text: str) -> List[Dict[str, str]]:
+    """Build the chat messages for a sentiment request"""
+    return [
+        {
+            "role": "system",
+            "content": "You are a sentiment analysis expert. "
+            + "Analyze the sentiment of the text and provide a rating "
+            + "from 1 to 5 stars and a confidence score between 0 and 1. "
+            + "Respond with JSON in this format: "
+            + "{'rating': number, 'confidence': number}"
+        },
+        {"role": "user", "content": text}
+    ]
+
+
+def _parse_sentiment(content: str) -> Dict[str, Any]:
+    """Parse and clamp a sentiment response"""
+    result = json.loads(content)
+    return {
+        "rating": max(1, min(5, round(result["rating"]))),
+        "confidence": max(0, min(1, result["confidence"]))
+    }
+
+
+def _response_messages(text: str) -> List[Dict[str, str]]:
+    """Build the chat messages for a generated response"""
+    return [
+        {"role": "system", "content": "You are a helpful assistant."},
+        {"role": "user", "content": text}
+    ]
+
 
 class OpenAIService:
     def __init__(self):
@@ -12,11 +60,24 @@ class OpenAIService:
         if not self.api_key:
             print("Warning: OPENAI_API_KEY not found in environment variables")
         
-        self.client = OpenAI(api_key=self.api_key)
+        # The OpenAI SDK takes a long time to import, so it is only imported when a service is created
+        import httpx
+        from openai import OpenAI
+        
+        # Count every upstream status code, including responses the client retries
+        http_client = httpx.Client(event_hooks={"response": [record_openai_response]})
+        self.client = OpenAI(api_key=self.api_key, http_client=http_client)
         # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
         # do not change this unless explicitly requested by the user
         self.model = "gpt-4o"
     
+    def _create_completion(self, stage: str, **kwargs) -> Any:
+        """Create a chat completion, recording its duration and token usage under the given stage"""
+        with time_stage(stage):
+            response = self.client.chat.completions.create(**kwargs)
+        record_token_usage(stage, getattr(response, "usage", None))
+        return response
+    
     def summarize_text(self, text: str) -> str:
         """
         Summarize the provided text using OpenAI's API
@@ -28,12 +89,10 @@ class OpenAIService:
             A string containing the summarized text
         """
         try:
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
+                "api_summarize",
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that summarizes text."},
-                    {"role": "user", "content": f"Please summarize the following text concisely while maintaining key points:\n\n{text}"}
-                ]
+                messages=_summarize_messages(text)
             )
             return response.choices[0].message.content
         except Exception as e:
@@ -50,26 +109,13 @@ class OpenAIService:
             A dictionary with sentiment rating (1-5) and confidence score
         """
         try:
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
+                "api_sentiment",
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a sentiment analysis expert. "
-                        + "Analyze the sentiment of the text and provide a rating "
-                        + "from 1 to 5 stars and a confidence score between 0 and 1. "
-                        + "Respond with JSON in this format: "
-                        + "{'rating': number, 'confidence': number}"
-                    },
-                    {"role": "user", "content": text}
-                ],
+                messages=_sentiment_messages(text),
                 response_format={"type": "json_object"}
             )
-            result = json.loads(response.choices[0].message.content)
-            return {
-                "rating": max(1, min(5, round(result["rating"]))),
-                "confidence": max(0, min(1, result["confidence"]))
-            }
+            return _parse_sentiment(response.choices[0].message.content)
         except Exception as e:
             raise Exception(f"Failed to analyze sentiment: {str(e)}")
     
@@ -85,12 +131,107 @@ class OpenAIService:
             A string containing the generated response
         """
         try:
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
+                "api_generate",
+                model=self.model,
+                messages=_response_messages(text),
+                max_tokens=max_tokens
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            raise Exception(f"Failed to generate response: {str(e)}")
+
+
+class AsyncOpenAIService:
+    def __init__(self):
+        """
+        Initialize the async OpenAI service with a pooled HTTP client
+        """
+        self.api_key = os.getenv("OPENAI_API_KEY")
+        if not self.api_key:
+            print("Warning: OPENAI_API_KEY not found in environment variables")
+        
+        # The OpenAI SDK takes a long time to import, so it is only imported when a service is created
+        import httpx
+        from openai import AsyncOpenAI
+        
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+            event_hooks={"response": [record_openai_response_async]}
+        )
+        self.client = AsyncOpenAI(api_key=self.api_key, http_client=http_client)
+        # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
+        # do not change this unless explicitly requested by the user
+        self.model = "gpt-4o"
+    
+    async def _create_completion(self, stage: str, **kwargs) -> Any:
+        """Create a chat completion, recording its duration and token usage under the given stage"""
+        with time_stage(stage):
+            response = await self.client.chat.completions.create(**kwargs)
+        record_token_usage(stage, getattr(response, "usage", None))
+        return response
+    
+    async def summarize_text(self, text: str) -> str:
+        """
+        Summarize the provided text using OpenAI's API
+        
+        Args:
+            text: The text to summarize
+            
+        Returns:
+            A string containing the summarized text
+        """
+        try:
+            response = await self._create_completion(
+                "api_summarize",
+                model=self.model,
+                messages=_summarize_messages(text)
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            raise Exception(f"Failed to summarize text: {str(e)}")
+    
+    async def analyze_sentiment(self, text: str) -> Dict[str, Any]:
+        """
+        Analyze the sentiment of the provided text
+        
+        Args:
+            text: The text to analyze
+            
+        Returns:
+            A dictionary with sentiment rating (1-5) and confidence score
+        """
+        try:
+            response = await self._create_completion(
+                "api_sentiment",
+                model=self.model,
+                messages=_sentiment_messages(text),
+                response_format={"type": "json_object"}
+            )
+            return _parse_sentiment(response.choices[0].message.content)
+        except Exception as e:
+            raise Exception(f"Failed to analyze sentiment: {str(e)}")
+    
+    async def generate_response(self, text: str, max_tokens: int = 150) -> str:
+        """
+        Generate a response to the given text
+        
+        Args:
+            text: The input text
+            max_tokens: Maximum number of tokens in the response
+            
+        Returns:
+            A string containing the generated response
+        """
+        try:
+            response = await self._create_completion(
+                "api_generate",
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant."},
-                    {"role": "user", "content": text}
-                ],
+                messages=_response_messages(text),
                 max_tokens=max_tokens
             )
             return response.choices[0].message.content
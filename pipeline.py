@@ -0,0 +1,414 @@
+"""
+This module turns scraped articles into the processed articles rendered by
+utils.format_output: each article is summarized, given a rewritten headline
+and rated for sentiment, with a raw-content fallback when the LLM fails.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from circuit_breaker import CircuitOpenError, get_breaker, is_available
+from metrics import record_cache_lookup, record_fallback, time_stage
+from scraper import scrape_latest_articles
+from summarizer import analyze_article, analyze_sentiment, summarize_article
+from urls import canonicalize_url
+from utils import COLLEGE_URLS, format_all_output, format_article, format_header, format_output, get_college_url
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# "combined" makes one structured LLM call per article,
+# "separate" keeps the original summary call followed by a sentiment call
+ANALYSIS_MODE = os.environ.get("ANALYSIS_MODE", "combined").lower()
+
+# Maximum number of articles processed at the same time per digest
+LLM_CONCURRENCY = int(os.environ.get("LLM_CONCURRENCY", "5"))
+
+# Maximum number of articles processed at the same time for the all-colleges digest
+ALL_COLLEGES_LLM_CONCURRENCY = int(os.environ.get("ALL_COLLEGES_LLM_CONCURRENCY", "10"))
+
+# Maximum number of college sections scraped at the same time for the all-colleges digest;
+# their article downloads also share the scraper's per-host limit
+ALL_COLLEGES_SCRAPE_CONCURRENCY = int(os.environ.get("ALL_COLLEGES_SCRAPE_CONCURRENCY", "9"))
+
+# Maximum number of articles in a college digest
+MAX_ARTICLES = 10
+
+# Processed articles shared by every college digest in this process,
+# keyed by canonical URL and content hash, most recently used last
+SHARED_ARTICLES_MAX = int(os.environ.get("SHARED_ARTICLES_MAX", "500"))
+_shared_articles: "OrderedDict[Tuple[str, str], Future]" = OrderedDict()
+_shared_articles_lock = threading.Lock()
+
+
+def _raw_content_article(headline: str, content: str, url: str) -> Dict[str, Any]:
+    """Build a processed article from a short excerpt when summarization fails"""
+    record_fallback("raw_content")
+    fallback_summary = content[:300] + "..." if len(content) > 300 else content
+    sentiment = {"rating": 3, "confidence": 0, "explanation": "Sentiment analysis unavailable"}
+    
+    return {
+        'headline': headline,
+        'rewritten_headline': headline,  # Use original headline
+        'summary': fallback_summary,
+        'url': url,
+        'sentiment': sentiment,
+        'is_raw_content': True
+    }
+
+
+def process_article(article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Summarize an article and analyze its sentiment
+    
+    Args:
+        article: A scraped article with headline, text and url
+    
+    Returns:
+        A processed article for format_output, or None if the article has no content
+    """
+    # Extract the article headline, content, and URL
+    headline = article.get('headline', 'Untitled Article')
+    content = article.get('text', '')
+    url = article.get('url', '#')
+    
+    if not content:
+        return None
+    
+    logger.info(f"Summarizing article: {headline[:50]}...")
+    try:
+        if ANALYSIS_MODE == "separate":
+            summary, rewritten_headline = summarize_article(headline, content)
+            sentiment = None
+        else:
+            analysis = analyze_article(headline, content)
+            summary = analysis['summary']
+            rewritten_headline = analysis['rewritten_headline']
+            sentiment = analysis['sentiment']
+        
+        # Check if summary contains an error message (from OpenAI API failure)
+        if "Error generating summary" in summary:
+            # Provide a short excerpt of the article as a fallback
+            logger.warning("Using raw content excerpt due to summarization error")
+            return _raw_content_article(headline, content, url)
+        
+        if sentiment is None:
+            sentiment = analyze_sentiment(content)
+        
+        return {
+            'headline': headline,
+            'rewritten_headline': rewritten_headline,
+            'summary': summary,
+            'url': url,
+            'sentiment': sentiment,
+            'is_raw_content': False
+        }
+    except Exception as e:
+        logger.error(f"Error processing article: {str(e)}")
+        # Provide a short excerpt of the article as a fallback
+        return _raw_content_article(headline, content, url)
+
+
+def process_article_shared(article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Process an article once per process, sharing the result with every
+    college digest that includes the same story
+    
+    Args:
+        article: A scraped article with headline, text and url
+    
+    Returns:
+        A processed article for format_output, or None if the article has no content
+    """
+    content = article.get('text') or ''
+    key = (
+        canonicalize_url(article.get('url', '#')),
+        hashlib.sha256(content.encode('utf-8')).hexdigest()
+    )
+    
+    with _shared_articles_lock:
+        future = _shared_articles.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _shared_articles[key] = future
+            while len(_shared_articles) > SHARED_ARTICLES_MAX:
+                _shared_articles.popitem(last=False)
+        else:
+            _shared_articles.move_to_end(key)
+    record_cache_lookup("shared_articles", "miss" if owner else "hit")
+    
+    if not owner:
+        return future.result()
+    
+    try:
+        processed = process_article(article)
+    except Exception as e:
+        # Release the digests waiting on this article, and let the next one retry it
+        with _shared_articles_lock:
+            if _shared_articles.get(key) is future:
+                del _shared_articles[key]
+        future.set_exception(e)
+        raise
+    future.set_result(processed)
+    
+    # Don't keep fallbacks, so the next digest retries the summary
+    if processed and processed['is_raw_content']:
+        with _shared_articles_lock:
+            if _shared_articles.get(key) is future:
+                del _shared_articles[key]
+    return processed
+
+
+def process_articles(articles: List[Dict[str, Any]],
+                     max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Process articles concurrently, keeping their original order
+    
+    Args:
+        articles: The scraped articles
+        max_workers: The maximum number of articles processed at once
+            (defaults to LLM_CONCURRENCY)
+    
+    Returns:
+        The processed articles, skipping those without content
+    """
+    if not articles:
+        return []
+    
+    if max_workers is None:
+        max_workers = LLM_CONCURRENCY
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(articles)))) as executor:
+        results = list(executor.map(process_article_shared, articles))
+    
+    return [processed for processed in results if processed]
+
+
+def _raise_if_circuit_open(college_url: str) -> None:
+    """
+    Stop building a digest once the news site's circuit breaker has opened
+    
+    The scraper treats failed pages as missing articles, so without this
+    check an outage would be summarized, and cached, as a digest with no news.
+    
+    Args:
+        college_url: The news section URL that was just scraped
+    
+    Raises:
+        CircuitOpenError: If the breaker for the site is open
+    """
+    if not is_available(college_url):
+        raise CircuitOpenError(get_breaker(college_url).host)
+
+
+def build_digest(college_name: str) -> Dict[str, Any]:
+    """
+    Scrape, summarize and format the latest news for a college
+    
+    Args:
+        college_name: The name of the college
+    
+    Returns:
+        A dictionary with the markdown result, the number of articles in it and
+        its article sections (for replaying the digest as events)
+    
+    Raises:
+        ValueError: If the college name is not found
+        CircuitOpenError: If the news site's circuit breaker opened during the scrape
+    """
+    # Validate and get the college URL
+    college_url = get_college_url(college_name)
+    
+    # Scrape the latest articles
+    start_time = time.time()
+    logger.info(f"Scraping articles from {college_url} for {college_name}")
+    with time_stage("scrape"):
+        articles = scrape_latest_articles(college_url, max_articles=MAX_ARTICLES)
+    logger.info(f"Found {len(articles)} articles in {time.time() - start_time:.2f} seconds")
+    _raise_if_circuit_open(college_url)
+    
+    if not articles:
+        # If no articles were found, return a meaningful response
+        record_fallback("no_articles")
+        return assemble_digest(college_name, [])
+    
+    # Process each article - summarize and analyze sentiment
+    processed_articles = process_articles(articles)
+    
+    # Format the output as markdown text
+    with time_stage("format_output"):
+        result = format_output(college_name, processed_articles)
+        sections = [
+            {"index": i, "markdown": format_article(i, article)}
+            for i, article in enumerate(processed_articles, 1)
+        ]
+    return {
+        "result": result,
+        "article_count": len(processed_articles),
+        "sections": sections
+    }
+
+
+def assemble_digest(college_name: str, sections: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Assemble a college digest from its article sections
+    
+    Args:
+        college_name: The name of the college
+        sections: The article events' data ({index, markdown}), in any order
+    
+    Returns:
+        A digest like build_digest's
+    """
+    sections = sorted(sections, key=lambda section: section["index"])
+    if not sections:
+        result = f"No recent news articles found for {college_name}."
+    else:
+        result = "\n".join([format_header(college_name)] + [section["markdown"] for section in sections])
+    return {"result": result, "article_count": len(sections), "sections": sections}
+
+
+def replay_digest_events(college_name: str, digest: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yield a finished digest as the events iter_digest_events would have produced
+    
+    Args:
+        college_name: The name of the college
+        digest: A digest from build_digest or assemble_digest
+    
+    Yields:
+        Tuples of (event name, event data) for "header", "article" and "done" events
+    """
+    yield "header", {"college": college_name, "markdown": format_header(college_name)}
+    for section in digest["sections"]:
+        yield "article", section
+    
+    done = {"article_count": digest["article_count"], "cached": True}
+    if not digest["article_count"]:
+        done["markdown"] = digest["result"]
+    yield "done", done
+
+
+def build_all_digest() -> Dict[str, Any]:
+    """
+    Scrape, summarize and format the latest news for every college in one digest
+    
+    Colleges are scraped concurrently and each college's articles are queued
+    for summarization as soon as its scrape finishes, on one pool shared by
+    all colleges. Articles listed in several sections are summarized once.
+    
+    Returns:
+        A dictionary with the markdown result, the number of distinct articles
+        summarized and the number of articles listed for each college
+    
+    Raises:
+        CircuitOpenError: If the news site's circuit breaker opened during the scrapes
+    """
+    colleges = list(COLLEGE_URLS)
+    start_time = time.time()
+    
+    college_keys: Dict[str, List[str]] = {}
+    submitted: Dict[str, Future] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(ALL_COLLEGES_SCRAPE_CONCURRENCY, len(colleges)))) as scrape_executor, \
+            ThreadPoolExecutor(max_workers=max(1, ALL_COLLEGES_LLM_CONCURRENCY)) as llm_executor:
+        with time_stage("scrape_all"):
+            scrapes = {
+                scrape_executor.submit(scrape_latest_articles, get_college_url(college_name), MAX_ARTICLES): college_name
+                for college_name in colleges
+            }
+            for future in as_completed(scrapes):
+                college_name = scrapes[future]
+                try:
+                    articles = future.result()
+                except Exception as e:
+                    logger.error(f"Error scraping articles for {college_name}: {str(e)}")
+                    articles = []
+                
+                if not is_available(get_college_url(college_name)):
+                    # Drop the queued summaries rather than wait on them for a digest that won't be used
+                    for pending in scrapes:
+                        pending.cancel()
+                    llm_executor.shutdown(wait=False, cancel_futures=True)
+                    _raise_if_circuit_open(get_college_url(college_name))
+                
+                # Queue each article once, however many sections list it
+                keys = []
+                for article in articles:
+                    key = canonicalize_url(article.get('url', '#'))
+                    if key in keys:
+                        continue
+                    if key not in submitted:
+                        submitted[key] = llm_executor.submit(process_article_shared, article)
+                    keys.append(key)
+                college_keys[college_name] = keys
+        
+        logger.info(f"Found {len(submitted)} distinct articles for {len(colleges)} colleges "
+                    f"in {time.time() - start_time:.2f} seconds")
+        
+        college_articles = {}
+        for college_name in colleges:
+            processed = (submitted[key].result() for key in college_keys.get(college_name, []))
+            college_articles[college_name] = [article for article in processed if article]
+    
+    with time_stage("format_output"):
+        result = format_all_output(college_articles)
+    return {
+        "result": result,
+        "article_count": sum(1 for future in submitted.values() if future.result()),
+        "college_article_counts": {name: len(articles) for name, articles in college_articles.items()}
+    }
+
+
+def iter_digest_events(college_name: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Build the digest for a college progressively, yielding each part as soon as it is ready
+    
+    The header is yielded before any scraping starts, each article section
+    as soon as it and the articles before it have been summarized, and a
+    final summary event once every article is done. Sections are numbered
+    in the same order as build_digest's, skipping articles without content.
+    
+    Args:
+        college_name: The name of the college
+    
+    Yields:
+        Tuples of (event name, event data) for "header", "article" and "done" events
+    
+    Raises:
+        ValueError: If the college name is not found
+        CircuitOpenError: If the news site's circuit breaker opened during the scrape
+    """
+    start_time = time.time()
+    college_url = get_college_url(college_name)
+    
+    yield "header", {"college": college_name, "markdown": format_header(college_name)}
+    
+    logger.info(f"Scraping articles from {college_url} for {college_name}")
+    with time_stage("scrape"):
+        articles = scrape_latest_articles(college_url, max_articles=MAX_ARTICLES)
+    _raise_if_circuit_open(college_url)
+    
+    article_count = 0
+    if articles:
+        with ThreadPoolExecutor(max_workers=max(1, min(LLM_CONCURRENCY, len(articles)))) as executor:
+            # Articles are submitted in order, so the earliest ones usually finish first
+            futures = [executor.submit(process_article_shared, article) for article in articles]
+            for future in futures:
+                processed = future.result()
+                if not processed:
+                    continue
+                article_count += 1
+                yield "article", {"index": article_count, "markdown": format_article(article_count, processed)}
+    
+    done = {"article_count": article_count, "elapsed_seconds": round(time.time() - start_time, 2)}
+    if not article_count:
+        done["markdown"] = f"No recent news articles found for {college_name}."
+    yield "done", done
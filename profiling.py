@@ -0,0 +1,193 @@
+"""
+This module profiles individual requests on demand. It is off unless
+PROFILING_ENABLED is set, and even then only profiles requests that send
+the X-Profile header or are picked at random at PROFILE_SAMPLE_RATE. When
+profiling is disabled the apps do not register any hooks, so it costs
+nothing to leave deployed.
+
+Two modes are available:
+- "sample" (default): a background thread samples the stacks of every
+  thread every PROFILE_INTERVAL seconds. The scraper and the LLM calls run
+  in worker threads, so this shows where the request's wall time went,
+  including time spent waiting on sockets. Samples are written in the
+  collapsed stack format read by flamegraph.pl and speedscope. Other
+  requests running at the same time show up in the same profile.
+- "cprofile": cProfile of the thread handling the request, written as a
+  pstats file (open it with snakeviz, or flameprof for a flamegraph). Under
+  the ASGI app that thread is the event loop, so prefer "sample" there.
+
+The hottest functions of each profile are also logged.
+"""
+
+import cProfile
+import io
+import itertools
+import logging
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Profiling settings
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_HEADER = "X-Profile"
+PROFILE_MODE = os.environ.get("PROFILE_MODE", "sample").lower()
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL", "0.005"))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(".cache", "profiles"))
+PROFILE_TOP_N = int(os.environ.get("PROFILE_TOP_N", "15"))
+
+# Numbers the profiles written by this process, so file names never collide
+_profile_numbers = itertools.count(1)
+
+
+def should_profile(header_value: Optional[str]) -> bool:
+    """
+    Decide whether to profile a request
+
+    Args:
+        header_value: The value of the request's X-Profile header, if any
+
+    Returns:
+        True if profiling is enabled and the request asked for it or was sampled
+    """
+    if not PROFILING_ENABLED:
+        return False
+    if header_value and header_value.lower() in ("1", "true", "yes"):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def _frame_label(code) -> str:
+    """Label a frame as function (file:line)"""
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    def __init__(self, interval: float):
+        """
+        Initialize a sampler for the stacks of every thread
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def write_collapsed(self, path: str) -> None:
+        """Write the samples as collapsed stacks (one "frame;frame;frame count" per line)"""
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(";".join(frame.replace(";", ":") for frame in stack) + f" {count}\n")
+
+    def format_top(self, limit: int) -> str:
+        """Format the functions with the most samples, by self and total samples"""
+        own = Counter()
+        total = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for frame in set(stack[1:]):
+                total[frame] += count
+
+        stack_samples = sum(self.stacks.values()) or 1
+        lines = [f"{'self%':>7} {'total%':>7}  function"]
+        for frame, count in own.most_common(limit):
+            lines.append(f"{100 * count / stack_samples:6.1f}% {100 * total[frame] / stack_samples:6.1f}%  {frame}")
+        return "\n".join(lines)
+
+
+class RequestProfile:
+    def __init__(self, name: str, mode: str = None):
+        """
+        Initialize a profile of one request
+
+        Args:
+            name: A name for the request, used in the output file name
+            mode: "sample" or "cprofile" (defaults to PROFILE_MODE)
+        """
+        self.name = re.sub(r"[^\w.-]+", "_", name).strip("_") or "request"
+        self.mode = mode or PROFILE_MODE
+        self.started = 0.0
+        if self.mode == "cprofile":
+            self.profiler = cProfile.Profile()
+        else:
+            self.profiler = StackSampler(PROFILE_INTERVAL)
+
+    def start(self) -> "RequestProfile":
+        self.started = time.perf_counter()
+        if self.mode == "cprofile":
+            self.profiler.enable()
+        else:
+            self.profiler.start()
+        return self
+
+    def stop(self) -> Optional[str]:
+        """
+        Stop profiling, write the profile and log its hottest functions
+
+        Returns:
+            The path of the written profile, or None if it could not be written
+        """
+        elapsed = time.perf_counter() - self.started
+        if self.mode == "cprofile":
+            self.profiler.disable()
+        else:
+            self.profiler.stop()
+
+        path, top = self._write()
+        if path:
+            logger.info(f"Profiled {self.name} ({elapsed:.2f}s), wrote {path}\n{top}")
+        return path
+
+    def _write(self) -> Tuple[Optional[str], str]:
+        file_name = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{next(_profile_numbers)}-{self.name}"
+        base = os.path.join(PROFILE_DIR, file_name)
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            if self.mode == "cprofile":
+                path = base + ".prof"
+                self.profiler.dump_stats(path)
+                output = io.StringIO()
+                pstats.Stats(self.profiler, stream=output).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+                return path, output.getvalue()
+
+            path = base + ".collapsed"
+            self.profiler.write_collapsed(path)
+            return path, self.profiler.format_top(PROFILE_TOP_N)
+        except OSError as e:
+            logger.warning(f"Could not write profile for {self.name}: {str(e)}")
+            return None, ""
@@ -0,0 +1,137 @@
+"""
+This module implements a token-bucket rate limiter for OpenAI calls. It
+throttles both requests per minute and tokens per minute across every
+thread in the worker process, and corrects its token estimates with the
+actual usage reported in each response.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Default limits, matching a typical gpt-4o tier
+OPENAI_RPM_LIMIT = float(os.environ.get("OPENAI_RPM_LIMIT", "500"))
+OPENAI_TPM_LIMIT = float(os.environ.get("OPENAI_TPM_LIMIT", "30000"))
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        """
+        Initialize the rate limiter with full request and token buckets
+        
+        Args:
+            requests_per_minute: The maximum number of requests per minute
+            tokens_per_minute: The maximum number of tokens per minute
+        """
+        self.request_capacity = requests_per_minute
+        self.token_capacity = tokens_per_minute
+        self.available_requests = requests_per_minute
+        self.available_tokens = tokens_per_minute
+        self.updated_at = time.monotonic()
+        self.condition = threading.Condition()
+    
+    def _refill(self) -> None:
+        """Add the capacity that has accumulated since the last update"""
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        self.available_requests = min(
+            self.request_capacity,
+            self.available_requests + elapsed * self.request_capacity / 60
+        )
+        self.available_tokens = min(
+            self.token_capacity,
+            self.available_tokens + elapsed * self.token_capacity / 60
+        )
+    
+    def acquire(self, estimated_tokens: int, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until one request and the estimated tokens are available, then reserve them
+        
+        Args:
+            estimated_tokens: The expected prompt plus completion tokens
+            timeout: The maximum number of seconds to wait, or None to wait forever
+            
+        Returns:
+            True if capacity was reserved, False if the timeout expired
+        """
+        # A single call larger than the whole bucket only has to wait for a full bucket
+        needed_tokens = min(estimated_tokens, self.token_capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        with self.condition:
+            while True:
+                self._refill()
+                if self.available_requests >= 1 and self.available_tokens >= needed_tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= estimated_tokens
+                    return True
+                
+                # Sleep until enough of both buckets has been refilled
+                request_wait = max(0.0, (1 - self.available_requests) * 60 / self.request_capacity)
+                token_wait = max(0.0, (needed_tokens - self.available_tokens) * 60 / self.token_capacity)
+                wait = max(request_wait, token_wait, 0.01)
+                
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                
+                self.condition.wait(wait)
+    
+    def record_usage(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """
+        Correct a reservation with the usage reported by the API
+        
+        Args:
+            estimated_tokens: The tokens reserved by acquire
+            actual_tokens: The total tokens reported in response.usage
+        """
+        with self.condition:
+            self._refill()
+            self.available_tokens = min(
+                self.token_capacity,
+                self.available_tokens + estimated_tokens - actual_tokens
+            )
+            self.condition.notify_all()
+
+
+# One limiter shared by every in-flight request in this worker
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get the rate limiter shared by all OpenAI calls in this process
+    
+    Returns:
+        The process-wide RateLimiter
+    """
+    global _rate_limiter
+    
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT)
+        return _rate_limiter
+
+
+def estimate_tokens(text: str, max_tokens: int) -> int:
+    """
+    Estimate the tokens a chat completion will use
+    
+    Args:
+        text: The full prompt text
+        max_tokens: The completion token limit
+        
+    Returns:
+        A rough token count, assuming about four characters per token
+    """
+    return len(text) // 4 + max_tokens
@@ -0,0 +1,327 @@
+"""
+This module implements a stale-while-revalidate cache for college digests.
+Fresh entries are served directly, stale entries are served while a single
+background refresh runs, and concurrent misses for the same college wait on
+one shared computation instead of each running the full pipeline.
+
+Streamed digests go through the same cache: a cached digest is replayed as
+events, a stream joins a digest that is already being built, and a digest
+built for a stream is stored for the requests that come after it.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from metrics import record_cache_lookup
+from pipeline import assemble_digest, build_all_digest, build_digest, iter_digest_events, replay_digest_events
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# How long a digest is served as-is, then how much longer it may be served while refreshing
+RESPONSE_FRESH_TTL = float(os.environ.get("RESPONSE_FRESH_TTL", "600"))
+RESPONSE_STALE_TTL = float(os.environ.get("RESPONSE_STALE_TTL", "3600"))
+
+
+class ResponseCache:
+    def __init__(self, compute: Callable[[str], Any], fresh_ttl: float, stale_ttl: float,
+                 name: str = "responses"):
+        """
+        Initialize an empty cache
+        
+        Args:
+            compute: The function producing the value for a key
+            fresh_ttl: Seconds an entry is served without refreshing
+            stale_ttl: Seconds after fresh_ttl an entry is still served while refreshing
+            name: The cache name used to label its metrics
+        """
+        self.compute = compute
+        self.name = name
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.in_flight: Dict[str, Future] = {}
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0, "errors": 0}
+    
+    def get(self, key: str) -> Any:
+        """
+        Get the value for a key, computing it at most once at a time
+        
+        Args:
+            key: The cache key
+        
+        Returns:
+            The cached or freshly computed value
+        
+        Raises:
+            Exception: Whatever the compute function raised on a miss
+        """
+        value, future, owner = self.lookup(key)
+        if future is None:
+            return value
+        
+        if owner:
+            self._compute_into(key, future)
+        return future.result()
+    
+    def lookup(self, key: str) -> Tuple[Optional[Any], Optional[Future], bool]:
+        """
+        Look up a key without computing it
+        
+        A stale entry is returned and refreshed in the background. Otherwise
+        the caller gets the key's shared computation: if it is the owner, it
+        must produce the value and publish it with complete() or fail();
+        if not, it waits on the future.
+        
+        Args:
+            key: The cache key
+        
+        Returns:
+            A tuple containing (cached value or None, shared future or None, owner)
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                age = time.time() - entry["updated_at"]
+                if age < self.fresh_ttl:
+                    self.stats["hits"] += 1
+                    record_cache_lookup(self.name, "hit")
+                    return entry["value"], None, False
+                if age < self.fresh_ttl + self.stale_ttl:
+                    self.stats["stale_hits"] += 1
+                    record_cache_lookup(self.name, "stale_hit")
+                    if key not in self.in_flight:
+                        self.in_flight[key] = Future()
+                        threading.Thread(target=self._refresh, args=(key,), daemon=True).start()
+                    return entry["value"], None, False
+            
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                record_cache_lookup(self.name, "coalesced")
+                return None, future, False
+            
+            self.stats["misses"] += 1
+            record_cache_lookup(self.name, "miss")
+            future = Future()
+            self.in_flight[key] = future
+            return None, future, True
+    
+    def _refresh(self, key: str) -> None:
+        """Recompute a stale entry in the background"""
+        with self.lock:
+            self.stats["refreshes"] += 1
+            future = self.in_flight[key]
+        self._compute_into(key, future)
+    
+    def _compute_into(self, key: str, future: Future) -> None:
+        """Compute the value for a key and publish it to the cache and any waiters"""
+        try:
+            value = self.compute(key)
+        except Exception as e:
+            self.fail(key, future, e)
+            return
+        self.complete(key, future, value)
+    
+    def complete(self, key: str, future: Future, value: Any) -> None:
+        """Store a computed value and publish it to any waiters"""
+        with self.lock:
+            self.entries[key] = {"value": value, "updated_at": time.time()}
+            self.in_flight.pop(key, None)
+        future.set_result(value)
+    
+    def fail(self, key: str, future: Future, error: Exception) -> None:
+        """Publish a failed computation to any waiters, leaving the cache as it was"""
+        logger.error(f"Error computing cached response for {key}: {str(error)}")
+        with self.lock:
+            self.stats["errors"] += 1
+            self.in_flight.pop(key, None)
+        future.set_exception(error)
+    
+    def pending(self, key: str) -> Optional[Future]:
+        """
+        Get the computation a get() for a key would wait on, counting it as coalesced
+        
+        Args:
+            key: The cache key
+        
+        Returns:
+            The in-flight future, or None if an entry can be served or nothing is being computed
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.time() - entry["updated_at"] < self.fresh_ttl + self.stale_ttl:
+                return None
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                record_cache_lookup(self.name, "coalesced")
+            return future
+    
+    def peek(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored entry for a key, however old, without computing or refreshing it
+        
+        Args:
+            key: The cache key
+        
+        Returns:
+            A dictionary with the value and when it was computed (updated_at), or None
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            return dict(entry) if entry is not None else None
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters
+        
+        Returns:
+            A dictionary of hits, stale_hits, misses, coalesced, refreshes and errors
+        """
+        with self.lock:
+            return dict(self.stats)
+
+
+# The digest cache shared by every request in this worker
+digest_cache = ResponseCache(build_digest, RESPONSE_FRESH_TTL, RESPONSE_STALE_TTL)
+
+# The all-colleges digest has a single entry, stored under this key
+ALL_COLLEGES_KEY = "all"
+all_digest_cache = ResponseCache(lambda key: build_all_digest(), RESPONSE_FRESH_TTL, RESPONSE_STALE_TTL,
+                                 name="all_responses")
+
+
+def get_cached_digest(college_name: str) -> Dict[str, Any]:
+    """
+    Get the digest for a college through the stale-while-revalidate cache
+    
+    Args:
+        college_name: The name of the college
+    
+    Returns:
+        A dictionary with the markdown result and the number of articles in it
+    
+    Raises:
+        ValueError: If the college name is not found
+    """
+    return digest_cache.get(college_name)
+
+
+def iter_cached_digest_events(college_name: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Stream the digest for a college as events, through the digest cache
+    
+    A cached digest is replayed at once. If another request is already
+    building the digest, the stream waits for it and replays the result.
+    Otherwise the digest is built here, each article is yielded as soon as
+    it is ready, and the finished digest is stored for later requests.
+    
+    Args:
+        college_name: The name of the college
+    
+    Yields:
+        Tuples of (event name, event data) for "header", "article" and "done" events
+    
+    Raises:
+        ValueError: If the college name is not found
+        CircuitOpenError: If the news site's circuit breaker opened during the scrape
+    """
+    digest, future, owner = digest_cache.lookup(college_name)
+    if future is not None and not owner:
+        digest = future.result()
+    if digest is not None:
+        yield from replay_digest_events(college_name, digest)
+        return
+    
+    sections = []
+    try:
+        for event, data in iter_digest_events(college_name):
+            if event == "article":
+                sections.append(data)
+            elif event == "done":
+                # Publish before the last yield, which may not return if the client has gone
+                digest_cache.complete(college_name, future, assemble_digest(college_name, sections))
+            yield event, data
+    except Exception as e:
+        if not future.done():
+            digest_cache.fail(college_name, future, e)
+        raise
+    except GeneratorExit:
+        # The client disconnected mid-stream; release anyone waiting on this build
+        if not future.done():
+            digest_cache.fail(college_name, future, RuntimeError("The streamed digest was abandoned"))
+        raise
+
+
+def get_pending_digest(college_name: str) -> Optional[Future]:
+    """
+    Get the digest build a request for a college would wait on, if there is one
+    
+    Args:
+        college_name: The name of the college
+    
+    Returns:
+        The in-flight build's future, or None
+    """
+    return digest_cache.pending(college_name)
+
+
+def peek_cached_digest(college_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the last digest computed for a college, however old, without computing one
+    
+    Args:
+        college_name: The name of the college
+    
+    Returns:
+        A dictionary with the digest (value) and when it was computed (updated_at), or None
+    """
+    return digest_cache.peek(college_name)
+
+
+def peek_cached_all_digest() -> Optional[Dict[str, Any]]:
+    """
+    Get the last digest computed for every college, however old, without computing one
+    
+    Returns:
+        A dictionary with the digest (value) and when it was computed (updated_at), or None
+    """
+    return all_digest_cache.peek(ALL_COLLEGES_KEY)
+
+
+def get_pending_all_digest() -> Optional[Future]:
+    """
+    Get the all-colleges digest build a request would wait on, if there is one
+    
+    Returns:
+        The in-flight build's future, or None
+    """
+    return all_digest_cache.pending(ALL_COLLEGES_KEY)
+
+
+def get_cached_all_digest() -> Dict[str, Any]:
+    """
+    Get the digest covering every college through the stale-while-revalidate cache
+    
+    Returns:
+        A dictionary with the markdown result, the number of distinct articles
+        and the number of articles listed for each college
+    """
+    return all_digest_cache.get(ALL_COLLEGES_KEY)
+
+
+def get_response_cache_stats() -> Dict[str, int]:
+    """
+    Get the counters of the digest cache
+    
+    Returns:
+        A dictionary of hits, stale_hits, misses, coalesced, refreshes and errors
+    """
+    return digest_cache.get_stats()
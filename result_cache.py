@@ -0,0 +1,171 @@
+"""
+This module implements a persistent SQLite cache for LLM results such as
+article summaries and sentiment ratings. Entries are keyed by a hash of the
+input text, prompt version, model and call parameters, so a result is reused
+only when the exact same request would be sent again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from metrics import record_cache_lookup
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Cache settings
+RESULT_CACHE_ENABLED = os.environ.get("RESULT_CACHE_ENABLED", "true").lower() == "true"
+RESULT_CACHE_PATH = os.environ.get("RESULT_CACHE_PATH", os.path.join(".cache", "results.sqlite3"))
+RESULT_CACHE_TTL = float(os.environ.get("RESULT_CACHE_TTL", str(7 * 24 * 3600)))
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", "5000"))
+
+# SQLite connections are per thread and must not be reused after a fork
+_local = threading.local()
+
+# Hit/miss counters for this process
+_stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+_stats_lock = threading.Lock()
+
+
+def _get_connection() -> sqlite3.Connection:
+    """Return the SQLite connection for the current thread, creating the table if needed"""
+    pid = os.getpid()
+    if getattr(_local, "pid", None) != pid:
+        directory = os.path.dirname(RESULT_CACHE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        connection = sqlite3.connect(RESULT_CACHE_PATH, timeout=5, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at)")
+        _local.connection = connection
+        _local.pid = pid
+    
+    return _local.connection
+
+
+def _count(name: str, amount: int = 1) -> None:
+    """Increment one of the cache statistics"""
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def make_cache_key(kind: str, text: str, prompt_version: str, model: str,
+                   params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build a content-addressed cache key for an LLM call
+    
+    Args:
+        kind: The type of call (e.g. "summary" or "sentiment")
+        text: The input text sent to the model
+        prompt_version: The version of the prompt template
+        model: The model name
+        params: Any other parameters that change the result
+    
+    Returns:
+        A hex digest identifying the call
+    """
+    payload = json.dumps(
+        [kind, prompt_version, model, params or {}, text],
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_result(key: str) -> Optional[Any]:
+    """
+    Get a cached result
+    
+    Args:
+        key: The cache key from make_cache_key
+    
+    Returns:
+        The cached value, or None on a miss or an expired entry
+    """
+    if not RESULT_CACHE_ENABLED:
+        return None
+    
+    try:
+        connection = _get_connection()
+        row = connection.execute(
+            "SELECT value, created_at FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        
+        if row is None:
+            _count("misses")
+            record_cache_lookup("llm_results", "miss")
+            return None
+        
+        value, created_at = row
+        now = time.time()
+        if now - created_at > RESULT_CACHE_TTL:
+            connection.execute("DELETE FROM results WHERE key = ?", (key,))
+            _count("expired")
+            _count("misses")
+            record_cache_lookup("llm_results", "expired")
+            return None
+        
+        connection.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+        _count("hits")
+        record_cache_lookup("llm_results", "hit")
+        return json.loads(value)
+    
+    except (sqlite3.Error, OSError, ValueError) as e:
+        logger.warning(f"Result cache lookup failed: {str(e)}")
+        _count("misses")
+        record_cache_lookup("llm_results", "error")
+        return None
+
+
+def set_result(key: str, value: Any) -> None:
+    """
+    Store a result, evicting the least recently used entries if the cache is full
+    
+    Args:
+        key: The cache key from make_cache_key
+        value: A JSON-serializable value
+    """
+    if not RESULT_CACHE_ENABLED:
+        return
+    
+    try:
+        connection = _get_connection()
+        now = time.time()
+        connection.execute(
+            "INSERT OR REPLACE INTO results (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), now, now)
+        )
+        cursor = connection.execute(
+            "DELETE FROM results WHERE key IN "
+            "(SELECT key FROM results ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (RESULT_CACHE_MAX_ENTRIES,)
+        )
+        if cursor.rowcount > 0:
+            _count("evicted", cursor.rowcount)
+    
+    except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+        logger.warning(f"Result cache store failed: {str(e)}")
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """
+    Get the hit and miss counters for this process
+    
+    Returns:
+        A dictionary of hits, misses, expired and evicted counts
+    """
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,133 @@
+"""
+This module runs a background scheduler that periodically scrapes and
+summarizes every college in utils.COLLEGE_URLS and keeps the latest rendered
+digest for each one in memory, so /latest-news can answer without waiting
+on the news site or OpenAI.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from pipeline import build_digest
+from utils import COLLEGE_URLS
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Scheduler settings - disabled by default while news.clemson.edu blocks scraping
+BACKGROUND_REFRESH_ENABLED = os.environ.get("BACKGROUND_REFRESH_ENABLED", "false").lower() == "true"
+REFRESH_INTERVAL = float(os.environ.get("REFRESH_INTERVAL", "900"))
+REFRESH_JITTER = float(os.environ.get("REFRESH_JITTER", "0.1"))
+
+# Latest digest per college: {"result": str, "article_count": int, "updated_at": float}
+_snapshots: Dict[str, Dict[str, Any]] = {}
+_snapshots_lock = threading.Lock()
+
+# One lock per college so the same college is never refreshed twice at once
+_refresh_locks: Dict[str, threading.Lock] = {name: threading.Lock() for name in COLLEGE_URLS}
+
+_scheduler_thread: Optional[threading.Thread] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_snapshot(college_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the latest precomputed digest for a college
+    
+    Args:
+        college_name: The name of the college
+    
+    Returns:
+        A dictionary with result, article_count and updated_at, or None if
+        no digest has been computed yet
+    """
+    with _snapshots_lock:
+        return _snapshots.get(college_name)
+
+
+def refresh_college(college_name: str) -> bool:
+    """
+    Recompute the digest for a college and store it as the latest snapshot
+    
+    Args:
+        college_name: The name of the college
+    
+    Returns:
+        True if the snapshot was updated, False if a refresh was already
+        running or produced nothing new
+    """
+    lock = _refresh_locks.get(college_name)
+    if lock is None or not lock.acquire(blocking=False):
+        return False
+    
+    try:
+        start_time = time.time()
+        digest = build_digest(college_name)
+        
+        with _snapshots_lock:
+            # Keep the previous digest rather than replacing it with an empty one
+            if digest["article_count"] == 0 and college_name in _snapshots:
+                logger.warning(f"Refresh for {college_name} found no articles, keeping previous digest")
+                return False
+            
+            _snapshots[college_name] = {
+                "result": digest["result"],
+                "article_count": digest["article_count"],
+                "updated_at": time.time()
+            }
+        
+        logger.info(f"Refreshed digest for {college_name} in {time.time() - start_time:.2f} seconds")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Error refreshing digest for {college_name}: {str(e)}")
+        return False
+    
+    finally:
+        lock.release()
+
+
+def _next_delay() -> float:
+    """Return the refresh interval with random jitter applied"""
+    return REFRESH_INTERVAL * random.uniform(1 - REFRESH_JITTER, 1 + REFRESH_JITTER)
+
+
+def _run_scheduler() -> None:
+    """Refresh each college whenever it comes due, forever"""
+    # Every college is due immediately; refreshes run one after another
+    now = time.time()
+    due_at = {name: now for name in COLLEGE_URLS}
+    
+    while True:
+        college_name = min(due_at, key=due_at.get)
+        wait = due_at[college_name] - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        
+        refresh_college(college_name)
+        due_at[college_name] = time.time() + _next_delay()
+
+
+def start_scheduler() -> bool:
+    """
+    Start the background refresh thread if it is enabled and not already running
+    
+    Returns:
+        True if the scheduler is running
+    """
+    global _scheduler_thread
+    
+    if not BACKGROUND_REFRESH_ENABLED:
+        return False
+    
+    with _scheduler_lock:
+        if _scheduler_thread is None or not _scheduler_thread.is_alive():
+            _scheduler_thread = threading.Thread(target=_run_scheduler, name="digest-refresh", daemon=True)
+            _scheduler_thread.start()
+            logger.info(f"Started background refresh for {len(COLLEGE_URLS)} colleges every {REFRESH_INTERVAL:.0f}s")
+    return True
@@ -1,11 +1,20 @@
 import logging
+import os
 import random
 import re
-from typing import Dict, List, Optional, Any
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Any
+from urllib.parse import urlparse
 
-import requests
-import trafilatura
-from bs4 import BeautifulSoup
+import article_index
+import http_cache
+import http_client
+from feeds import MIN_CONTENT_LENGTH, extract_item_text, get_feed_url, parse_feed
+from html_parser import parse_headline_elements, parse_section_page
+from metrics import record_cache_lookup, record_fallback, time_stage
+from urls import canonicalize_url, resolve_url
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,11 +30,93 @@ USER_AGENTS = [
 ]
 
 
+# Concurrency limits for fetching article pages
+MAX_FETCH_WORKERS = int(os.environ.get("SCRAPER_MAX_WORKERS", "8"))
+PER_HOST_CONCURRENCY = int(os.environ.get("SCRAPER_PER_HOST_CONCURRENCY", "4"))
+# Overall deadline (in seconds) for the article fetch stage
+FETCH_DEADLINE = float(os.environ.get("SCRAPER_FETCH_DEADLINE", "30"))
+
+# "feed" tries the section's RSS feed before scraping HTML, "html" always scrapes HTML
+INGESTION_MODE = os.environ.get("INGESTION_MODE", "feed").lower()
+
+# One semaphore per host, shared by every scrape running in this process
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+# Counters for each scraping stage, used to check that each URL is downloaded once
+_stage_counters: Counter = Counter()
+_fetch_counts: Counter = Counter()
+_stage_counters_lock = threading.Lock()
+
+# Article downloads in progress, keyed by canonical URL
+_in_flight_articles: Dict[str, Future] = {}
+_in_flight_lock = threading.Lock()
+
+
 def get_random_user_agent():
     """Return a random user agent from the list"""
     return random.choice(USER_AGENTS)
 
 
+def _get_host_semaphore(url: str) -> threading.BoundedSemaphore:
+    """Return the semaphore limiting concurrent requests to the host of a URL"""
+    host = urlparse(url).netloc.lower()
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(PER_HOST_CONCURRENCY)
+            _host_semaphores[host] = semaphore
+        return semaphore
+
+
+def fetch_concurrently(urls: List[str], fetch: Callable[[str], Any],
+                       deadline: Optional[float] = None, default: Any = None) -> List[Any]:
+    """
+    Run a fetch function for each URL on a bounded thread pool
+    
+    Args:
+        urls: The URLs to fetch
+        fetch: A function taking a URL and returning its result
+        deadline: Seconds to wait for the whole batch (defaults to FETCH_DEADLINE)
+        default: The value used for URLs that failed or missed the deadline
+        
+    Returns:
+        A list of results in the same order as the input URLs
+    """
+    if not urls:
+        return []
+    
+    if deadline is None:
+        deadline = FETCH_DEADLINE
+    
+    def limited_fetch(url: str) -> Any:
+        with _get_host_semaphore(url):
+            return fetch(url)
+    
+    executor = ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(urls)))
+    try:
+        futures = [executor.submit(limited_fetch, url) for url in urls]
+        done, not_done = wait(futures, timeout=deadline)
+        if not_done:
+            logger.warning(f"Fetch deadline of {deadline:.0f}s reached with {len(not_done)} of {len(urls)} pages pending")
+        
+        results = []
+        for url, future in zip(urls, futures):
+            if future not in done:
+                future.cancel()
+                results.append(default)
+                continue
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.error(f"Error fetching {url}: {str(e)}")
+                results.append(default)
+        return results
+    finally:
+        # Don't block on pages that are still downloading past the deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def scrape_latest_articles(base_url: str, max_articles: int = 10) -> List[Dict[str, Any]]:
     """
     Scrape the latest articles from the provided URL
@@ -45,43 +136,51 @@ def scrape_latest_articles(base_url: str, max_articles: int = 10) -> List[Dict[s
         "Upgrade-Insecure-Requests": "1"
     }
     
+    # Read the section feed first and only scrape HTML if it is missing or empty
+    if INGESTION_MODE == "feed":
+        articles = scrape_feed_articles(base_url, max_articles, headers)
+        if articles:
+            return articles
+        record_fallback("feed_unavailable")
+    
     try:
         logger.info(f"Scraping articles from {base_url}")
-        response = requests.get(base_url, headers=headers, timeout=15)
-        
-        if response.status_code != 200:
-            logger.error(f"Failed to access {base_url}, status code: {response.status_code}")
+        with time_stage("section_fetch"):
+            html = fetch_page(base_url, headers=headers, timeout=15)
+        if html is None:
             return []
             
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # Parse only the article containers and links we need from the section page
+        _count_stage("parse")
+        with time_stage("parse"):
+            section = parse_section_page(html)
         
         # Find news article links - this pattern needs to be adapted to the specific site structure
         articles = []
         article_links = []
+        seen_links = set()
         
         # Look for common article container patterns
-        article_containers = soup.select('.news-item, .article, .post, .news-article, article, .story')
+        article_containers = section['containers']
         
         if not article_containers:
             # Try finding links with news-related text
-            all_links = soup.find_all('a', href=True)
+            all_links = section['links']
             potential_links = [
                 link for link in all_links 
-                if any(term in link.get_text().lower() for term in ['news', 'story', 'article', 'press'])
+                if any(term in link['text'].lower() for term in ['news', 'story', 'article', 'press'])
                 or re.search(r'/(news|stories|articles|press-releases|updates)/[^/]+', link['href'])
             ]
             
             # Filter to only keep links to articles
             for link in potential_links:
-                href = link.get('href', '')
-                if not href.startswith('http'):
-                    # Make relative URLs absolute
-                    if href.startswith('/'):
-                        href = base_url.rstrip('/') + href
-                    else:
-                        href = base_url.rstrip('/') + '/' + href
+                resolved = _resolve_link(link['href'], base_url)
+                if resolved is None:
+                    continue
+                href, canonical = resolved
                 
-                if href not in article_links and not href.endswith(('.pdf', '.docx', '.xlsx')):
+                if canonical not in seen_links and not urlparse(href).path.endswith(('.pdf', '.docx', '.xlsx')):
+                    seen_links.add(canonical)
                     article_links.append(href)
                     
                 # Stop when we reach the max number of articles
@@ -90,70 +189,46 @@ def scrape_latest_articles(base_url: str, max_articles: int = 10) -> List[Dict[s
         else:
             # Extract links from article containers
             for container in article_containers[:max_articles]:
-                link_tag = container.find('a', href=True)
-                if link_tag:
-                    href = link_tag.get('href', '')
-                    if not href.startswith('http'):
-                        # Make relative URLs absolute
-                        if href.startswith('/'):
-                            href = base_url.rstrip('/') + href
-                        else:
-                            href = base_url.rstrip('/') + '/' + href
-                    
-                    if href not in article_links:
-                        article_links.append(href)
-                        
-                    # Get headline from link or container
-                    headline = link_tag.get_text().strip()
-                    if not headline:
-                        headline_tag = container.find(['h1', 'h2', 'h3', 'h4'])
-                        if headline_tag:
-                            headline = headline_tag.get_text().strip()
+                if container['href'] is None:
+                    continue
+                resolved = _resolve_link(container['href'], base_url)
+                if resolved is None:
+                    continue
+                href, canonical = resolved
+                
+                if canonical not in seen_links:
+                    seen_links.add(canonical)
+                    article_links.append(href)
                     
-                    if headline:
-                        article = {
-                            'headline': headline,
-                            'url': href
-                        }
-                        articles.append(article)
-        
-        # If we extracted links but not full article data, process each link
+                # Get headline from link or container
+                headline = container['link_text'].strip()
+                if not headline:
+                    headline = container['heading_text'].strip()
+                
+                if headline:
+                    article = {
+                        'headline': headline,
+                        'url': href
+                    }
+                    articles.append(article)
+        
+        # If we extracted links but not full article data, process the links concurrently
         if article_links and not articles:
-            for url in article_links[:max_articles]:
-                try:
-                    # Try to get the article content
-                    article_text = scrape_article_text(url)
-                    if article_text:
-                        # Extract a headline from the title tag or first heading
-                        response = requests.get(url, headers=headers, timeout=10)
-                        article_soup = BeautifulSoup(response.text, 'html.parser')
-                        
-                        headline = article_soup.title.string if article_soup.title else None
-                        if not headline:
-                            heading = article_soup.find(['h1', 'h2'])
-                            headline = heading.get_text().strip() if heading else "Article"
-                        
-                        # Remove site name from headline if present
-                        headline = re.sub(r'\s*\|\s*.*$', '', headline)
-                        headline = re.sub(r'\s*-\s*.*$', '', headline)
-                        
-                        articles.append({
-                            'headline': headline,
-                            'text': article_text,
-                            'url': url
-                        })
-                except Exception as e:
-                    logger.error(f"Error scraping article {url}: {str(e)}")
-                    continue
+            linked_articles = fetch_concurrently(
+                article_links[:max_articles],
+                lambda url: _scrape_linked_article(url, headers)
+            )
+            articles = [article for article in linked_articles if article]
         
         # For articles that were found but without text, get the full text
-        for article in articles:
-            if 'text' not in article:
-                try:
-                    article['text'] = scrape_article_text(article['url'])
-                except Exception as e:
-                    logger.error(f"Error getting text for article {article['url']}: {str(e)}")
-                    article['text'] = "Content unavailable"
+        pending = [article for article in articles if 'text' not in article]
+        texts = fetch_concurrently(
+            [article['url'] for article in pending],
+            scrape_article_text,
+            default="Content unavailable"
+        )
+        for article, text in zip(pending, texts):
+            article['text'] = text
         
         logger.info(f"Successfully scraped {len(articles)} articles")
         return articles
@@ -163,6 +238,408 @@ def scrape_latest_articles(base_url: str, max_articles: int = 10) -> List[Dict[s
         return []
 
 
+def scrape_feed_articles(base_url: str, max_articles: int,
+                         headers: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    """
+    Get the latest articles from the RSS feed of a section page
+    
+    The feed is revalidated through the HTTP cache, and items whose content
+    has not changed since it was indexed reuse the indexed text. Items with
+    full content are used as-is; only items that carry just an excerpt have
+    their article page fetched.
+    
+    Args:
+        base_url: The URL of the college news section page
+        max_articles: Maximum number of articles to return
+        headers: The request headers to use
+        
+    Returns:
+        A list of dictionaries containing article information (headline, text, url),
+        or an empty list if the section has no usable feed
+    """
+    feed_url = get_feed_url(base_url)
+    feed_headers = dict(headers or {"User-Agent": get_random_user_agent()})
+    feed_headers["Accept"] = "application/rss+xml,application/xml;q=0.9,*/*;q=0.8"
+    
+    try:
+        items = fetch_feed(feed_url, max_articles, feed_headers)
+    except Exception as e:
+        logger.warning(f"Error reading feed {feed_url}: {str(e)}")
+        return []
+    
+    if not items:
+        return []
+    
+    articles = []
+    seen_links = set()
+    for item in items:
+        if not item['url'] or not item['headline']:
+            continue
+        resolved = _resolve_link(item['url'], base_url)
+        if resolved is None:
+            continue
+        href, canonical = resolved
+        if canonical in seen_links:
+            continue
+        seen_links.add(canonical)
+        
+        article = {'headline': item['headline'], 'url': href}
+        text = _load_feed_item_text(canonical, item)
+        if text:
+            article['text'] = text
+        articles.append(article)
+    
+    # The feed only had excerpts for these, so fetch their pages
+    pending = [article for article in articles if 'text' not in article]
+    if pending:
+        logger.info(f"Feed {feed_url} is missing content for {len(pending)} articles, fetching pages")
+    texts = fetch_concurrently(
+        [article['url'] for article in pending],
+        scrape_article_text,
+        default="Content unavailable"
+    )
+    for article, text in zip(pending, texts):
+        article['text'] = text
+    
+    logger.info(f"Read {len(articles)} articles from feed {feed_url}")
+    return articles
+
+
+def fetch_feed(feed_url: str, max_items: int, headers: Dict[str, str]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Download and parse a feed, revalidating a cached copy when there is one
+    
+    A new feed is parsed while it downloads. When the response carries
+    validators the rest of the body is still read so it can be cached, and an
+    unchanged feed is then answered with a 304 and parsed from the cache.
+    
+    Args:
+        feed_url: The URL of the feed
+        max_items: The maximum number of items to read
+        headers: The request headers to use
+        
+    Returns:
+        The feed items, or None if there is no feed at the URL
+    """
+    cached = http_cache.get_cached_page(feed_url)
+    request_headers = dict(headers)
+    request_headers.update(http_cache.get_conditional_headers(cached))
+    
+    _count_stage("fetch", feed_url)
+    with time_stage("feed_fetch"):
+        response = http_client.get(feed_url, headers=request_headers, timeout=15, stream=True)
+    try:
+        if response.status_code == 304 and cached:
+            _count_stage("not_modified")
+            record_cache_lookup("http", "hit")
+            http_cache.touch_page(feed_url)
+            _count_stage("parse")
+            with time_stage("feed_parse"):
+                # Feed bodies are cached as latin-1 so the bytes round-trip whatever their encoding
+                return parse_feed([cached["body"].encode("latin-1")], max_items)
+        record_cache_lookup("http", "changed" if cached else "miss")
+        
+        if response.status_code != 200:
+            logger.info(f"No feed at {feed_url}, status code: {response.status_code}")
+            return None
+        
+        # The feed is parsed while it downloads, so this includes reading the body
+        body = []
+        chunks = _count_bytes(response.iter_content(chunk_size=16384))
+        _count_stage("parse")
+        with time_stage("feed_parse"):
+            items = parse_feed(_keep_chunks(chunks, body), max_items)
+        
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if items and http_cache.HTTP_CACHE_ENABLED and (etag or last_modified):
+            with time_stage("feed_fetch"):
+                body.extend(chunks)
+            http_cache.store_page(feed_url, b"".join(body).decode("latin-1"), etag, last_modified)
+        return items
+    finally:
+        # Stops the download once enough items have been read
+        response.close()
+
+
+def _load_feed_item_text(key: str, item: Dict[str, Any]) -> Optional[str]:
+    """
+    Get the text of a feed item, reusing the indexed text if its content is unchanged
+    
+    Args:
+        key: The canonical URL of the item's article
+        item: A feed item from parse_feed
+        
+    Returns:
+        The article text, or None if the item only has an excerpt
+    """
+    content = item['content']
+    if len(content) < MIN_CONTENT_LENGTH:
+        return None
+    
+    content_hash = article_index.hash_content(content)
+    indexed = article_index.get_article(key)
+    if indexed and indexed['content_hash'] == content_hash and indexed['text']:
+        _count_stage("index_unchanged")
+        record_cache_lookup("article_index", "unchanged")
+        article_index.touch_article(key)
+        return indexed['text']
+    
+    _count_stage("feed_extract")
+    text = extract_item_text(content)
+    if text:
+        # Excerpts are left to the article page, which records its own lookup
+        record_cache_lookup("article_index", "miss")
+        article_index.store_article(key, content_hash, item['headline'], text)
+    return text
+
+
+def _keep_chunks(chunks: Iterable[bytes], body: List[bytes]) -> Iterable[bytes]:
+    """Pass chunks through while keeping a copy of each one"""
+    for chunk in chunks:
+        body.append(chunk)
+        yield chunk
+
+
+def _resolve_link(href: str, base_url: str) -> Optional[Tuple[str, str]]:
+    """
+    Resolve a link found on a section page or feed
+    
+    Args:
+        href: The link as written
+        base_url: The URL of the section page
+        
+    Returns:
+        The resolved and canonical URLs, or None if the link is malformed
+    """
+    try:
+        resolved = resolve_url(href, base_url)
+        return resolved, canonicalize_url(resolved)
+    except ValueError as e:
+        # One bad link should not cost the rest of the section
+        logger.warning(f"Skipping malformed link {href!r}: {str(e)}")
+        return None
+
+
+def _count_bytes(chunks: Iterable[bytes]) -> Iterable[bytes]:
+    """Pass chunks through while counting the bytes downloaded"""
+    for chunk in chunks:
+        with _stage_counters_lock:
+            _stage_counters["bytes"] += len(chunk)
+        yield chunk
+
+
+def _scrape_linked_article(url: str, headers: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """
+    Scrape the headline and text of an article found through a plain link
+    
+    Args:
+        url: The URL of the article
+        headers: The request headers to use
+        
+    Returns:
+        A dictionary with headline, text and url, or None if the article has no text
+    """
+    try:
+        article = load_article(url, headers=headers)
+        if not article or not article['text']:
+            return None
+        
+        return {
+            'headline': article['headline'],
+            'text': article['text'],
+            'url': url
+        }
+    except Exception as e:
+        logger.error(f"Error scraping article {url}: {str(e)}")
+        return None
+
+
+def load_article(url: str, headers: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Get the headline and text of an article, using the article index where possible
+    
+    Articles checked within the recheck interval are loaded from the index
+    without any request. Otherwise the page is downloaded once, and
+    extraction only runs if its content changed since it was indexed.
+    
+    Args:
+        url: The URL of the article
+        headers: The request headers to use
+        
+    Returns:
+        A dictionary with headline and text, or None if the page could not be downloaded
+    """
+    # Share one download between colleges that load the same article at the same time
+    key = canonicalize_url(url)
+    with _in_flight_lock:
+        future = _in_flight_articles.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _in_flight_articles[key] = future
+    
+    if not owner:
+        _count_stage("shared_fetch")
+        return future.result()
+    
+    try:
+        article = _load_article(url, key, headers)
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(article)
+        return article
+    finally:
+        with _in_flight_lock:
+            _in_flight_articles.pop(key, None)
+
+
+def _load_article(url: str, key: str, headers: Optional[Dict[str, str]]) -> Optional[Dict[str, Any]]:
+    """Load an article from the index (by canonical key) or the network, without in-flight sharing"""
+    indexed = article_index.get_article(key)
+    if indexed and article_index.is_fresh(indexed):
+        _count_stage("index_hit")
+        record_cache_lookup("article_index", "hit")
+        return indexed
+    
+    with time_stage("article_fetch"):
+        html = fetch_page(url, headers=headers)
+    if not html:
+        # Serve the last known version rather than nothing
+        return indexed
+    
+    content_hash = article_index.hash_content(html)
+    if indexed and indexed['content_hash'] == content_hash:
+        _count_stage("index_unchanged")
+        record_cache_lookup("article_index", "unchanged")
+        article_index.touch_article(key)
+        return indexed
+    record_cache_lookup("article_index", "miss")
+    
+    # Download the page once and run every extraction step on the same HTML
+    article = {
+        'headline': extract_headline(html),
+        'text': extract_article_text(html)
+    }
+    article_index.store_article(key, content_hash, article['headline'], article['text'])
+    return article
+
+
+def fetch_page(url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 10) -> Optional[str]:
+    """
+    Download a page and return its HTML
+    
+    Args:
+        url: The URL of the page
+        headers: The request headers to use (defaults to a random user agent)
+        timeout: The request timeout in seconds
+        
+    Returns:
+        The HTML of the page or None if the request did not succeed
+    """
+    if headers is None:
+        headers = {"User-Agent": get_random_user_agent()}
+    
+    # Revalidate a cached copy instead of downloading the full page again
+    cached = http_cache.get_cached_page(url)
+    request_headers = dict(headers)
+    request_headers.update(http_cache.get_conditional_headers(cached))
+    
+    _count_stage("fetch", url)
+    response = http_client.get(url, headers=request_headers, timeout=timeout)
+    if response.status_code == 304 and cached:
+        _count_stage("not_modified")
+        record_cache_lookup("http", "hit")
+        http_cache.touch_page(url)
+        return cached["body"]
+    record_cache_lookup("http", "changed" if cached else "miss")
+    
+    if response.status_code != 200:
+        logger.error(f"Failed to access {url}, status code: {response.status_code}")
+        return None
+    
+    with _stage_counters_lock:
+        _stage_counters["bytes"] += len(response.content)
+    
+    http_cache.store_page(
+        url,
+        response.text,
+        response.headers.get("ETag"),
+        response.headers.get("Last-Modified")
+    )
+    return response.text
+
+
+def extract_headline(html: str) -> str:
+    """
+    Extract an article headline from the title tag or first heading
+    
+    Args:
+        html: The HTML of the article page
+        
+    Returns:
+        The headline with any site name removed
+    """
+    _count_stage("headline")
+    soup = parse_headline_elements(html)
+    
+    headline = soup.title.string if soup.title else None
+    if not headline:
+        heading = soup.find(['h1', 'h2'])
+        headline = heading.get_text().strip() if heading else "Article"
+    
+    # Remove site name from headline if present
+    headline = re.sub(r'\s*\|\s*.*$', '', headline)
+    headline = re.sub(r'\s*-\s*.*$', '', headline)
+    return headline
+
+
+def extract_article_text(html: str) -> Optional[str]:
+    """
+    Extract the article text from downloaded HTML, using trafilatura
+    first and BeautifulSoup as a fallback
+    
+    Args:
+        html: The HTML of the article page
+        
+    Returns:
+        The article text content or None if nothing could be extracted
+    """
+    # trafilatura and BeautifulSoup take a long time to import, so they are
+    # imported on first use rather than when the app starts
+    import trafilatura
+    from bs4 import BeautifulSoup
+    
+    _count_stage("trafilatura")
+    with time_stage("trafilatura"):
+        text = trafilatura.extract(html, include_comments=False, include_tables=False)
+    if text:
+        return text
+    
+    # Fallback to BeautifulSoup if trafilatura fails
+    _count_stage("fallback")
+    record_fallback("extraction")
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Remove script, style, and other non-content elements
+    for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
+        element.decompose()
+    
+    # Try to find the main content area
+    main_content = soup.select_one('main, #content, .content, article, .post, .article')
+    if main_content:
+        text = main_content.get_text(separator='\n', strip=True)
+    else:
+        # If we can't find a specific content area, just get the body text
+        text = soup.body.get_text(separator='\n', strip=True) if soup.body else ''
+    
+    # Clean up the text
+    text = re.sub(r'\n{3,}', '\n\n', text)  # Remove excessive newlines
+    return text
+
+
 def scrape_article_text(article_url: str) -> Optional[str]:
     """
     Scrape the content of an individual article using trafilatura
@@ -175,40 +652,38 @@ def scrape_article_text(article_url: str) -> Optional[str]:
         The article text content or None if failed
     """
     try:
-        # Set a user agent for the session
-        user_agent = get_random_user_agent()
-        
-        # Use trafilatura for extraction - note it doesn't accept headers directly
-        downloaded = trafilatura.fetch_url(article_url)
-        if downloaded:
-            text = trafilatura.extract(downloaded, include_comments=False, include_tables=False)
-            if text:
-                return text
-        
-        # Fallback to BeautifulSoup if trafilatura fails
-        headers = {"User-Agent": user_agent}
-        response = requests.get(article_url, headers=headers, timeout=10)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove script, style, and other non-content elements
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                element.decompose()
-            
-            # Try to find the main content area
-            main_content = soup.select_one('main, #content, .content, article, .post, .article')
-            if main_content:
-                text = main_content.get_text(separator='\n', strip=True)
-            else:
-                # If we can't find a specific content area, just get the body text
-                text = soup.body.get_text(separator='\n', strip=True) if soup.body else ''
-            
-            # Clean up the text
-            text = re.sub(r'\n{3,}', '\n\n', text)  # Remove excessive newlines
-            return text
-        
-        return None
+        article = load_article(article_url)
+        return article['text'] if article else None
     
     except Exception as e:
         logger.error(f"Error extracting article content from {article_url}: {str(e)}")
         return None
+
+
+def _count_stage(stage: str, url: Optional[str] = None) -> None:
+    """Record that a pipeline stage ran, and for fetches which URL was downloaded"""
+    with _stage_counters_lock:
+        _stage_counters[stage] += 1
+        if url is not None:
+            _fetch_counts[url] += 1
+
+
+def get_stage_counters() -> Dict[str, Any]:
+    """
+    Get the number of times each scraping stage has run in this process
+    
+    Returns:
+        A dictionary with per-stage counts and the number of downloads per URL
+    """
+    with _stage_counters_lock:
+        return {
+            "stages": dict(_stage_counters),
+            "fetches_per_url": dict(_fetch_counts)
+        }
+
+
+def reset_stage_counters() -> None:
+    """Reset the scraping stage counters"""
+    with _stage_counters_lock:
+        _stage_counters.clear()
+        _fetch_counts.clear()
@@ -10,5 +10,5 @@ if [ -z "$OPENAI_API_KEY" ]; then
     exit 1
 fi
 
-# Start the server with Uvicorn (alternative to Flask's development server)
-uvicorn main:app --host 0.0.0.0 --port 5000 --reload
\ No newline at end of file
+# Start the ASGI app with Uvicorn (alternative to Flask's development server)
+uvicorn asgi:app --host 0.0.0.0 --port 5000 --reload
\ No newline at end of file
@@ -1,8 +1,79 @@
+import json
 import logging
 import os
 from typing import Dict, Optional, Tuple, Any
 
-from openai_config import client
+from compression import ANALYSIS_TOKEN_BUDGET, SENTIMENT_TOKEN_BUDGET, SUMMARY_TOKEN_BUDGET, compress_text
+from local_sentiment import is_confident, record_agreement, score_sentiment, should_shadow
+from metrics import record_fallback, record_token_usage, time_stage
+from openai_config import get_client
+from rate_limiter import estimate_tokens, get_rate_limiter
+from result_cache import get_result, make_cache_key, set_result
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# the newest OpenAI model is "gpt-4o" which was released May 13, 2024
+MODEL = "gpt-4o"
+
+# Bump these whenever a prompt changes so cached results are not reused
+SUMMARY_PROMPT_VERSION = "1"
+SENTIMENT_PROMPT_VERSION = "1"
+ANALYSIS_PROMPT_VERSION = "1"
+ANALYSIS_SUMMARY_PROMPT_VERSION = "1"
+
+# JSON schema for the combined article analysis response
+ARTICLE_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "rewritten_headline": {"type": "string"},
+        "rating": {"type": "integer"},
+        "confidence": {"type": "number"},
+        "explanation": {"type": "string"}
+    },
+    "required": ["summary", "rewritten_headline", "rating", "confidence", "explanation"],
+    "additionalProperties": False
+}
+
+# JSON schema for the article analysis response when the sentiment was scored locally
+ARTICLE_SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "rewritten_headline": {"type": "string"}
+    },
+    "required": ["summary", "rewritten_headline"],
+    "additionalProperties": False
+}
+
+
+def _create_completion(stage: str, **kwargs) -> Any:
+    """
+    Create a chat completion, throttled by the shared rate limiter
+    
+    Args:
+        stage: The pipeline stage making the call, used to label its metrics
+        **kwargs: The arguments for client.chat.completions.create
+        
+    Returns:
+        The chat completion response
+    """
+    prompt_text = "".join(message["content"] for message in kwargs["messages"])
+    estimated = estimate_tokens(prompt_text, kwargs.get("max_tokens", 0))
+    
+    limiter = get_rate_limiter()
+    limiter.acquire(estimated)
+    # A failed request keeps its reservation, since it may still have used capacity
+    with time_stage(stage):
+        response = get_client().chat.completions.create(**kwargs)
+    
+    usage = getattr(response, "usage", None)
+    record_token_usage(stage, usage)
+    if usage is not None and getattr(usage, "total_tokens", None) is not None:
+        limiter.record_usage(estimated, usage.total_tokens)
+    return response
 
 
 def summarize_article(headline: str, content: str) -> Tuple[str, str]:
@@ -19,19 +90,26 @@ def summarize_article(headline: str, content: str) -> Tuple[str, str]:
     if not content:
         return "No content available to summarize.", headline
     
-    # Truncate content if it's too long (to avoid token limits)
-    max_content_length = 8000
-    if len(content) > max_content_length:
-        truncated_content = content[:max_content_length] + "..."
-    else:
-        truncated_content = content
+    # Compress content to the summary token budget (to cut latency and cost)
+    compressed_content = compress_text(content, SUMMARY_TOKEN_BUDGET)
+    
+    cache_key = make_cache_key(
+        "summary",
+        f"{headline}\n\n{compressed_content}",
+        SUMMARY_PROMPT_VERSION,
+        MODEL,
+        {"max_tokens": 300, "temperature": 0.7}
+    )
+    cached = get_result(cache_key)
+    if cached:
+        return cached["summary"], cached["rewritten_headline"]
     
     try:
         # Prompt for GPT to generate a summary and headline
         prompt = f"""
         Original Headline: {headline}
         
-        Article Content: {truncated_content}
+        Article Content: {compressed_content}
         
         Task: Create a concise 2-sentence summary of this article that captures the key points.
         Also, suggest an engaging rewritten headline that would appeal to Clemson University students and faculty.
@@ -41,8 +119,9 @@ def summarize_article(headline: str, content: str) -> Tuple[str, str]:
         Rewritten Headline: [Your engaging headline here]
         """
         
-        response = client.chat.completions.create(
-            model="gpt-4o",  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024
+        response = _create_completion(
+            "summarize",
+            model=MODEL,
             messages=[
                 {"role": "system", "content": "You are a skilled journalist who specializes in creating engaging summaries and headlines for college news articles."},
                 {"role": "user", "content": prompt}
@@ -67,10 +146,12 @@ def summarize_article(headline: str, content: str) -> Tuple[str, str]:
         else:
             rewritten_headline = headline  # Keep original if no rewrite found
         
+        set_result(cache_key, {"summary": raw_summary, "rewritten_headline": rewritten_headline})
         return raw_summary, rewritten_headline
     
     except Exception as e:
         logger.error(f"Error summarizing article: {str(e)}")
+        record_fallback("summary_error")
         return f"Error generating summary: {str(e)}", headline
 
 
@@ -84,9 +165,26 @@ def analyze_sentiment(text: str) -> Dict[str, Any]:
     Returns:
         A dictionary with sentiment rating (1-5) and confidence score
     """
+    # Score locally first and only escalate to the LLM when the local score is unsure,
+    # apart from a shadow sample of confident scores used to measure their agreement
+    local_sentiment = score_sentiment(text)
+    confident = is_confident(local_sentiment)
+    shadow = confident and should_shadow()
+    if confident and not shadow:
+        return local_sentiment
+    
+    # Compress the text to the sentiment token budget (to cut latency and cost)
+    text = compress_text(text, SENTIMENT_TOKEN_BUDGET)
+    
+    cache_key = make_cache_key("sentiment", text, SENTIMENT_PROMPT_VERSION, MODEL, {"max_tokens": 150})
+    cached = get_result(cache_key)
+    if cached:
+        return cached
+    
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024
+        response = _create_completion(
+            "sentiment",
+            model=MODEL,
             messages=[
                 {
                     "role": "system",
@@ -105,19 +203,204 @@ def analyze_sentiment(text: str) -> Dict[str, Any]:
         # Parse the sentiment analysis result
         result = response.choices[0].message.content
         # Convert to Python dictionary
-        import json
         sentiment_data = json.loads(result)
         
-        return {
+        sentiment = {
             "rating": max(1, min(5, round(sentiment_data.get("rating", 3)))),
             "confidence": max(0, min(1, sentiment_data.get("confidence", 0.5))),
             "explanation": sentiment_data.get("explanation", "No explanation provided")
         }
+        set_result(cache_key, sentiment)
+        if shadow:
+            record_agreement(local_sentiment, sentiment)
+        return sentiment
     
     except Exception as e:
         logger.error(f"Error analyzing sentiment: {str(e)}")
+        record_fallback("sentiment_error")
         return {
             "rating": 3,
             "confidence": 0.0,
             "explanation": f"Error analyzing sentiment: {str(e)}"
         }
+
+
+def analyze_article(headline: str, content: str) -> Dict[str, Any]:
+    """
+    Summarize an article, rewrite its headline and rate its sentiment in a
+    single OpenAI call with a JSON-schema-constrained response
+    
+    The article is scored locally first. When that score is confident, the
+    sentiment is dropped from the call: only the summary and headline are
+    requested (see _analyze_article_summary) and the local score is returned.
+    A LOCAL_SENTIMENT_SHADOW_RATE sample of confident articles still gets the
+    combined call, and its LLM rating is compared with the local one.
+    
+    Args:
+        headline: The headline of the article
+        content: The full text of the article
+        
+    Returns:
+        A dictionary with summary, rewritten_headline and sentiment
+        (rating, confidence, explanation)
+    """
+    if not content:
+        return {
+            "summary": "No content available to summarize.",
+            "rewritten_headline": headline,
+            "sentiment": {"rating": 3, "confidence": 0.0, "explanation": "No content available"}
+        }
+    
+    local_sentiment = score_sentiment(content)
+    confident = is_confident(local_sentiment)
+    shadow = confident and should_shadow()
+    if confident and not shadow:
+        return _analyze_article_summary(headline, content, local_sentiment)
+    
+    compressed_content = compress_text(content, ANALYSIS_TOKEN_BUDGET)
+    
+    cache_key = make_cache_key(
+        "analysis",
+        f"{headline}\n\n{compressed_content}",
+        ANALYSIS_PROMPT_VERSION,
+        MODEL,
+        {"max_tokens": 400, "temperature": 0.7}
+    )
+    cached = get_result(cache_key)
+    if cached:
+        return cached
+    
+    try:
+        prompt = f"""
+        Original Headline: {headline}
+        
+        Article Content: {compressed_content}
+        
+        Task: Create a concise 2-sentence summary of this article that captures the key points.
+        Also, suggest an engaging rewritten headline that would appeal to Clemson University students and faculty.
+        Finally, rate the sentiment of the article from 1 to 5 stars (where 5 is very positive),
+        with a confidence score between 0 and 1 and a brief explanation.
+        """
+        
+        response = _create_completion(
+            "analyze",
+            model=MODEL,
+            messages=[
+                {"role": "system", "content": "You are a skilled journalist who specializes in creating engaging summaries and headlines for college news articles, and an expert in sentiment analysis."},
+                {"role": "user", "content": prompt}
+            ],
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "article_analysis",
+                    "strict": True,
+                    "schema": ARTICLE_ANALYSIS_SCHEMA
+                }
+            },
+            max_tokens=400,
+            temperature=0.7
+        )
+        
+        data = json.loads(response.choices[0].message.content)
+        
+        analysis = {
+            "summary": data.get("summary") or "Summary not available.",
+            "rewritten_headline": data.get("rewritten_headline") or headline,
+            "sentiment": {
+                "rating": max(1, min(5, round(data.get("rating", 3)))),
+                "confidence": max(0, min(1, data.get("confidence", 0.5))),
+                "explanation": data.get("explanation", "No explanation provided")
+            }
+        }
+        set_result(cache_key, analysis)
+        if shadow:
+            # Track how often confident local scores agree with the LLM
+            record_agreement(local_sentiment, analysis["sentiment"])
+        return analysis
+    
+    except Exception as e:
+        logger.error(f"Error analyzing article: {str(e)}")
+        record_fallback("analysis_error")
+        return {
+            "summary": f"Error generating summary: {str(e)}",
+            "rewritten_headline": headline,
+            "sentiment": {
+                "rating": 3,
+                "confidence": 0.0,
+                "explanation": f"Error analyzing sentiment: {str(e)}"
+            }
+        }
+
+
+def _analyze_article_summary(headline: str, content: str, sentiment: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Summarize an article and rewrite its headline in one JSON-schema-constrained
+    call, for articles whose sentiment was already scored locally
+    
+    Args:
+        headline: The headline of the article
+        content: The full text of the article
+        sentiment: The local sentiment score to return with the summary
+        
+    Returns:
+        A dictionary with summary, rewritten_headline and sentiment, like analyze_article's
+    """
+    compressed_content = compress_text(content, ANALYSIS_TOKEN_BUDGET)
+    
+    cache_key = make_cache_key(
+        "analysis_summary",
+        f"{headline}\n\n{compressed_content}",
+        ANALYSIS_SUMMARY_PROMPT_VERSION,
+        MODEL,
+        {"max_tokens": 300, "temperature": 0.7}
+    )
+    cached = get_result(cache_key)
+    if cached:
+        return {**cached, "sentiment": sentiment}
+    
+    try:
+        prompt = f"""
+        Original Headline: {headline}
+        
+        Article Content: {compressed_content}
+        
+        Task: Create a concise 2-sentence summary of this article that captures the key points.
+        Also, suggest an engaging rewritten headline that would appeal to Clemson University students and faculty.
+        """
+        
+        response = _create_completion(
+            "analyze",
+            model=MODEL,
+            messages=[
+                {"role": "system", "content": "You are a skilled journalist who specializes in creating engaging summaries and headlines for college news articles."},
+                {"role": "user", "content": prompt}
+            ],
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "article_summary",
+                    "strict": True,
+                    "schema": ARTICLE_SUMMARY_SCHEMA
+                }
+            },
+            max_tokens=300,
+            temperature=0.7
+        )
+        
+        data = json.loads(response.choices[0].message.content)
+        
+        summary = {
+            "summary": data.get("summary") or "Summary not available.",
+            "rewritten_headline": data.get("rewritten_headline") or headline
+        }
+        set_result(cache_key, summary)
+        return {**summary, "sentiment": sentiment}
+    
+    except Exception as e:
+        logger.error(f"Error analyzing article: {str(e)}")
+        record_fallback("analysis_error")
+        return {
+            "summary": f"Error generating summary: {str(e)}",
+            "rewritten_headline": headline,
+            "sentiment": sentiment
+        }
@@ -0,0 +1,38 @@
+"""
+Tests for the analysis API routes (api.py).
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import api
+
+BATCH_ROUTES = ["/analyze/text/batch", "/analyze/sentiment/batch"]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """A client for the API routes with no OpenAI key configured"""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(api, "_openai_service", None)
+    monkeypatch.setattr(api, "MAX_BATCH_SIZE", 2)
+    app = FastAPI()
+    app.include_router(api.router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("route", BATCH_ROUTES)
+def test_an_oversized_batch_is_rejected_before_the_service_is_created(client, route):
+    response = client.post(route, json={"texts": ["a", "b", "c"]})
+
+    assert response.status_code == 400
+    assert "Batch too large" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("route", BATCH_ROUTES)
+def test_a_missing_openai_key_is_reported_as_an_error(client, route):
+    response = client.post(route, json={"texts": ["a"]})
+
+    assert response.status_code == 500
+    assert response.json()["detail"].startswith("Failed to analyze")
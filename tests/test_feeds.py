@@ -0,0 +1,252 @@
+"""
+Tests for reading section feeds (feeds.py) and feed ingestion in the scraper.
+
+Requests are answered from the saved feeds and pages in tests/fixtures, so
+no test touches the network.
+"""
+
+import os
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pytest
+
+import article_index
+import http_cache
+import http_client
+import scraper
+from feeds import extract_item_text, get_feed_url, parse_feed
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+SITE_URL = "https://news.clemson.edu"
+SECTION_URL = f"{SITE_URL}/section/college-of-engineering/"
+FEED_URL = get_feed_url(SECTION_URL)
+
+
+def read_fixture(*path: str) -> bytes:
+    """Read a saved feed or page"""
+    with open(os.path.join(FIXTURES_DIR, *path), "rb") as f:
+        return f.read()
+
+
+def split_chunks(body: bytes, size: int = 64) -> Iterator[bytes]:
+    """Yield a body in small chunks, as a streamed download would"""
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+class FakeResponse:
+    """The parts of requests.Response the scraper uses"""
+
+    def __init__(self, status_code: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None):
+        self.status_code = status_code
+        self.content = body
+        self.text = body.decode("utf-8")
+        self.headers = headers or {}
+        self.closed = False
+
+    def iter_content(self, chunk_size: int = 1) -> Iterable[bytes]:
+        return split_chunks(self.content, chunk_size)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSite:
+    """Answers GET requests from fixtures, honouring If-None-Match"""
+
+    def __init__(self, pages: Dict[str, bytes]):
+        self.pages = pages
+        self.requests: List[Dict[str, str]] = []
+        self.lock = threading.Lock()
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> FakeResponse:
+        headers = headers or {}
+        with self.lock:
+            self.requests.append({"url": url, **headers})
+        body = self.pages.get(url)
+        if body is None:
+            return FakeResponse(404, b"Not found")
+        etag = f'"{article_index.hash_content(body.decode("utf-8"))[:16]}"'
+        if headers.get("If-None-Match") == etag:
+            return FakeResponse(304, headers={"ETag": etag})
+        return FakeResponse(200, body, {"ETag": etag})
+
+    def urls(self) -> List[str]:
+        return [request["url"] for request in self.requests]
+
+
+@pytest.fixture
+def caches(tmp_path, monkeypatch):
+    """Give each test its own empty HTTP cache and article index"""
+    monkeypatch.setattr(http_cache, "HTTP_CACHE_ENABLED", True)
+    monkeypatch.setattr(http_cache, "HTTP_CACHE_DIR", str(tmp_path / "http"))
+    monkeypatch.setattr(article_index, "ARTICLE_INDEX_ENABLED", True)
+    monkeypatch.setattr(article_index, "ARTICLE_INDEX_PATH", str(tmp_path / "articles.sqlite3"))
+    monkeypatch.setattr(article_index, "_local", threading.local())
+    scraper.reset_stage_counters()
+
+
+def serve(monkeypatch, pages: Dict[str, bytes]) -> FakeSite:
+    """Route the scraper's requests to a fake site"""
+    site = FakeSite(pages)
+    monkeypatch.setattr(http_client, "get", site.get)
+    return site
+
+
+def test_parse_feed_reads_full_content():
+    items = parse_feed(split_chunks(read_fixture("feeds", "full.xml")), 10)
+
+    assert [item["headline"] for item in items] == [
+        "Clemson chemists develop a faster catalyst for clean hydrogen",
+        "Biology students map pollinators across the Upstate",
+        "Physics department welcomes five new faculty members",
+    ]
+    assert items[0]["url"] == f"{SITE_URL}/clemson-chemists-develop-a-faster-catalyst/"
+    assert items[0]["published"] == "Tue, 14 Oct 2025 13:00:00 +0000"
+
+    text = extract_item_text(items[0]["content"])
+    assert text.startswith("A team of Clemson University chemists")
+    assert "funded by the National Science Foundation" in text
+    # Scripts and figures are not part of the article text
+    assert "trackView" not in text
+    assert "under a microscope" not in text
+
+
+def test_parse_feed_stops_after_max_items():
+    chunks = split_chunks(read_fixture("feeds", "full.xml"))
+    items = parse_feed(chunks, 1)
+
+    assert len(items) == 1
+    # The rest of the feed was never read
+    assert next(chunks, None) is not None
+
+
+def test_parse_feed_keeps_excerpt_only_items():
+    items = parse_feed(split_chunks(read_fixture("feeds", "excerpt.xml")), 10)
+
+    assert len(items) == 2
+    assert extract_item_text(items[0]["content"]) is not None
+    assert items[1]["url"] == "/student-team-wins-robotics-competition/"
+    assert extract_item_text(items[1]["content"]) is None
+
+
+def test_parse_feed_rejects_a_body_that_is_not_rss():
+    assert parse_feed(split_chunks(read_fixture("feeds", "not_rss.html")), 10) is None
+
+
+def test_parse_feed_returns_the_items_read_before_a_truncation():
+    items = parse_feed(split_chunks(read_fixture("feeds", "truncated.xml")), 10)
+
+    assert [item["headline"] for item in items] == [
+        "Clemson chemists develop a faster catalyst for clean hydrogen",
+        "Biology students map pollinators across the Upstate",
+    ]
+
+
+def test_scrape_feed_articles_uses_feed_content(caches, monkeypatch):
+    site = serve(monkeypatch, {FEED_URL: read_fixture("feeds", "full.xml")})
+
+    articles = scraper.scrape_feed_articles(SECTION_URL, 10)
+
+    assert len(articles) == 3
+    assert all(len(article["text"]) >= 200 for article in articles)
+    # Every article came from the one feed response
+    assert site.urls() == [FEED_URL]
+
+
+def test_scrape_feed_articles_fetches_pages_for_excerpts(caches, monkeypatch):
+    article_url = f"{SITE_URL}/student-team-wins-robotics-competition/"
+    site = serve(monkeypatch, {
+        FEED_URL: read_fixture("feeds", "excerpt.xml"),
+        article_url: read_fixture("pages", "article.html"),
+    })
+
+    articles = scraper.scrape_feed_articles(SECTION_URL, 10)
+
+    assert [article["url"] for article in articles] == [
+        f"{SITE_URL}/engineers-test-self-powered-bridge-sensor/",
+        article_url,
+    ]
+    assert articles[0]["text"].startswith("Civil engineers at Clemson University")
+    assert "sorted recycling from a moving conveyor belt" in articles[1]["text"]
+    assert site.urls() == [FEED_URL, article_url]
+
+
+def test_scrape_feed_articles_revalidates_an_unchanged_feed(caches, monkeypatch):
+    site = serve(monkeypatch, {FEED_URL: read_fixture("feeds", "full.xml")})
+    first = scraper.scrape_feed_articles(SECTION_URL, 10)
+
+    scraper.reset_stage_counters()
+    second = scraper.scrape_feed_articles(SECTION_URL, 10)
+
+    assert second == first
+    assert "If-None-Match" in site.requests[-1]
+    stages = scraper.get_stage_counters()["stages"]
+    assert stages["not_modified"] == 1
+    assert stages.get("bytes", 0) == 0
+    # Unchanged items reuse the indexed text instead of being converted again
+    assert stages["index_unchanged"] == 3
+    assert "feed_extract" not in stages
+
+
+def test_scrape_feed_articles_reads_a_truncated_feed(caches, monkeypatch):
+    serve(monkeypatch, {FEED_URL: read_fixture("feeds", "truncated.xml")})
+
+    articles = scraper.scrape_feed_articles(SECTION_URL, 10)
+
+    assert [article["headline"] for article in articles] == [
+        "Clemson chemists develop a faster catalyst for clean hydrogen",
+        "Biology students map pollinators across the Upstate",
+    ]
+
+
+@pytest.mark.parametrize("feed", [None, read_fixture("feeds", "not_rss.html")], ids=["missing", "not-rss"])
+def test_scrape_latest_articles_falls_back_to_html(caches, monkeypatch, feed):
+    monkeypatch.setattr(scraper, "INGESTION_MODE", "feed")
+    pages = {
+        SECTION_URL: read_fixture("pages", "section.html"),
+        f"{SITE_URL}/engineers-test-self-powered-bridge-sensor/": read_fixture("pages", "article.html"),
+        f"{SITE_URL}/student-team-wins-robotics-competition/": read_fixture("pages", "article.html"),
+    }
+    if feed is not None:
+        pages[FEED_URL] = feed
+    site = serve(monkeypatch, pages)
+
+    articles = scraper.scrape_latest_articles(SECTION_URL, 10)
+
+    assert [article["headline"] for article in articles] == [
+        "Engineers test a bridge sensor that powers itself",
+        "Student team wins national robotics competition",
+    ]
+    assert all("conveyor belt" in article["text"] for article in articles)
+    assert site.urls()[:2] == [FEED_URL, SECTION_URL]
+
+
+def test_a_malformed_link_only_skips_that_article(caches, monkeypatch):
+    monkeypatch.setattr(scraper, "INGESTION_MODE", "html")
+    section = read_fixture("pages", "section.html").replace(
+        b'href="/engineers-test-self-powered-bridge-sensor/"', b'href="http://news.clemson.edu:abc/x"')
+    serve(monkeypatch, {
+        SECTION_URL: section,
+        f"{SITE_URL}/student-team-wins-robotics-competition/": read_fixture("pages", "article.html"),
+    })
+
+    articles = scraper.scrape_latest_articles(SECTION_URL, 10)
+
+    assert [article["url"] for article in articles] == [f"{SITE_URL}/student-team-wins-robotics-competition/"]
+
+
+def test_a_malformed_feed_link_only_skips_that_item(caches, monkeypatch):
+    feed = read_fixture("feeds", "full.xml").replace(
+        b"<link>https://news.clemson.edu/biology-students-map-pollinators/</link>",
+        b"<link>https://news.clemson.edu:abc/biology-students-map-pollinators/</link>")
+    serve(monkeypatch, {FEED_URL: feed})
+
+    articles = scraper.scrape_feed_articles(SECTION_URL, 10)
+
+    assert [article["headline"] for article in articles] == [
+        "Clemson chemists develop a faster catalyst for clean hydrogen",
+        "Physics department welcomes five new faculty members",
+    ]
@@ -0,0 +1,101 @@
+"""
+Tests that every section page parser backend (html_parser.py) extracts
+exactly what the scraper's original BeautifulSoup parse did, on section pages
+saved in tests/fixtures/sections.
+"""
+
+import glob
+import os
+from typing import Any, Dict, List
+
+import pytest
+
+import html_parser
+from html_parser import parse_section_page
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "sections")
+SECTION_PAGES = sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html")))
+
+BACKENDS = [
+    "html.parser",
+    pytest.param("lxml", marks=pytest.mark.skipif(not html_parser.LXML_AVAILABLE, reason="lxml is not installed")),
+    pytest.param("selectolax", marks=pytest.mark.skipif(
+        not html_parser.SELECTOLAX_AVAILABLE, reason="selectolax is not installed")),
+]
+
+
+def read_page(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def original_parse(html: str) -> Dict[str, List[Dict[str, Any]]]:
+    """The section page parse the scraper did before the parser backends: a full html.parser tree"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    containers = []
+    for container in soup.select('.news-item, .article, .post, .news-article, article, .story'):
+        link_tag = container.find('a', href=True)
+        if not link_tag:
+            containers.append({'href': None, 'link_text': '', 'heading_text': ''})
+            continue
+        heading_tag = container.find(['h1', 'h2', 'h3', 'h4'])
+        containers.append({
+            'href': link_tag.get('href', ''),
+            'link_text': link_tag.get_text(),
+            'heading_text': heading_tag.get_text() if heading_tag else ''
+        })
+
+    links = []
+    if not containers:
+        links = [{'href': link['href'], 'text': link.get_text()} for link in soup.find_all('a', href=True)]
+
+    return {'containers': containers, 'links': links}
+
+
+def test_section_pages_are_saved():
+    assert [os.path.basename(path) for path in SECTION_PAGES] == [
+        "college-of-education.html",
+        "college-of-science.html",
+        "news-releases.html",
+    ]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("path", SECTION_PAGES, ids=os.path.basename)
+def test_backend_matches_original_parse(path, backend):
+    page = read_page(path)
+
+    assert parse_section_page(page, backend) == original_parse(page)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_containers_are_read_in_document_order(backend):
+    result = parse_section_page(read_page(os.path.join(FIXTURES_DIR, "college-of-science.html")), backend)
+
+    assert [container['href'] for container in result['containers']] == [
+        "/clemson-chemists-develop-a-faster-catalyst/",
+        "/biology-students-map-pollinators/",
+        "https://news.clemson.edu/physics-welcomes-new-faculty/",
+        "/mathematicians-model-hurricane-evacuations/",
+        "/genetics-center-turns-25/",
+        None,
+    ]
+    # The first link only wraps a thumbnail, so the heading supplies the headline
+    assert result['containers'][0]['link_text'] == ""
+    assert result['containers'][0]['heading_text'] == "Clemson chemists develop a faster catalyst for clean hydrogen"
+    assert result['links'] == []
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_links_are_used_when_there_are_no_containers(backend):
+    result = parse_section_page(read_page(os.path.join(FIXTURES_DIR, "news-releases.html")), backend)
+
+    hrefs = [link['href'] for link in result['links']]
+    assert result['containers'] == []
+    assert "/news/clemson-announces-new-research-park/" in hrefs
+    # Links inside scripts and comments are not links
+    assert "/from-a-script/" not in hrefs
+    assert "/news/hidden-draft/" not in hrefs
@@ -0,0 +1,100 @@
+"""
+Tests for the local sentiment scorer (local_sentiment.py) and how the
+combined article analysis uses it.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import local_sentiment
+import summarizer
+from local_sentiment import LOCAL_SENTIMENT_THRESHOLD, score_sentiment
+
+POSITIVE = (
+    "The team won the award and celebrated a record year of growth. "
+    "Proud students earned scholarships and the new partnership will help."
+)
+MOSTLY_POSITIVE = (
+    "The team won an award and celebrated. Funding grew with new partnerships and "
+    "scholarships, though budget cuts and a delay raised concerns."
+)
+MOSTLY_NEGATIVE = (
+    "A fire caused damage and the closure of the lab; the investigation into the accident "
+    "continues though students helped celebrate a new partnership."
+)
+MIXED = (
+    "The new lab opens, celebrating success, but a fire caused damage and the project "
+    "was delayed amid concerns and problems."
+)
+
+
+@pytest.mark.parametrize("text, rating", [(POSITIVE, 5), (MOSTLY_POSITIVE, 4), (MOSTLY_NEGATIVE, 2)])
+def test_well_supported_ratings_are_confident(text, rating):
+    sentiment = score_sentiment(text)
+
+    assert sentiment["rating"] == rating
+    assert sentiment["confidence"] >= LOCAL_SENTIMENT_THRESHOLD
+
+
+def test_a_polarity_near_a_rating_boundary_is_escalated():
+    # 4 positive and 6 negative cues give a polarity of -0.2, right where 3 turns into 2
+    sentiment = score_sentiment(MIXED)
+
+    assert sentiment["rating"] == 3
+    assert sentiment["confidence"] < LOCAL_SENTIMENT_THRESHOLD
+
+
+def test_thin_evidence_is_escalated():
+    assert score_sentiment("The lab won an award.")["confidence"] < LOCAL_SENTIMENT_THRESHOLD
+    assert score_sentiment("The lab is on the second floor.")["confidence"] == 0.0
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    """Answer LLM calls with every analysis field the schema asks for, without caching"""
+    requests = []
+
+    def fake_completion(stage, **kwargs):
+        requests.append(kwargs)
+        analysis = {"summary": "Summary.", "rewritten_headline": "Headline", "rating": 1,
+                    "confidence": 0.9, "explanation": "LLM rating"}
+        properties = kwargs["response_format"]["json_schema"]["schema"]["properties"]
+        message = SimpleNamespace(content=json.dumps({key: analysis[key] for key in properties}))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(summarizer, "_create_completion", fake_completion)
+    monkeypatch.setattr(summarizer, "get_result", lambda key: None)
+    monkeypatch.setattr(summarizer, "set_result", lambda key, value: None)
+    return requests
+
+
+def test_analyze_article_drops_sentiment_from_the_call_when_confident(monkeypatch, completions):
+    monkeypatch.setattr(local_sentiment, "LOCAL_SENTIMENT_SHADOW_RATE", 0.0)
+    requests = completions
+
+    analysis = summarizer.analyze_article("Tigers win", MOSTLY_POSITIVE)
+
+    assert analysis["summary"] == "Summary."
+    assert analysis["rewritten_headline"] == "Headline"
+    assert analysis["sentiment"] == score_sentiment(MOSTLY_POSITIVE)
+    # One structured call that asks for the summary and headline only
+    assert len(requests) == 1
+    schema = requests[0]["response_format"]["json_schema"]["schema"]
+    assert set(schema["properties"]) == {"summary", "rewritten_headline"}
+
+
+def test_a_shadow_sample_of_confident_scores_is_compared_with_the_llm(monkeypatch, completions):
+    monkeypatch.setattr(local_sentiment, "LOCAL_SENTIMENT_SHADOW_RATE", 1.0)
+    before = local_sentiment.get_sentiment_stats()
+
+    analysis = summarizer.analyze_article("Tigers win", MOSTLY_POSITIVE)
+
+    after = local_sentiment.get_sentiment_stats()
+    # The combined call rated the article, and its rating was compared with the local 4
+    assert "rating" in completions[0]["response_format"]["json_schema"]["schema"]["properties"]
+    assert analysis["sentiment"]["explanation"] == "LLM rating"
+    assert after["shadowed"] == before["shadowed"] + 1
+    assert after["compared"] == before["compared"] + 1
+    assert after["agreed"] == before["agreed"]
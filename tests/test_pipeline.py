@@ -0,0 +1,90 @@
+"""
+Tests for building college digests (pipeline.py), buffered and streamed.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+import pytest
+
+import pipeline
+import response_cache
+from utils import format_header
+
+COLLEGE = "College of Science"
+
+ARTICLES = [
+    {"headline": "First story", "text": "First story text.", "url": "https://news.clemson.edu/first/"},
+    {"headline": "Empty story", "text": "", "url": "https://news.clemson.edu/empty/"},
+    {"headline": "Third story", "text": "Third story text.", "url": "https://news.clemson.edu/third/"},
+]
+
+
+def fake_process_article(article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Process an article without the LLM, skipping those without content like process_article"""
+    if not article["text"]:
+        return None
+    return {
+        "headline": article["headline"],
+        "rewritten_headline": article["headline"].upper(),
+        "summary": f"Summary of {article['headline']}.",
+        "url": article["url"],
+        "sentiment": {"rating": 4, "confidence": 0.9, "explanation": "Positive news"},
+        "is_raw_content": False,
+    }
+
+
+@pytest.fixture(autouse=True)
+def fake_pipeline(monkeypatch):
+    monkeypatch.setattr(pipeline, "scrape_latest_articles", lambda url, max_articles: [dict(a) for a in ARTICLES])
+    monkeypatch.setattr(pipeline, "process_article", fake_process_article)
+    monkeypatch.setattr(pipeline, "_shared_articles", OrderedDict())
+
+
+def test_streamed_digest_matches_the_buffered_digest():
+    buffered = pipeline.build_digest(COLLEGE)
+    events = list(pipeline.iter_digest_events(COLLEGE))
+
+    sections = [data for event, data in events if event == "article"]
+    assert [section["index"] for section in sections] == [1, 2]
+    assert "\n".join([format_header(COLLEGE)] + [section["markdown"] for section in sections]) == buffered["result"]
+    assert pipeline.assemble_digest(COLLEGE, sections) == buffered
+    assert events[-1][1]["article_count"] == 2
+
+
+def test_a_streamed_digest_is_cached_as_the_buffered_digest(monkeypatch):
+    cache = response_cache.ResponseCache(pipeline.build_digest, 600, 0)
+    monkeypatch.setattr(response_cache, "digest_cache", cache)
+
+    list(response_cache.iter_cached_digest_events(COLLEGE))
+
+    assert cache.peek(COLLEGE)["value"] == pipeline.build_digest(COLLEGE)
+
+
+def test_a_failed_shared_article_releases_its_waiters(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing_process_article(article):
+        started.set()
+        release.wait(5)
+        raise RuntimeError("summarizer crashed")
+
+    monkeypatch.setattr(pipeline, "process_article", failing_process_article)
+    article = ARTICLES[0]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        owner = executor.submit(pipeline.process_article_shared, article)
+        started.wait(5)
+        waiter = executor.submit(pipeline.process_article_shared, article)
+        release.set()
+
+        for future in (owner, waiter):
+            with pytest.raises(RuntimeError):
+                future.result(timeout=5)
+
+    # The failure is not kept, so the next digest processes the article again
+    monkeypatch.setattr(pipeline, "process_article", fake_process_article)
+    assert pipeline.process_article_shared(article)["summary"] == "Summary of First story."
@@ -0,0 +1,30 @@
+"""
+Tests for resolving and canonicalizing article links (urls.py).
+"""
+
+import pytest
+
+from urls import canonicalize_url, resolve_url
+
+BASE_URL = "https://news.clemson.edu/section/college-of-science/"
+
+
+def test_relative_links_resolve_against_the_section():
+    assert resolve_url("/story/?utm_source=x#top", BASE_URL) == "https://news.clemson.edu/story/"
+
+
+def test_default_ports_are_dropped_and_others_kept():
+    assert resolve_url("HTTPS://News.Clemson.edu:443/story") == "https://news.clemson.edu/story"
+    assert resolve_url("http://news.clemson.edu:8080/story") == "http://news.clemson.edu:8080/story"
+
+
+def test_ipv6_hosts_keep_their_brackets():
+    assert resolve_url("http://[::1]:8080/x") == "http://[::1]:8080/x"
+    assert resolve_url("http://[::1]/x") == "http://[::1]/x"
+    assert canonicalize_url("/story", "http://[::1]:8080/section/") == "http://[::1]:8080/story/"
+
+
+@pytest.mark.parametrize("href", ["http://news.clemson.edu:abc/x", "http://news.clemson.edu:99999/x"])
+def test_invalid_ports_raise_value_error(href):
+    with pytest.raises(ValueError):
+        resolve_url(href, BASE_URL)
@@ -0,0 +1,85 @@
+"""
+This module canonicalizes article URLs so the same story is recognized no
+matter which college section page linked to it or how the link was written.
+"""
+
+import posixpath
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "_ga", "_gl"}
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _is_tracking_param(name: str) -> bool:
+    """Return True for query parameters used only for click tracking"""
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def resolve_url(href: str, base_url: str = "") -> str:
+    """
+    Resolve a link to an absolute URL that is safe to fetch
+    
+    Args:
+        href: The link as written on the page (absolute or relative)
+        base_url: The URL of the page the link was found on
+    
+    Returns:
+        The absolute URL with a lowercase scheme and host, no default port,
+        no fragment and no tracking parameters
+    
+    Raises:
+        ValueError: If the link has an invalid port or host
+    """
+    url = urljoin(base_url, href.strip())
+    parts = urlsplit(url)
+    
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        # IPv6 addresses lose their brackets in hostname
+        host = f"[{host}]"
+    port = parts.port
+    netloc = host if port is None or DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    if parts.username:
+        # Keep credentials if present, though news links never have them
+        userinfo = parts.username + (f":{parts.password}" if parts.password else "")
+        netloc = f"{userinfo}@{netloc}"
+    
+    query = urlencode([
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    ])
+    
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+def canonicalize_url(href: str, base_url: str = "") -> str:
+    """
+    Resolve a link and normalize it to the canonical form used to identify an article
+    
+    This is resolve_url plus a trailing slash on paths that do not end in a
+    file name, so /story and /story/ are the same article. Use it as a
+    key only; fetch the resolved URL, since not every server accepts both.
+    
+    Args:
+        href: The link as written on the page (absolute or relative)
+        base_url: The URL of the page the link was found on
+    
+    Returns:
+        The canonical URL
+    
+    Raises:
+        ValueError: If the link has an invalid port or host
+    """
+    parts = urlsplit(resolve_url(href, base_url))
+    
+    path = parts.path
+    # WordPress permalinks end in a slash; add it unless the path names a file
+    if not path.endswith("/") and not posixpath.splitext(path)[1]:
+        path += "/"
+    
+    return urlunsplit((parts.scheme, parts.netloc, path, parts.query, ""))
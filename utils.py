@@ -6,17 +6,20 @@ from typing import Dict, List, Any
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Base URL of the Clemson newsroom; point it at a local copy for offline benchmarks
+NEWS_SITE_URL = os.environ.get("NEWS_SITE_URL", "https://news.clemson.edu").rstrip("/")
+
 # College URL mapping - Direct newsroom URLs
 COLLEGE_URLS = {
-    "College of Agriculture, Forestry and Life Sciences": "https://news.clemson.edu/section/college-of-agriculture-forestry-and-life-sciences/",
-    "College of Architecture, Art and Construction": "https://news.clemson.edu/section/college-of-architecture-art-and-construction/",
-    "College of Arts and Humanities": "https://news.clemson.edu/section/college-of-arts-and-humanities/",
-    "College of Behavioral, Social and Health Sciences": "https://news.clemson.edu/section/college-of-behavioral-social-and-health-sciences/",
-    "College of Education": "https://news.clemson.edu/section/college-of-education/",
-    "College of Engineering, Computing and Applied Sciences": "https://news.clemson.edu/section/college-of-engineering-computing-and-applied-sciences/",
-    "College of Science": "https://news.clemson.edu/section/college-of-science/",
-    "Harvey S. Peeler Jr. College of Veterinary Medicine": "https://news.clemson.edu/section/college-of-veterinary-medicine/",
-    "Wilbur O. and Ann Powers College of Business": "https://news.clemson.edu/section/wilbur-o-and-ann-powers-college-of-business/"
+    "College of Agriculture, Forestry and Life Sciences": f"{NEWS_SITE_URL}/section/college-of-agriculture-forestry-and-life-sciences/",
+    "College of Architecture, Art and Construction": f"{NEWS_SITE_URL}/section/college-of-architecture-art-and-construction/",
+    "College of Arts and Humanities": f"{NEWS_SITE_URL}/section/college-of-arts-and-humanities/",
+    "College of Behavioral, Social and Health Sciences": f"{NEWS_SITE_URL}/section/college-of-behavioral-social-and-health-sciences/",
+    "College of Education": f"{NEWS_SITE_URL}/section/college-of-education/",
+    "College of Engineering, Computing and Applied Sciences": f"{NEWS_SITE_URL}/section/college-of-engineering-computing-and-applied-sciences/",
+    "College of Science": f"{NEWS_SITE_URL}/section/college-of-science/",
+    "Harvey S. Peeler Jr. College of Veterinary Medicine": f"{NEWS_SITE_URL}/section/college-of-veterinary-medicine/",
+    "Wilbur O. and Ann Powers College of Business": f"{NEWS_SITE_URL}/section/wilbur-o-and-ann-powers-college-of-business/"
 }
 
 
@@ -41,6 +44,58 @@ def get_college_url(college_name: str) -> str:
     raise ValueError(f"College name not found: {college_name}")
 
 
+def format_header(college_name: str) -> str:
+    """
+    Format the heading of a college news digest
+    
+    Args:
+        college_name: The name of the college
+    
+    Returns:
+        The markdown heading
+    """
+    return f"# Latest News from {college_name}"
+
+
+def format_article(i: int, article: Dict[str, Any]) -> str:
+    """
+    Format a single article section of a news digest
+    
+    Args:
+        i: The position of the article in the digest, starting at 1
+        article: An article dictionary
+    
+    Returns:
+        The markdown section for the article
+    """
+    headline = article.get('rewritten_headline', article.get('headline', 'Untitled Article'))
+    summary = article.get('summary', 'No summary available.')
+    url = article.get('url', '#')
+    is_raw_content = article.get('is_raw_content', False)
+    
+    # Add sentiment if available
+    sentiment_info = ""
+    if 'sentiment' in article and not is_raw_content:
+        sentiment = article['sentiment']
+        rating = sentiment.get('rating', 0)
+        stars = "★" * rating + "☆" * (5 - rating)
+        confidence = sentiment.get('confidence', 0)
+        explanation = sentiment.get('explanation', '')
+        sentiment_info = f"\nTone: {stars} ({explanation})"
+    
+    # Format each article
+    output = [f"## {i}. {headline}"]
+    
+    # Add a notice if this is raw content (no AI summary)
+    if is_raw_content:
+        output.append("*Article excerpt (AI summary unavailable):*")
+        
+    output.append(f"{summary}{sentiment_info}")
+    output.append(f"[Read full article]({url})\n")
+    
+    return "\n".join(output)
+
+
 def format_output(college_name: str, articles: List[Dict[str, Any]]) -> str:
     """
     Format the output for the API response
@@ -56,37 +111,29 @@ def format_output(college_name: str, articles: List[Dict[str, Any]]) -> str:
         return f"No recent news articles found for {college_name}."
     
     # Format the output as a structured text
-    output = [f"# Latest News from {college_name}"]
+    output = [format_header(college_name)]
     
     for i, article in enumerate(articles, 1):
-        headline = article.get('rewritten_headline', article.get('headline', 'Untitled Article'))
-        summary = article.get('summary', 'No summary available.')
-        url = article.get('url', '#')
-        is_raw_content = article.get('is_raw_content', False)
-        
-        # Add sentiment if available
-        sentiment_info = ""
-        if 'sentiment' in article and not is_raw_content:
-            sentiment = article['sentiment']
-            rating = sentiment.get('rating', 0)
-            stars = "★" * rating + "☆" * (5 - rating)
-            confidence = sentiment.get('confidence', 0)
-            explanation = sentiment.get('explanation', '')
-            sentiment_info = f"\nTone: {stars} ({explanation})"
-        
-        # Format each article
-        output.append(f"## {i}. {headline}")
-        
-        # Add a notice if this is raw content (no AI summary)
-        if is_raw_content:
-            output.append("*Article excerpt (AI summary unavailable):*")
-            
-        output.append(f"{summary}{sentiment_info}")
-        output.append(f"[Read full article]({url})\n")
+        output.append(format_article(i, article))
     
     return "\n".join(output)
 
 
+def format_all_output(college_articles: Dict[str, List[Dict[str, Any]]]) -> str:
+    """
+    Format one digest covering several colleges
+    
+    Args:
+        college_articles: The processed articles of each college, in display order
+    
+    Returns:
+        The college digests in markdown, separated by horizontal rules
+    """
+    return "\n\n---\n\n".join(
+        format_output(college_name, articles) for college_name, articles in college_articles.items()
+    )
+
+
 def get_host_url() -> str:
     """
     Get the host URL from environment variables
@@ -100,3 +147,199 @@ def get_host_url() -> str:
         host = "http://localhost:5000"
     
     return host
+
+
+def build_plugin_manifest(host: str) -> Dict[str, Any]:
+    """
+    Build the OpenAI plugin manifest
+    
+    Args:
+        host: The host URL of the API
+    
+    Returns:
+        The plugin manifest
+    """
+    return {
+        "schema_version": "v1",
+        "name_for_human": "Clemson GPT News",
+        "name_for_model": "clemson_gpt_news",
+        "description_for_human": "Get the latest news and summaries from Clemson University colleges.",
+        "description_for_model": "Get the latest news and summaries from Clemson University colleges.",
+        "auth": {
+            "type": "none"
+        },
+        "api": {
+            "type": "openapi",
+            "url": f"{host}/openapi.json"
+        },
+        "logo_url": f"{host}/static/logo.svg",
+        "contact_email": "support@example.com",
+        "legal_info_url": "https://example.com/legal"
+    }
+
+
+def build_openapi_spec(host: str) -> Dict[str, Any]:
+    """
+    Build the OpenAPI specification for the news API
+    
+    Args:
+        host: The host URL of the API
+    
+    Returns:
+        The OpenAPI specification
+    """
+    return {
+        "openapi": "3.1.0",
+        "info": {
+            "title": "Clemson GPT News API",
+            "description": "API for retrieving and summarizing news from Clemson University colleges",
+            "version": "v1"
+        },
+        "servers": [
+            {
+                "url": host
+            }
+        ],
+        "paths": {
+            "/latest-news": {
+                "get": {
+                    "operationId": "get_latest_news",
+                    "summary": "Get the latest news and summaries from a Clemson University college",
+                    "parameters": [
+                        {
+                            "name": "college",
+                            "in": "query",
+                            "description": "The name of the Clemson University college",
+                            "required": True,
+                            "schema": {
+                                "type": "string",
+                                "enum": list(["College of Agriculture, Forestry and Life Sciences",
+                                             "College of Architecture, Art and Construction",
+                                             "College of Arts and Humanities",
+                                             "College of Behavioral, Social and Health Sciences",
+                                             "College of Education",
+                                             "College of Engineering, Computing and Applied Sciences",
+                                             "College of Science",
+                                             "Harvey S. Peeler Jr. College of Veterinary Medicine",
+                                             "Wilbur O. and Ann Powers College of Business"])
+                            }
+                        }
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "OK",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "college": {
+                                                "type": "string",
+                                                "description": "The name of the college"
+                                            },
+                                            "result": {
+                                                "type": "string",
+                                                "description": "The news summaries in markdown format"
+                                            },
+                                            "age_seconds": {
+                                                "type": "number",
+                                                "description": "How many seconds ago the summaries were generated, when served from a precomputed digest"
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        },
+                        "400": {
+                            "description": "Bad Request",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "error": {
+                                                "type": "string"
+                                            },
+                                            "message": {
+                                                "type": "string"
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        },
+                        "500": {
+                            "description": "Server Error",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "error": {
+                                                "type": "string"
+                                            },
+                                            "message": {
+                                                "type": "string"
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            "/latest-news/all": {
+                "get": {
+                    "operationId": "get_all_latest_news",
+                    "summary": "Get the latest news and summaries from every Clemson University college in one digest",
+                    "responses": {
+                        "200": {
+                            "description": "OK",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "colleges": {
+                                                "type": "array",
+                                                "items": {"type": "string"},
+                                                "description": "The colleges covered, in digest order"
+                                            },
+                                            "result": {
+                                                "type": "string",
+                                                "description": "The news summaries of every college in markdown format"
+                                            },
+                                            "article_counts": {
+                                                "type": "object",
+                                                "additionalProperties": {"type": "integer"},
+                                                "description": "The number of articles in the digest for each college"
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        },
+                        "500": {
+                            "description": "Server Error",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "error": {
+                                                "type": "string"
+                                            },
+                                            "message": {
+                                                "type": "string"
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }